@@ -1,9 +1,91 @@
+import time, tracemalloc
 from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+
+_NO_PHASE = nullcontext()
+
+
+class ColoringCancelled(Exception):
+    """Запуск прерван: обработчик on_progress попросил остановиться."""
+
+
+class Instrumentation:
+    """
+    Статистика одного запуска: таймеры фаз (perf_counter_ns, суммируются по имени),
+    счётчики и пик памяти tracemalloc (при memory=True).
+    hooks — вызываемые hook(kind, name, value): ("phase", имя, нс) по завершении
+    каждой фазы и ("counter", имя, значение) при count().
+    """
+    def __init__(self, memory=False, hooks=()):
+        self.memory = memory
+        self.hooks = list(hooks)
+        self.phases = {}
+        self.counters = {}
+        self.peak_memory = None
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter_ns() - t0)
+
+    def add_time(self, name, ns):
+        self.phases[name] = self.phases.get(name, 0) + ns
+        for hook in self.hooks:
+            hook("phase", name, ns)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+        for hook in self.hooks:
+            hook("counter", name, value)
+
+    @contextmanager
+    def tracking(self):
+        """Замер всего запуска (фаза total) и, при memory=True, пика памяти."""
+        started = False
+        if self.memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started = True
+        try:
+            with self.phase("total"):
+                yield self
+        finally:
+            if self.memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started:
+                    tracemalloc.stop()
+
+    def as_dict(self):
+        stats = {"phases_ns": dict(self.phases), "counters": dict(self.counters)}
+        if self.peak_memory is not None:
+            stats["peak_memory_bytes"] = self.peak_memory
+        return stats
+
 
 class ColoringAlgorithm(ABC):
-    """Абстрактный базовый класс для алгоритмов раскраски."""
+    """
+    Абстрактный базовый класс для алгоритмов раскраски.
+
+    on_progress(done, total) — необязательный обработчик прогресса: алгоритм
+    вызывает его после каждых progress_every окрашенных вершин. Чтобы прервать
+    запуск, обработчик бросает ColoringCancelled. Без обработчика вершины
+    обрабатываются одной порцией, и проверок в горячем цикле нет.
+
+    instrumentation — необязательный Instrumentation; profile() включает его на
+    время запуска и кладёт собранное в блок "stats" результата. Алгоритмы
+    проверяют его один раз за запуск, поэтому без него накладных расходов нет.
+    """
+    progress_every = 1024
+
     def __init__(self, name: str = "ColoringAlgorithm"):
         self.name = name
+        self.on_progress = None
+        self.instrumentation = None
 
     @abstractmethod
     def run(self, graph):
@@ -13,4 +95,29 @@ class ColoringAlgorithm(ABC):
         - "colors_used": int
         - "time": float
         """
-        pass
\ No newline at end of file
+        pass
+
+    def _progress_step(self, total):
+        """Размер порции вершин между вызовами on_progress."""
+        return self.progress_every if self.on_progress is not None else max(total, 1)
+
+    def _progress(self, done, total):
+        if self.on_progress is not None:
+            self.on_progress(done, total)
+
+    def profile(self, graph, memory=False, hooks=()):
+        """run() с инструментированием: результат дополняется блоком "stats"."""
+        inst = Instrumentation(memory, hooks)
+        self.instrumentation = inst
+        try:
+            with inst.tracking():
+                res = self.run(graph)
+        finally:
+            self.instrumentation = None
+        res["stats"] = inst.as_dict()
+        return res
+
+    def _phase(self, name):
+        """Контекст замера фазы; без instrumentation — пустой."""
+        inst = self.instrumentation
+        return inst.phase(name) if inst is not None else _NO_PHASE
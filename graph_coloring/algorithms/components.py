@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from graph_coloring.algorithms.base import ColoringAlgorithm
+
+
+def _color_components(algorithm, graphs):
+    """Раскрашивает пачку компонент в одном процессе."""
+    return [algorithm.run(g) for g in graphs]
+
+
+class ComponentwiseAlgorithm(ColoringAlgorithm):
+    """
+    Обёртка над любым ColoringAlgorithm: граф разбивается на компоненты связности,
+    каждая раскрашивается независимо, результаты сливаются в один словарь run().
+
+    Компоненты меньше inline_threshold вершин раскрашиваются в текущем процессе;
+    крупные — в пуле процессов (при max_workers != 1), пачками примерно по
+    batch_vertices вершин, чтобы не платить за пересылку каждой мелочи отдельно.
+    """
+    def __init__(self, algorithm, max_workers=1, inline_threshold=1000, batch_vertices=50000):
+        super().__init__(name=f"Components({algorithm.name})")
+        self.algorithm = algorithm
+        self.max_workers = max_workers
+        self.inline_threshold = inline_threshold
+        self.batch_vertices = batch_vertices
+
+    def run(self, graph):
+        start = time.time()
+        components = graph.connected_components()
+        small, large = [], []
+        for comp in components:
+            (large if len(comp) >= self.inline_threshold and self.max_workers != 1 else small).append(comp)
+
+        results = [self.algorithm.run(graph.subgraph(comp)) for comp in small]
+        if large:
+            results.extend(self._run_pool(graph, large))
+
+        coloring = {}
+        for res in results:
+            coloring.update(res["coloring"])
+        return {
+            "coloring": coloring,
+            "colors_used": max((res["colors_used"] for res in results), default=0),
+            "time": time.time() - start,
+            "components": len(components),
+        }
+
+    def _run_pool(self, graph, components):
+        batches, batch, size = [], [], 0
+        for comp in sorted(components, key=len, reverse=True):
+            batch.append(comp)
+            size += len(comp)
+            if size >= self.batch_vertices:
+                batches.append(batch)
+                batch, size = [], 0
+        if batch:
+            batches.append(batch)
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(_color_components, self.algorithm, [graph.subgraph(c) for c in b])
+                       for b in batches]
+            for fut in futures:
+                results.extend(fut.result())
+        return results
@@ -1,51 +1,290 @@
-import time, random
+import time, random, heapq
 from graph_coloring.algorithms.base import ColoringAlgorithm
 from graph_coloring.algorithms.greedy import GreedyAlgorithm
+from graph_coloring.algorithms.kernels import check_kernel, lowest_free_bit
+
+class _SaturationHeap:
+    """
+    Очередь с ленивым удалением по ключу (насыщенность, степень).
+    Используется для tie_break='degree_desc': извлечение — O(log n).
+    При равных ключах выбирается вершина с меньшим индексом, т.е. первая
+    в порядке обхода множества неокрашенных вершин — как и при полном сканировании.
+    """
+    def __init__(self, vertices, sat, degree, index):
+        self.sat = sat
+        self.degree = degree
+        self.index = index
+        self.heap = [(0, -degree[v], index[v], v) for v in vertices]
+        heapq.heapify(self.heap)
+
+    def update(self, v, old_sat):
+        heapq.heappush(self.heap, (-self.sat[v], -self.degree[v], self.index[v], v))
+
+    def discard(self, v):
+        # удаление ленивое: запись отбросится в pop()
+        pass
+
+    def pop(self, uncolored):
+        while True:
+            neg_sat, _, _, v = heapq.heappop(self.heap)
+            # устаревшие записи (вершина уже раскрашена или насыщенность выросла) пропускаем
+            if v in uncolored and -neg_sat == self.sat[v]:
+                return v
+
+
+class _IndexSet:
+    """
+    Множество индексов 0..n-1 на дереве Фенвика: вставка, удаление и выбор
+    k-го по возрастанию — O(log n). Узлы хранятся в словаре (нулевые
+    удаляются), поэтому память — O(размер · log n), а не O(n) на каждое множество.
+    """
+    def __init__(self, n, items=()):
+        self.n = n
+        self.top = 1 << max(n.bit_length() - 1, 0)
+        self.size = 0
+        tree = {}
+        # построение за O(n): каждый узел передаёт свою сумму родителю
+        counts = [0] * (n + 1)
+        for i in items:
+            counts[i + 1] = 1
+            self.size += 1
+        if self.size:
+            for pos in range(1, n + 1):
+                if counts[pos]:
+                    tree[pos] = counts[pos]
+                    parent = pos + (pos & -pos)
+                    if parent <= n:
+                        counts[parent] += counts[pos]
+        self.tree = tree
+
+    def __len__(self):
+        return self.size
+
+    def _add(self, i, delta):
+        tree, n = self.tree, self.n
+        pos = i + 1
+        while pos <= n:
+            value = tree.get(pos, 0) + delta
+            if value:
+                tree[pos] = value
+            else:
+                del tree[pos]
+            pos += pos & -pos
+        self.size += delta
+
+    def add(self, i):
+        self._add(i, 1)
+
+    def remove(self, i):
+        self._add(i, -1)
+
+    def pop_kth(self, k):
+        """Удаляет и возвращает k-й (с нуля) по возрастанию индекс."""
+        tree, n = self.tree, self.n
+        pos = 0
+        rest = k + 1
+        step = self.top
+        while step:
+            nxt = pos + step
+            if nxt <= n:
+                value = tree.get(nxt, 0)
+                if value < rest:
+                    pos = nxt
+                    rest -= value
+            step >>= 1
+        self._add(pos, -1)
+        return pos
+
+
+class _SaturationBuckets:
+    """
+    Корзины вершин по насыщенности для случайного tie_break.
+    Корзина — _IndexSet индексов вершин, поэтому кандидаты упорядочены так же,
+    как при полном сканировании множества, и случайный выбор k-го кандидата при
+    фиксированном seed даёт ту же вершину. Перенос вершины между корзинами
+    и выбор — O(log n).
+    """
+    def __init__(self, vertices, sat, degree, index):
+        self.sat = sat
+        self.index = index
+        self.n = len(index)
+        self.by_index = [None] * len(index)
+        for v, i in index.items():
+            self.by_index[i] = v
+        self.buckets = [_IndexSet(self.n, (index[v] for v in vertices))]
+        self.max_sat = 0
+
+    def _add(self, v, s):
+        while len(self.buckets) <= s:
+            self.buckets.append(_IndexSet(self.n))
+        self.buckets[s].add(self.index[v])
+        if s > self.max_sat:
+            self.max_sat = s
+
+    def update(self, v, old_sat):
+        self.buckets[old_sat].remove(self.index[v])
+        self._add(v, self.sat[v])
+
+    def discard(self, v):
+        self.buckets[self.sat[v]].remove(self.index[v])
+
+    def pop(self, uncolored):
+        while self.max_sat > 0 and not self.buckets[self.max_sat]:
+            self.max_sat -= 1
+        candidates = self.buckets[self.max_sat]
+        k = 0 if len(candidates) == 1 else random.randrange(len(candidates))
+        return self.by_index[candidates.pop_kth(k)]
+
 
 class DSATURAlgorithm(ColoringAlgorithm):
     """Алгоритм DSATUR (Degree of Saturation)."""
-    def __init__(self, tie_break='degree_desc'):
+    def __init__(self, tie_break='degree_desc', kernel='set'):
         super().__init__(name="DSATUR")
         self.tie_break = tie_break
+        self.kernel = check_kernel(kernel)
 
     def run(self, graph):
         start = time.time()
         uncolored = set(graph.vertices())
+        # порядок обхода множества фиксируется один раз: удаление элементов его не меняет
+        vertices = list(uncolored)
         color = {}
-        sat = {v: 0 for v in uncolored}
-        neigh_colors = {v: set() for v in uncolored}
-        degree = {v: graph.degree(v) for v in uncolored}
+        sat = {v: 0 for v in vertices}
+        degree = {v: graph.degree(v) for v in vertices}
 
         if not uncolored:
             return {"coloring": {}, "colors_used": 0, "time": 0.0}
 
-        v0 = max(uncolored, key=lambda v: degree[v])
-        color[v0] = 1
-        uncolored.remove(v0)
+        with self._phase("ordering"):
+            queue = self._make_queue(vertices, sat, degree)
+
+            # первая вершина — максимальной степени при любом tie_break
+            v0 = max(vertices, key=lambda v: degree[v])
+            queue.discard(v0)
+            color[v0] = 1
+            uncolored.remove(v0)
+            for u in graph.neighbors(v0):
+                sat[u] = 1
+                queue.update(u, 0)
+
+        if self.kernel == 'bitset':
+            self._color_bitset(graph, v0, uncolored, color, sat, queue)
+        else:
+            self._color_sets(graph, v0, uncolored, color, sat, queue)
+
+        return {"coloring": color, "colors_used": max(color.values()) if color else 0, "time": time.time() - start}
+
+    # При profile() циклы ниже замеряют фазы selection, assignment и
+    # neighbour_updates и считают обходы соседей, обновления насыщенности и
+    # пробы цветов; без instrumentation проверка — одно сравнение с None.
+
+    def _color_sets(self, graph, v0, uncolored, color, sat, queue):
+        neigh_colors = {v: set() for v in uncolored}
         for u in graph.neighbors(v0):
             neigh_colors[u].add(1)
-            sat[u] = len(neigh_colors[u])
+        inst = self.instrumentation
+        clock = time.perf_counter_ns
+        selection = assignment = updates = 0
+        # первая вершина: один пробный цвет, обход и обновление всех её соседей
+        visits = sat_updates = graph.degree(v0)
+        probes = 1
+        total = len(uncolored) + 1
+        step = self._progress_step(total)
+        while uncolored:
+            for _ in range(min(step, len(uncolored))):
+                if inst is not None:
+                    t0 = clock()
+                v = queue.pop(uncolored)
+                if inst is not None:
+                    t1 = clock()
+                used = neigh_colors.pop(v)
+                c = 1
+                while c in used:
+                    c += 1
+                color[v] = c
+                uncolored.remove(v)
+                if inst is not None:
+                    t2 = clock()
+                nbrs = graph.neighbors(v)
+                for u in nbrs:
+                    if u in uncolored and c not in neigh_colors[u]:
+                        old = sat[u]
+                        neigh_colors[u].add(c)
+                        sat[u] = old + 1
+                        queue.update(u, old)
+                        if inst is not None:
+                            sat_updates += 1
+                if inst is not None:
+                    t3 = clock()
+                    selection += t1 - t0
+                    assignment += t2 - t1
+                    updates += t3 - t2
+                    # цикл подбора цвета сделал c проверок, цикл по соседям — len(nbrs) шагов
+                    probes += c
+                    visits += len(nbrs)
+            self._progress(total - len(uncolored), total)
+        if inst is not None:
+            self._report(inst, selection, assignment, updates, visits, sat_updates, probes)
 
+    def _color_bitset(self, graph, v0, uncolored, color, sat, queue):
+        # маска цветов соседей: бит c установлен, если цвет c уже у соседа
+        masks = dict.fromkeys(uncolored, 0)
+        for u in graph.neighbors(v0):
+            masks[u] = 2
+        inst = self.instrumentation
+        clock = time.perf_counter_ns
+        selection = assignment = updates = 0
+        visits = sat_updates = graph.degree(v0)
+        probes = 1
+        total = len(uncolored) + 1
+        step = self._progress_step(total)
         while uncolored:
-            v = self._select_vertex(uncolored, sat, degree)
-            used = neigh_colors[v]
-            c = 1
-            while c in used:
-                c += 1
-            color[v] = c
-            uncolored.remove(v)
-            for u in graph.neighbors(v):
-                if u in uncolored:
-                    neigh_colors[u].add(c)
-                    sat[u] = len(neigh_colors[u])
+            for _ in range(min(step, len(uncolored))):
+                if inst is not None:
+                    t0 = clock()
+                v = queue.pop(uncolored)
+                if inst is not None:
+                    t1 = clock()
+                bit = lowest_free_bit(masks.pop(v))
+                color[v] = bit.bit_length() - 1
+                uncolored.remove(v)
+                if inst is not None:
+                    t2 = clock()
+                nbrs = graph.neighbors(v)
+                for u in nbrs:
+                    if u in uncolored:
+                        mask = masks[u]
+                        if not mask & bit:
+                            masks[u] = mask | bit
+                            old = sat[u]
+                            sat[u] = old + 1
+                            queue.update(u, old)
+                            if inst is not None:
+                                sat_updates += 1
+                if inst is not None:
+                    t3 = clock()
+                    selection += t1 - t0
+                    assignment += t2 - t1
+                    updates += t3 - t2
+                    # свободный бит находится одной операцией
+                    probes += 1
+                    visits += len(nbrs)
+            self._progress(total - len(uncolored), total)
+        if inst is not None:
+            self._report(inst, selection, assignment, updates, visits, sat_updates, probes)
 
-        return {"coloring": color, "colors_used": max(color.values()) if color else 0, "time": time.time() - start}
+    @staticmethod
+    def _report(inst, selection, assignment, updates, visits, sat_updates, probes):
+        """Фазы и счётчики цикла раскраски в instrumentation."""
+        inst.add_time("selection", selection)
+        inst.add_time("assignment", assignment)
+        inst.add_time("neighbour_updates", updates)
+        inst.count("neighbour_visits", visits)
+        inst.count("saturation_updates", sat_updates)
+        inst.count("color_probes", probes)
 
-    def _select_vertex(self, uncolored, sat, degree):
-        max_sat = max(sat[v] for v in uncolored)
-        candidates = [v for v in uncolored if sat[v] == max_sat]
-        if len(candidates) == 1:
-            return candidates[0]
+    def _make_queue(self, vertices, sat, degree):
+        index = {v: i for i, v in enumerate(vertices)}
         if self.tie_break == 'degree_desc':
-            return max(candidates, key=lambda v: degree[v])
-        return random.choice(candidates)
\ No newline at end of file
+            return _SaturationHeap(vertices, sat, degree, index)
+        return _SaturationBuckets(vertices, sat, degree, index)
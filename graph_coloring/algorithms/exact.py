@@ -0,0 +1,166 @@
+import time
+from graph_coloring.algorithms.base import ColoringAlgorithm
+from graph_coloring.algorithms.dsatur import DSATURAlgorithm
+
+
+def greedy_clique(graph, starts=None):
+    """
+    Быстрая эвристика клики: от каждой из starts вершин наибольшей степени
+    клика жадно расширяется кандидатом максимальной степени. Возвращает
+    наибольшую найденную клику (список вершин) — нижнюю оценку хроматического числа.
+    """
+    vertices = sorted(graph.vertices(), key=lambda v: -graph.degree(v))
+    if starts is not None:
+        vertices = vertices[:starts]
+    best = []
+    for s in vertices:
+        if graph.degree(s) + 1 <= len(best):
+            break
+        clique = [s]
+        candidates = set(graph.neighbors(s))
+        while candidates:
+            v = max(candidates, key=lambda u: (len(candidates & set(graph.neighbors(u))), graph.degree(u)))
+            clique.append(v)
+            candidates &= set(graph.neighbors(v))
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+class ExactAlgorithm(ColoringAlgorithm):
+    """
+    Точная раскраска методом ветвей и границ на основе DSATUR (Брелаз).
+
+    Нижняя граница — жадная клика (её вершины заранее красятся в 1..|клики|),
+    верхняя — результат эвристического DSATUR. Ветвление по вершине максимальной
+    насыщенности; новый цвет в ветке допускается только один (следующий по
+    номеру) — это отсекает перестановки цветов. При исчерпании timeout
+    возвращается лучшая найденная раскраска и разрыв между границами.
+    """
+    def __init__(self, timeout=None, clique_starts=64):
+        super().__init__(name="Exact")
+        self.timeout = timeout
+        self.clique_starts = clique_starts
+
+    def run(self, graph):
+        start = time.time()
+        t0 = time.perf_counter()
+        vertices = graph.vertices()
+        n = len(vertices)
+        if n == 0:
+            return {"coloring": {}, "colors_used": 0, "time": 0.0, "lower_bound": 0, "upper_bound": 0,
+                    "optimal": True, "nodes": 0, "nodes_per_sec": 0.0}
+
+        index = {v: i for i, v in enumerate(vertices)}
+        adj = [[index[u] for u in graph.neighbors(v)] for v in vertices]
+        degree = [len(a) for a in adj]
+
+        heuristic = DSATURAlgorithm().run(graph)["coloring"]
+        best = [heuristic[v] for v in vertices]
+        ub = max(best)
+        clique = [index[v] for v in greedy_clique(graph, self.clique_starts)] or [0]
+        lb = len(clique)
+
+        nodes = 0
+        optimal = lb >= ub
+        if not optimal:
+            nodes, optimal, found = self._search(adj, degree, clique, lb, ub, t0)
+            if found is not None:
+                best = found
+                ub = max(found)
+                optimal = optimal or ub == lb
+        if optimal:
+            lb = ub
+
+        elapsed = time.perf_counter() - t0
+        return {
+            "coloring": {v: best[i] for i, v in enumerate(vertices)},
+            "colors_used": ub,
+            "time": time.time() - start,
+            "lower_bound": lb,
+            "upper_bound": ub,
+            "gap": ub - lb,
+            "optimal": optimal,
+            "nodes": nodes,
+            "nodes_per_sec": nodes / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _search(self, adj, degree, clique, lb, ub, t0):
+        """
+        Итеративный поиск в глубину (без рекурсии, чтобы не упираться в её лимит).
+        Возвращает (узлов, доказана_оптимальность, лучшая_раскраска_или_None).
+        """
+        n = len(adj)
+        deadline = t0 + self.timeout if self.timeout is not None else None
+        color = [0] * n
+        counts = [[0] * (ub + 2) for _ in range(n)]
+        sat = [0] * n
+        uncolored = set(range(n))
+
+        def assign(v, c):
+            color[v] = c
+            uncolored.discard(v)
+            for u in adj[v]:
+                row = counts[u]
+                if not row[c]:
+                    sat[u] += 1
+                row[c] += 1
+
+        def unassign(v):
+            c = color[v]
+            color[v] = 0
+            uncolored.add(v)
+            for u in adj[v]:
+                row = counts[u]
+                row[c] -= 1
+                if not row[c]:
+                    sat[u] -= 1
+
+        for c, v in enumerate(clique, 1):
+            assign(v, c)
+        k = len(clique)
+
+        def candidates(v, k, ub):
+            row = counts[v]
+            cands = [c for c in range(1, k + 1) if not row[c]]
+            if k + 1 < ub:
+                cands.append(k + 1)
+            return cands
+
+        def select():
+            return max(uncolored, key=lambda v: (sat[v], degree[v]))
+
+        found = None
+        nodes = 0
+        if not uncolored:
+            return nodes, True, color[:]
+        v = select()
+        # кадр стека: [вершина, кандидаты, позиция, k до назначения]
+        stack = [[v, candidates(v, k, ub), 0, k]]
+        while stack:
+            frame = stack[-1]
+            v, cands, pos, k_before = frame
+            if color[v]:
+                unassign(v)
+            if pos >= len(cands) or cands[pos] >= ub:
+                stack.pop()
+                continue
+            c = cands[pos]
+            frame[2] = pos + 1
+            assign(v, c)
+            k = max(k_before, c)
+            nodes += 1
+            if deadline is not None and (nodes & 1023) == 0 and time.perf_counter() >= deadline:
+                unassign(v)
+                return nodes, False, found
+            if not uncolored:
+                found = color[:]
+                ub = k
+                if ub <= lb:
+                    return nodes, True, found
+                continue
+            w = select()
+            cands_w = candidates(w, k, ub)
+            if cands_w:
+                stack.append([w, cands_w, 0, k])
+        return nodes, True, found
@@ -1,30 +1,67 @@
 import time, random
+from functools import reduce
+from itertools import repeat
+from operator import or_
 from graph_coloring.algorithms.base import ColoringAlgorithm
+from graph_coloring.algorithms.kernels import check_kernel, lowest_free_bit
+from graph_coloring.algorithms.reduction import smallest_last_order
 
 class GreedyAlgorithm(ColoringAlgorithm):
     """Жадный алгоритм раскраски графа."""
-    def __init__(self, order_strategy='degree_desc'):
+    def __init__(self, order_strategy='degree_desc', kernel='set'):
         super().__init__(name="Greedy")
         self.order_strategy = order_strategy
+        self.kernel = check_kernel(kernel)
 
     def run(self, graph):
         start = time.time()
         vertices = graph.vertices()
 
-        if self.order_strategy == 'degree_desc':
-            order = sorted(vertices, key=lambda v: -graph.degree(v))
-        elif self.order_strategy == 'random':
-            order = vertices[:]
-            random.shuffle(order)
-        else:  # 'as_loaded'
-            order = vertices
+        with self._phase("ordering"):
+            if self.order_strategy == 'degree_desc':
+                order = sorted(vertices, key=lambda v: -graph.degree(v))
+            elif self.order_strategy == 'random':
+                order = vertices[:]
+                random.shuffle(order)
+            elif self.order_strategy == 'smallest_last':
+                order, degeneracy = smallest_last_order(graph)
+            else:  # 'as_loaded'
+                order = vertices
 
         color = {}
-        for v in order:
-            used = {color[u] for u in graph.neighbors(v) if u in color}
-            c = 1
-            while c in used:
-                c += 1
-            color[v] = c
+        total = len(order)
+        step = self._progress_step(total)
+        # для каждой окрашенной вершины храним бит её цвета: маска соседей — просто OR
+        color_bit = {}
+        get_bit = color_bit.get
+        zeros = repeat(0)
+        with self._phase("assignment"):
+            for lo in range(0, total, step):
+                if self.kernel == 'bitset':
+                    for v in order[lo:lo + step]:
+                        mask = reduce(or_, map(get_bit, graph.neighbors(v), zeros), 0)
+                        bit = lowest_free_bit(mask)
+                        color_bit[v] = bit
+                        color[v] = bit.bit_length() - 1
+                else:
+                    for v in order[lo:lo + step]:
+                        used = {color[u] for u in graph.neighbors(v) if u in color}
+                        c = 1
+                        while c in used:
+                            c += 1
+                        color[v] = c
+                self._progress(min(lo + step, total), total)
 
-        return {"coloring": color, "colors_used": max(color.values()) if color else 0, "time": time.time() - start}
\ No newline at end of file
+        inst = self.instrumentation
+        if inst is not None:
+            # счётчики восстанавливаются по результату, не трогая горячий цикл:
+            # каждая вершина просматривает всех соседей, ядро 'set' пробует цвета 1..c
+            inst.count("neighbour_visits", sum(graph.degree(v) for v in order))
+            inst.count("color_probes", sum(color.values()) if self.kernel == 'set' else total)
+
+        res = {"coloring": color, "colors_used": max(color.values()) if color else 0, "time": time.time() - start}
+        if self.order_strategy == 'smallest_last':
+            # в порядке smallest-last жадный алгоритм использует не больше degeneracy + 1 цветов
+            res["degeneracy"] = degeneracy
+            res["upper_bound"] = degeneracy + 1 if color else 0
+        return res
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""
+Ядра поиска свободного цвета.
+
+'set'    — множество цветов соседей и линейный перебор c = 1, 2, ... (исходный вариант);
+'bitset' — запрещённые цвета хранятся битовой маской int (бит c — цвет c),
+           первый свободный цвет находится битовыми операциями без перебора.
+"""
+
+KERNELS = ('set', 'bitset')
+
+
+def check_kernel(kernel):
+    if kernel not in KERNELS:
+        raise ValueError(f"Неизвестное ядро '{kernel}', ожидается одно из {KERNELS}")
+    return kernel
+
+
+def lowest_free_bit(mask):
+    """Младший нулевой бит маски, начиная с бита 1 (бит 0 — «цвет 0» — всегда занят)."""
+    mask |= 1
+    return ~mask & (mask + 1)
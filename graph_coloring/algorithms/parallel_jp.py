@@ -0,0 +1,226 @@
+import mmap, os, random, tempfile, time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from graph_coloring.algorithms.base import ColoringAlgorithm
+from graph_coloring.graph_cache import open_graph_cache, write_graph_cache
+from graph_coloring.graph_model import FrozenGraph
+
+PRIORITIES = ('random', 'degree')
+
+# граф и общее состояние (prio, pending, color), открытые в процессе-исполнителе
+_worker_graph = None
+_worker_state = None
+
+
+def _map_state(state_path, n):
+    """Файл состояния из трёх int32[n] (prio, pending, color), отображённый через mmap."""
+    with open(state_path, 'r+b') as f:
+        buf = mmap.mmap(f.fileno(), 0)
+    view = memoryview(buf).cast('i')
+    return buf, (view[:n], view[n:2 * n], view[2 * n:])
+
+
+def _init_worker(cache_path, state_path):
+    global _worker_graph, _worker_state
+    _worker_graph = open_graph_cache(cache_path)
+    _worker_state = _map_state(state_path, _worker_graph.n())[1]
+
+
+def _init_block(lo, hi, graph=None, state=None):
+    """pending[v] — число соседей с большим приоритетом; возвращает готовые вершины блока."""
+    graph = graph if graph is not None else _worker_graph
+    prio, pending, _ = state if state is not None else _worker_state
+    offsets, indices = graph.offsets, graph.indices
+    ready = array('i')
+    for v in range(lo, hi):
+        pv = prio[v]
+        k = 0
+        for u in indices[offsets[v]:offsets[v + 1]]:
+            if prio[u] > pv:
+                k += 1
+        pending[v] = k
+        if not k:
+            ready.append(v)
+    return ready
+
+
+def _color_block(lo, hi, block_size, ready, incoming, graph=None, state=None):
+    """
+    Раунд для блока вершин [lo, hi): вершина красится, как только окрашены
+    все её соседи с большим приоритетом. Уведомления соседям своего блока
+    обрабатываются сразу, чужим — копятся в исходящих (по номеру блока).
+    Возвращает (число окрашенных, {блок: array вершин-адресатов}).
+    """
+    graph = graph if graph is not None else _worker_graph
+    prio, pending, color = state if state is not None else _worker_state
+    offsets, indices = graph.offsets, graph.indices
+    stack = list(ready)
+    for w in incoming:
+        pending[w] -= 1
+        if not pending[w]:
+            stack.append(w)
+
+    outbox = {}
+    colored = 0
+    while stack:
+        v = stack.pop()
+        nbrs = indices[offsets[v]:offsets[v + 1]]
+        # окрашены ровно соседи с большим приоритетом, младшие ещё не тронуты
+        used = {color[u] for u in nbrs}
+        c = 1
+        while c in used:
+            c += 1
+        color[v] = c
+        colored += 1
+        pv = prio[v]
+        for u in nbrs:
+            if prio[u] < pv:
+                if lo <= u < hi:
+                    pending[u] -= 1
+                    if not pending[u]:
+                        stack.append(u)
+                else:
+                    b = u // block_size
+                    box = outbox.get(b)
+                    if box is None:
+                        box = outbox[b] = array('i')
+                    box.append(u)
+    return colored, outbox
+
+
+class ParallelJPAlgorithm(ColoringAlgorithm):
+    """
+    Параллельная раскраска Джонса–Плассмана. Вершины получают случайные
+    приоритеты (перестановка от seed; при priority='degree' — сначала по
+    степени, как в largest-degree-first); вершина красится в наименьший цвет,
+    свободный у соседей, как только окрашены все её соседи старше неё.
+    Поэтому результат зависит только от seed и совпадает с последовательным
+    жадным алгоритмом в порядке убывания приоритета — при любом числе процессов.
+
+    Граф в формате CSR разбивается на max_workers непрерывных блоков; в каждом
+    раунде исполнители обрабатывают свои блоки над общим графом (.gcsr через
+    mmap) и общим файлом состояния, а между раундами пересылаются только
+    уведомления по рёбрам между блоками. Внутри блока готовые вершины красятся
+    каскадом, не дожидаясь следующего раунда.
+
+    Графы меньше parallel_threshold вершин (и max_workers=1) считаются в текущем
+    процессе тем же кодом. В результат добавляются rounds, round_sizes
+    (окрашено за раунд) и timings (setup, init, rounds, collect — в секундах).
+    """
+    def __init__(self, seed=0, max_workers=None, priority='random', parallel_threshold=20000):
+        super().__init__(name="ParallelJP")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Неизвестный приоритет: {priority}")
+        self.seed = seed
+        self.max_workers = max_workers
+        self.priority = priority
+        self.parallel_threshold = parallel_threshold
+
+    def priorities(self, graph):
+        """Ранги приоритетов 0..n-1 по id вершин (больше — раньше красится)."""
+        n = graph.n()
+        rng = random.Random(self.seed)
+        order = list(range(n))
+        rng.shuffle(order)
+        if self.priority == 'degree':
+            # устойчивая сортировка: равные степени остаются в случайном порядке
+            order.sort(key=graph.degree)
+        prio = array('i', bytes(4 * n))
+        for rank, v in enumerate(order):
+            prio[v] = rank
+        return prio
+
+    def run(self, graph):
+        start = time.time()
+        t0 = time.perf_counter()
+        frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+        n = frozen.n()
+        if n == 0:
+            return {"coloring": {}, "colors_used": 0, "time": 0.0, "rounds": 0, "round_sizes": [],
+                    "timings": {"setup": 0.0, "init": 0.0, "rounds": 0.0, "collect": 0.0}}
+        prio = self.priorities(frozen)
+
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers == 1 or n < self.parallel_threshold:
+            state = (prio, array('i', bytes(4 * n)), array('i', bytes(4 * n)))
+            timings = {"setup": time.perf_counter() - t0}
+            round_sizes = self._rounds(frozen, state, 1, timings, None)
+            colors = state[2]
+        else:
+            colors, round_sizes, timings = self._run_pool(frozen, prio, workers, t0)
+
+        t1 = time.perf_counter()
+        coloring = dict(enumerate(colors))
+        if frozen is not graph:
+            coloring = frozen.to_labels(coloring)
+        timings["collect"] = time.perf_counter() - t1
+        return {"coloring": coloring, "colors_used": max(colors), "time": time.time() - start,
+                "rounds": len(round_sizes), "round_sizes": round_sizes, "timings": timings}
+
+    def _run_pool(self, frozen, prio, workers, t0):
+        n = frozen.n()
+        fd, cache_path = tempfile.mkstemp(suffix=".gcsr")
+        os.close(fd)
+        fd, state_path = tempfile.mkstemp(suffix=".state")
+        os.close(fd)
+        try:
+            write_graph_cache(frozen, cache_path)
+            with open(state_path, 'wb') as f:
+                prio.tofile(f)
+                f.write(bytes(8 * n))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(cache_path, state_path)) as pool:
+                timings = {"setup": time.perf_counter() - t0}
+                round_sizes = self._rounds(frozen, None, workers, timings, pool)
+            colors = array('i')
+            with open(state_path, 'rb') as f:
+                f.seek(8 * n)
+                colors.fromfile(f, n)
+        finally:
+            os.remove(cache_path)
+            os.remove(state_path)
+        return colors, round_sizes, timings
+
+    def _rounds(self, frozen, state, blocks, timings, pool):
+        """Инициализация и раунды по блокам; state=None — состояние у исполнителей."""
+        n = frozen.n()
+        block_size = -(-n // blocks)
+        bounds = [(lo, min(lo + block_size, n)) for lo in range(0, n, block_size)]
+
+        def call(fn, *args):
+            if pool is None:
+                return _Done(fn(*args, graph=frozen, state=state))
+            return pool.submit(fn, *args)
+
+        t = time.perf_counter()
+        ready = [f.result() for f in [call(_init_block, lo, hi) for lo, hi in bounds]]
+        timings["init"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        inbox = [array('i') for _ in bounds]
+        round_sizes = []
+        while any(ready) or any(inbox):
+            futures = [call(_color_block, lo, hi, block_size, ready[b], inbox[b])
+                       if ready[b] or inbox[b] else None for b, (lo, hi) in enumerate(bounds)]
+            ready = [array('i') for _ in bounds]
+            inbox = [array('i') for _ in bounds]
+            colored = 0
+            for fut in futures:
+                if fut is None:
+                    continue
+                count, outbox = fut.result()
+                colored += count
+                for b, box in outbox.items():
+                    inbox[b].extend(box)
+            round_sizes.append(colored)
+        timings["rounds"] = time.perf_counter() - t
+        return round_sizes
+
+
+class _Done:
+    """Уже вычисленный результат с интерфейсом Future (для расчёта в текущем процессе)."""
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
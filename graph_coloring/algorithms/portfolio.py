@@ -0,0 +1,125 @@
+import os, random, tempfile, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from graph_coloring.algorithms.base import ColoringAlgorithm
+from graph_coloring.algorithms.dsatur import DSATURAlgorithm
+from graph_coloring.algorithms.exact import greedy_clique
+from graph_coloring.algorithms.greedy import GreedyAlgorithm
+from graph_coloring.graph_cache import open_graph_cache, write_graph_cache
+from graph_coloring.graph_model import FrozenGraph
+
+GREEDY_STRATEGIES = ('degree_desc', 'as_loaded', 'smallest_last', 'random')
+
+# граф, открытый в процессе-исполнителе (через mmap общего файла кэша)
+_worker_graph = None
+
+
+def _init_worker(cache_path):
+    global _worker_graph
+    _worker_graph = open_graph_cache(cache_path)
+
+
+def _make_algorithm(algorithm, strategy):
+    if algorithm == 'dsatur':
+        return DSATURAlgorithm(tie_break=strategy)
+    return GreedyAlgorithm(order_strategy=strategy)
+
+
+def _run_config(config, graph=None):
+    """Один запуск портфеля; раскраска возвращается списком цветов по id вершин."""
+    algorithm, strategy, seed = config
+    graph = graph if graph is not None else _worker_graph
+    random.seed(seed)
+    res = _make_algorithm(algorithm, strategy).run(graph)
+    coloring = res["coloring"]
+    return [coloring[i] for i in range(graph.n())], res["colors_used"], res["time"]
+
+
+class PortfolioAlgorithm(ColoringAlgorithm):
+    """
+    Портфель перезапусков: жадный алгоритм со всеми стратегиями порядка и DSATUR
+    со случайным tie_break (разные seed) выполняются в пуле процессов.
+    Граф передаётся исполнителям один раз — через временный файл кэша (graph_cache),
+    который каждый процесс открывает через mmap. Поиск останавливается досрочно,
+    когда достигнута нижняя граница lower_bound; по умолчанию это размер жадной
+    клики (от clique_starts вершин, как в Exact).
+    """
+    def __init__(self, restarts=16, max_workers=None, seed=0, lower_bound=None, clique_starts=64):
+        super().__init__(name="Portfolio")
+        if restarts < 1:
+            raise ValueError("restarts должен быть не меньше 1")
+        self.restarts = restarts
+        self.max_workers = max_workers
+        self.seed = seed
+        self.lower_bound = lower_bound
+        self.clique_starts = clique_starts
+
+    def configs(self):
+        """Список запусков (algorithm, strategy, seed) длины restarts."""
+        deterministic = [('greedy', s) for s in GREEDY_STRATEGIES if s != 'random'] + [('dsatur', 'degree_desc')]
+        randomized = [('dsatur', 'random'), ('greedy', 'random')]
+        configs = []
+        for i in range(self.restarts):
+            if i < len(deterministic):
+                algorithm, strategy = deterministic[i]
+            else:
+                algorithm, strategy = randomized[(i - len(deterministic)) % len(randomized)]
+            configs.append((algorithm, strategy, self.seed + i))
+        return configs
+
+    def run(self, graph):
+        start = time.time()
+        frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+        if frozen.n() == 0:
+            return {"coloring": {}, "colors_used": 0, "time": 0.0, "runs": [], "best_run": None}
+        lower_bound = self.lower_bound
+        if lower_bound is None:
+            lower_bound = max(len(greedy_clique(frozen, self.clique_starts)), 1)
+
+        configs = self.configs()
+        runs = []
+        best = None
+        if self.max_workers == 1:
+            for config in configs:
+                best = self._record(runs, config, _run_config(config, frozen), best)
+                if best[1] <= lower_bound:
+                    break
+        else:
+            best = self._run_pool(frozen, configs, runs, lower_bound)
+
+        colors, colors_used = best[0], best[1]
+        coloring = dict(enumerate(colors))
+        if frozen is not graph:
+            coloring = frozen.to_labels(coloring)
+        return {"coloring": coloring, "colors_used": colors_used, "time": time.time() - start,
+                "runs": runs, "best_run": best[2]}
+
+    def _run_pool(self, frozen, configs, runs, lower_bound):
+        fd, cache_path = tempfile.mkstemp(suffix=".gcsr")
+        os.close(fd)
+        best = None
+        try:
+            write_graph_cache(frozen, cache_path)
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(cache_path,)) as pool:
+                pending = {pool.submit(_run_config, config): config for config in configs}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        best = self._record(runs, pending.pop(fut), fut.result(), best)
+                    if best[1] <= lower_bound:
+                        for fut in pending:
+                            fut.cancel()
+                        break
+        finally:
+            os.remove(cache_path)
+        return best
+
+    @staticmethod
+    def _record(runs, config, result, best):
+        algorithm, strategy, seed = config
+        colors, colors_used, elapsed = result
+        runs.append({"algorithm": algorithm, "order_strategy": strategy, "seed": seed,
+                     "colors_used": colors_used, "time": elapsed})
+        if best is None or colors_used < best[1]:
+            return colors, colors_used, len(runs) - 1
+        return best
@@ -0,0 +1,101 @@
+import time
+from graph_coloring.algorithms.base import ColoringAlgorithm
+
+
+def core_decomposition(graph):
+    """
+    Разложение на k-ядра очередью по корзинам степеней (Батагель–Заверсник), O(n + m).
+    Возвращает (removal, core): вершины в порядке удаления (всякий раз вершина
+    минимальной текущей степени) и словарь core[v] — номер ядра вершины.
+    Вырожденность графа — max(core.values()).
+    """
+    vertices = graph.vertices()
+    n = len(vertices)
+    index = {v: i for i, v in enumerate(vertices)}
+    adj = [[index[u] for u in graph.neighbors(v)] for v in vertices]
+    deg = [len(a) for a in adj]
+    max_deg = max(deg, default=0)
+
+    # сортировка подсчётом: vert — вершины по возрастанию степени, pos — их позиции,
+    # start[d] — начало корзины степени d
+    start = [0] * (max_deg + 2)
+    for d in deg:
+        start[d + 1] += 1
+    for d in range(1, max_deg + 2):
+        start[d] += start[d - 1]
+    vert = [0] * n
+    pos = [0] * n
+    fill = start[:]
+    for v in range(n):
+        pos[v] = fill[deg[v]]
+        vert[pos[v]] = v
+        fill[deg[v]] += 1
+
+    for i in range(n):
+        v = vert[i]
+        for u in adj[v]:
+            du = deg[u]
+            if du > deg[v]:
+                # u переезжает в начало своей корзины, корзина сдвигается на одну позицию
+                pu, pw = pos[u], start[du]
+                w = vert[pw]
+                if u != w:
+                    vert[pu], vert[pw] = w, u
+                    pos[u], pos[w] = pw, pu
+                start[du] += 1
+                deg[u] = du - 1
+
+    removal = [vertices[v] for v in vert]
+    core = {vertices[v]: deg[v] for v in range(n)}
+    return removal, core
+
+
+def smallest_last_order(graph):
+    """Порядок «наименьшая последней» (degeneracy order) и вырожденность графа."""
+    removal, core = core_decomposition(graph)
+    return removal[::-1], max(core.values(), default=0)
+
+
+class ReductionAlgorithm(ColoringAlgorithm):
+    """
+    Предобработка снятием вершин малой степени: вершины со степенью < k
+    (все, чей номер ядра меньше k) снимаются, k-ядро раскрашивается алгоритмом
+    algorithm, после чего снятые вершины жадно возвращаются в обратном порядке.
+    В момент возвращения у вершины меньше k окрашенных соседей, поэтому ей
+    хватает одного из первых k цветов.
+
+    По умолчанию k — размер жадной клики: это нижняя граница хроматического
+    числа, так что предобработка не увеличивает число цветов сверх неё.
+    В результат добавляются degeneracy, upper_bound = degeneracy + 1, peeled, core_size.
+    """
+    def __init__(self, algorithm, k=None):
+        super().__init__(name=f"Reduction({algorithm.name})")
+        self.algorithm = algorithm
+        self.k = k
+
+    def run(self, graph):
+        start = time.time()
+        removal, core = core_decomposition(graph)
+        degeneracy = max(core.values(), default=0)
+        k = self.k
+        if k is None:
+            # локальный импорт: exact -> dsatur -> greedy -> reduction
+            from graph_coloring.algorithms.exact import greedy_clique
+            k = len(greedy_clique(graph, starts=16))
+
+        peeled = [v for v in removal if core[v] < k]
+        kept = [v for v in graph.vertices() if core[v] >= k]
+        color = {}
+        if kept:
+            color.update(self.algorithm.run(graph.subgraph(kept))["coloring"])
+        for v in reversed(peeled):
+            used = {color[u] for u in graph.neighbors(v) if u in color}
+            c = 1
+            while c in used:
+                c += 1
+            color[v] = c
+
+        return {"coloring": color, "colors_used": max(color.values()) if color else 0,
+                "time": time.time() - start, "degeneracy": degeneracy,
+                "upper_bound": degeneracy + 1 if color else 0,
+                "peeled": len(peeled), "core_size": len(kept)}
@@ -0,0 +1,297 @@
+import mmap, os, tempfile, time
+from array import array
+from graph_coloring.algorithms.base import ColoringAlgorithm
+from graph_coloring.io_module import CHUNK_SIZE, detect_format, iter_dimacs_chunks, iter_edgelist_chunks
+
+READERS = {'edgelist': iter_edgelist_chunks, 'dimacs': iter_dimacs_chunks}
+
+# запас для номеров-меток сверх удвоенного числа прочитанных концов рёбер
+DENSE_SLACK = 1 << 16
+
+_FULL = (1 << 64) - 1
+_ZERO_BLOCK = bytes(1 << 20)
+
+
+def _mix(i, seed):
+    """Псевдослучайная часть приоритета: биекция на 32-битных номерах."""
+    return ((i ^ seed) * 2654435761) & 0xffffffff
+
+
+class _State:
+    """
+    Состояние по вершинам в одном буфере: forbid uint64[n] (окно запрещённых
+    цветов), lose uint8[n], deg/color/base int32[n]. Буфер — bytearray или
+    mmap временного файла в state_dir.
+    """
+    def __init__(self, deg, state_dir=None):
+        n = len(deg)
+        self.n = n
+        lose_size = -(-n // 8) * 8
+        self.scratch = 8 * n + lose_size   # обнуляемая перед каждым проходом часть
+        size = self.scratch + 12 * n
+        self.path = None
+        if state_dir is None:
+            self.buf = bytearray(size)
+        else:
+            fd, self.path = tempfile.mkstemp(suffix=".state", dir=state_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.truncate(max(size, 1))
+            with open(self.path, 'r+b') as f:
+                self.buf = mmap.mmap(f.fileno(), 0)
+        self.raw = memoryview(self.buf)
+        self.forbid = self.raw[:8 * n].cast('Q')
+        self.lose = self.raw[8 * n:8 * n + n]
+        ints = self.raw[self.scratch:self.scratch + 12 * n].cast('i')
+        self.deg, self.color, self.base = ints[:n], ints[n:2 * n], ints[2 * n:]
+        self._views = [self.forbid, self.lose, ints, self.deg, self.color, self.base]
+        self.deg[:] = deg
+
+    def clear_scratch(self):
+        raw = self.raw
+        for lo in range(0, self.scratch, len(_ZERO_BLOCK)):
+            hi = min(lo + len(_ZERO_BLOCK), self.scratch)
+            raw[lo:hi] = _ZERO_BLOCK[:hi - lo]
+
+    def close(self):
+        # все представления держат буфер: mmap закрывается только после их освобождения
+        for view in reversed(self._views):
+            view.release()
+        self.raw.release()
+        if self.path is not None:
+            self.buf.close()
+            os.remove(self.path)
+
+
+class SemiStreamingAlgorithm(ColoringAlgorithm):
+    """
+    Полупотоковая раскраска графа, который не помещается в память: run()
+    принимает путь к файлу рёбер (список рёбер или DIMACS) и несколько раз
+    читает его последовательно, блоками по chunk_size тем же разбором, что и
+    io_module. В памяти (или в mmap-файле в state_dir) — только O(n) состояние
+    вершин: степень, цвет, окно из 64 запрещённых цветов и флаг конфликта.
+
+    Проход 1 нумерует вершины и считает степени (неотрицательные целые метки
+    служат номерами сами, иначе — словарь метка -> номер), все вершины
+    получают цвет 1. Каждый следующий проход находит одноцветные рёбра
+    (проигрывает вершина с меньшим приоритетом: степень, затем псевдослучайный
+    ключ от seed) и собирает для вершин окна цветов соседей. Неокрашенные и
+    проигравшие вершины берут наименьший свободный цвет окна; если окно
+    заполнено, оно сдвигается на 64. Раскраска готова, когда проход не нашёл
+    ни конфликтов, ни неокрашенных вершин.
+
+    Проходы окон ограничены max_passes. На плотных графах к этому моменту
+    может остаться большая часть вершин, поэтому они докрашиваются жадно
+    партиями: за проход в память читаются рёбра вершин с суммой степеней не
+    больше fallback_edges (по умолчанию max(4n, 65536)). Память остаётся O(n),
+    а проходов добавляется около Σdeg(остаток) / fallback_edges.
+    Вершины без рёбер в раскраску не попадают. В результат добавляются passes,
+    bytes_read, vertices, conflicts (одноцветных рёбер по проходам),
+    fallback_vertices, fallback_passes и fallback_peak_edges.
+    """
+    def __init__(self, max_passes=32, seed=0, chunk_size=CHUNK_SIZE, state_dir=None, fmt=None,
+                 fallback_edges=None):
+        super().__init__(name="SemiStreaming")
+        if max_passes < 3:
+            raise ValueError("max_passes должен быть не меньше 3")
+        self.max_passes = max_passes
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.state_dir = state_dir
+        self.fmt = fmt
+        self.fallback_edges = fallback_edges
+
+    def run(self, path):
+        start = time.time()
+        fmt = self.fmt or detect_format(path)
+        if fmt not in READERS:
+            raise ValueError(f"Формат {fmt} не поддерживается в потоковом режиме")
+        reader = READERS[fmt]
+        bytes_read = [0]
+
+        def add_bytes(nbytes):
+            bytes_read[0] += nbytes
+
+        def read():
+            # каждый вызов — новый последовательный проход по файлу
+            return reader(path, self.chunk_size, add_bytes)
+
+        with self._phase("index"):
+            deg, index = self._index(read)
+        passes = 1
+        state = _State(deg, self.state_dir)
+        try:
+            n = state.n
+            # первый проход раскраски всё равно дал бы всем цвет 1: начинаем с него
+            color, deg = state.color, state.deg
+            for v in range(n):
+                if deg[v]:
+                    color[v] = 1
+            conflicts = []
+            fallback = fallback_passes = fallback_peak = 0
+            while True:
+                with self._phase("scan"):
+                    count = self._scan(read, index, state)
+                passes += 1
+                conflicts.append(count)
+                color, lose = state.color, state.lose
+                need = [v for v in range(n) if state.deg[v] and (not color[v] or lose[v])]
+                self._progress(n - len(need), n)
+                if not need:
+                    break
+                if passes == self.max_passes - 1:
+                    with self._phase("fallback"):
+                        fallback_passes, fallback_peak = self._fallback(read, index, state, need)
+                    passes += fallback_passes
+                    fallback = len(need)
+                    break
+                with self._phase("recolor"):
+                    self._recolor(state, need)
+
+            color = state.color
+            if index is None:
+                coloring = {v: color[v] for v in range(n) if state.deg[v]}
+            else:
+                coloring = {label: color[i] for label, i in index.items() if state.deg[i]}
+        finally:
+            state.close()
+        inst = self.instrumentation
+        if inst is not None:
+            inst.count("passes", passes)
+            inst.count("bytes_read", bytes_read[0])
+            inst.count("conflicts", sum(conflicts))
+        return {"coloring": coloring, "colors_used": max(coloring.values(), default=0),
+                "time": time.time() - start, "passes": passes, "bytes_read": bytes_read[0],
+                "vertices": len(coloring), "conflicts": conflicts, "fallback_vertices": fallback,
+                "fallback_passes": fallback_passes, "fallback_peak_edges": fallback_peak}
+
+    @staticmethod
+    def _edges(read, index):
+        """Плоские блоки рёбер файла; с index метки заменены номерами."""
+        for flat in read():
+            yield flat if index is None else [index[x] for x in flat]
+
+    def _index(self, read):
+        """Проход 1: степени по номерам вершин и словарь номеров (None — номер = метка)."""
+        deg = array('i')
+        index = None
+        seen = 0
+        for flat in read():
+            seen += len(flat)
+            top = -1
+            if index is None and all(type(x) is int and x >= 0 for x in flat):
+                top = max(flat, default=-1) + 1
+            # разреженные большие метки тоже переводят на словарь, чтобы массивы оставались O(n)
+            if 0 <= top <= 2 * seen + DENSE_SLACK:
+                if top > len(deg):
+                    deg.extend(array('i', bytes(4 * (top - len(deg)))))
+            else:
+                if index is None:
+                    # метки не годятся в номера: уже виденные вершины переносятся в словарь
+                    index = {}
+                    old, deg = deg, array('i')
+                    for v in range(len(old)):
+                        if old[v]:
+                            index[v] = len(deg)
+                            deg.append(old[v])
+                get = index.get
+                ids = []
+                for x in flat:
+                    i = get(x)
+                    if i is None:
+                        i = index[x] = len(deg)
+                        deg.append(0)
+                    ids.append(i)
+                flat = ids
+            it = iter(flat)
+            for u, v in zip(it, it):
+                if u != v:
+                    deg[u] += 1
+                    deg[v] += 1
+        return deg, index
+
+    def _scan(self, read, index, state):
+        """Проход по рёбрам: флаги проигравших и окна запрещённых цветов. Возвращает число конфликтов."""
+        state.clear_scratch()
+        forbid, lose, deg, color, base = state.forbid, state.lose, state.deg, state.color, state.base
+        seed = self.seed
+        conflicts = 0
+        for flat in self._edges(read, index):
+            it = iter(flat)
+            for u, v in zip(it, it):
+                if u == v:
+                    continue
+                cu = color[u]
+                cv = color[v]
+                if cu:
+                    k = cu - base[v]
+                    if 0 < k <= 64:
+                        forbid[v] |= 1 << (k - 1)
+                if cv:
+                    k = cv - base[u]
+                    if 0 < k <= 64:
+                        forbid[u] |= 1 << (k - 1)
+                    if cu == cv:
+                        conflicts += 1
+                        if (deg[u], _mix(u, seed), u) < (deg[v], _mix(v, seed), v):
+                            lose[u] = 1
+                        else:
+                            lose[v] = 1
+        return conflicts
+
+    @staticmethod
+    def _recolor(state, need):
+        forbid, color, base = state.forbid, state.color, state.base
+        for v in need:
+            f = forbid[v]
+            if f == _FULL:
+                # окно занято целиком: следующий проход соберёт следующие 64 цвета
+                base[v] += 64
+                color[v] = 0
+            else:
+                color[v] = base[v] + (~f & (f + 1)).bit_length()
+
+    def _fallback(self, read, index, state, need):
+        """
+        Докраска оставшихся вершин партиями: в порядке приоритета партия набирается,
+        пока сумма степеней не превысит fallback_edges, и за один проход в память
+        попадают только рёбра её вершин. Возвращает (число проходов, наибольшая партия
+        в концах рёбер).
+        """
+        color, deg = state.color, state.deg
+        for v in need:
+            color[v] = 0
+        seed = self.seed
+        order = sorted(need, key=lambda v: (deg[v], _mix(v, seed), v), reverse=True)
+        budget = self.fallback_edges if self.fallback_edges is not None else max(4 * state.n, 1 << 16)
+        passes = peak = 0
+        lo = 0
+        while lo < len(order):
+            # хотя бы одна вершина в партии, даже если её степень больше бюджета
+            hi, size = lo + 1, deg[order[lo]]
+            while hi < len(order) and size + deg[order[hi]] <= budget:
+                size += deg[order[hi]]
+                hi += 1
+            batch = order[lo:hi]
+            adj = {v: [] for v in batch}
+            for flat in self._edges(read, index):
+                it = iter(flat)
+                for u, v in zip(it, it):
+                    if u == v:
+                        continue
+                    nu = adj.get(u)
+                    if nu is not None:
+                        nu.append(v)
+                    nv = adj.get(v)
+                    if nv is not None:
+                        nv.append(u)
+            # соседи из следующих партий пока не окрашены (цвет 0) и не мешают
+            for v in batch:
+                used = {color[u] for u in adj[v]}
+                c = 1
+                while c in used:
+                    c += 1
+                color[v] = c
+            passes += 1
+            peak = max(peak, size)
+            lo = hi
+        return passes, peak
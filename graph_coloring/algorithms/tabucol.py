@@ -0,0 +1,146 @@
+import time, random
+from graph_coloring.algorithms.base import ColoringAlgorithm
+from graph_coloring.algorithms.dsatur import DSATURAlgorithm
+from graph_coloring.algorithms.exact import greedy_clique
+from graph_coloring.algorithms.greedy import GreedyAlgorithm
+
+
+class TabucolAlgorithm(ColoringAlgorithm):
+    """
+    Локальный поиск Tabucol (anytime): стартует с раскраски DSATUR или жадного
+    алгоритма и последовательно пытается уложиться в k - 1 цветов, минимизируя
+    число конфликтных рёбер табу-поиском.
+
+    Таблица gamma[v * k + c] — число соседей v цвета c — обновляется за O(deg)
+    на ход, поэтому выигрыш любого хода (v, c) считается за O(1):
+    gamma[v][c] - gamma[v][color[v]].
+
+    Останов — по бюджету времени time_budget (сек), по max_iterations
+    или по достижении нижней границы: наибольшей из lower_bound и размера
+    жадной клики (от clique_starts вершин, как в Exact). Поэтому уже
+    оптимальная стартовая раскраска возвращается сразу, без поиска.
+    progress(colors_used, iterations, elapsed) вызывается при каждом улучшении.
+    """
+    def __init__(self, initial='dsatur', time_budget=1.0, max_iterations=None, seed=None,
+                 progress=None, lower_bound=1, tenure=10, tenure_factor=0.6, clique_starts=64):
+        super().__init__(name="Tabucol")
+        self.initial = initial
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.seed = seed
+        self.progress = progress
+        self.lower_bound = lower_bound
+        self.tenure = tenure
+        self.tenure_factor = tenure_factor
+        self.clique_starts = clique_starts
+
+    def _initial_coloring(self, graph):
+        if isinstance(self.initial, ColoringAlgorithm):
+            return self.initial.run(graph)["coloring"]
+        if self.initial == 'greedy':
+            return GreedyAlgorithm().run(graph)["coloring"]
+        return DSATURAlgorithm().run(graph)["coloring"]
+
+    def run(self, graph):
+        start = time.time()
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        vertices = graph.vertices()
+        if not vertices:
+            return {"coloring": {}, "colors_used": 0, "time": 0.0, "iterations": 0, "lower_bound": 0}
+
+        index = {v: i for i, v in enumerate(vertices)}
+        adj = [[index[u] for u in graph.neighbors(v)] for v in vertices]
+        initial = self._initial_coloring(graph)
+        best = [initial[v] - 1 for v in vertices]
+        best_k = max(best) + 1
+        rng = random.Random(self.seed)
+        iterations = 0
+
+        lower_bound = max(self.lower_bound, 2 if any(adj) else 1)
+        if best_k > lower_bound:
+            lower_bound = max(lower_bound, len(greedy_clique(graph, self.clique_starts)))
+        while best_k > lower_bound:
+            k = best_k - 1
+            # старший цвет переносится на случайные цвета 0..k-1
+            color = [c if c < k else rng.randrange(k) for c in best]
+            found, used = self._search(adj, color, k, rng, deadline, iterations)
+            iterations += used
+            if not found:
+                break
+            best, best_k = color, k
+            if self.progress:
+                self.progress(best_k, iterations, time.time() - start)
+
+        coloring = {v: best[i] + 1 for i, v in enumerate(vertices)}
+        return {"coloring": coloring, "colors_used": best_k, "time": time.time() - start,
+                "iterations": iterations, "lower_bound": lower_bound}
+
+    def _search(self, adj, color, k, rng, deadline, done):
+        """Табу-поиск бесконфликтной k-раскраски; color меняется на месте."""
+        n = len(adj)
+        gamma = [0] * (n * k)
+        for v in range(n):
+            base = v * k
+            for u in adj[v]:
+                gamma[base + color[u]] += 1
+        conflicting = {v for v in range(n) if gamma[v * k + color[v]]}
+        conflicts = sum(gamma[v * k + color[v]] for v in conflicting) // 2
+        best_conflicts = conflicts
+        if conflicts and k < 2:
+            return False, 0
+        tabu = [0] * (n * k)
+        it = 0
+        max_it = self.max_iterations
+
+        while conflicts:
+            if max_it is not None and done + it >= max_it:
+                return False, it
+            if deadline is not None and (it & 255) == 0 and time.perf_counter() >= deadline:
+                return False, it
+            it += 1
+
+            best_delta = None
+            moves = []
+            for v in conflicting:
+                base = v * k
+                cv = color[v]
+                current = gamma[base + cv]
+                for c in range(k):
+                    if c == cv:
+                        continue
+                    delta = gamma[base + c] - current
+                    # аспирация: табу-ход разрешён, если даёт новый рекорд
+                    if tabu[base + c] > it and conflicts + delta >= best_conflicts:
+                        continue
+                    if best_delta is None or delta < best_delta:
+                        best_delta = delta
+                        moves = [(v, c)]
+                    elif delta == best_delta:
+                        moves.append((v, c))
+            if not moves:
+                v = rng.choice(tuple(conflicting))
+                c = rng.randrange(k - 1)
+                c = c + 1 if c >= color[v] else c
+                best_delta = gamma[v * k + c] - gamma[v * k + color[v]]
+            else:
+                v, c = moves[0] if len(moves) == 1 else rng.choice(moves)
+
+            old = color[v]
+            color[v] = c
+            conflicts += best_delta
+            tabu[v * k + old] = it + rng.randrange(self.tenure) + int(self.tenure_factor * len(conflicting))
+            for u in adj[v]:
+                base = u * k
+                gamma[base + old] -= 1
+                gamma[base + c] += 1
+                if gamma[base + color[u]]:
+                    conflicting.add(u)
+                else:
+                    conflicting.discard(u)
+            if gamma[v * k + c]:
+                conflicting.add(v)
+            else:
+                conflicting.discard(v)
+            if conflicts < best_conflicts:
+                best_conflicts = conflicts
+        return True, it
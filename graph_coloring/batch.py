@@ -0,0 +1,274 @@
+"""
+Пакетный режим: много графов × много конфигураций алгоритмов в одном процессе-родителе.
+
+    python main.py batch "graphs/*.txt" --algos dsatur,greedy:random,greedy:smallest_last \
+        --out-dir runs --workers 4 --format jsonl --db graph_data.db
+
+Графы задаются glob-шаблонами и/или файлом-манифестом (--manifest: путь или
+шаблон на строку, # — комментарий). Конфигурация — имя[:стратегия]; стратегия
+передаётся алгоритму параметром из STRATEGY_PARAMS. Задания выполняются в пуле
+процессов; по завершении каждого в поток (stdout или --summary) пишется строка
+сводки (JSONL или CSV), а раскраска — в <out-dir>/<граф>/<конфигурация>.csv.
+С --db результаты пишутся в Database пачками по --db-batch в одной транзакции.
+--timeout ограничивает время Tabucol и Exact на задание; Exact без него
+получает EXACT_TIMEOUT, чтобы один трудный граф не занимал исполнитель
+бесконечно.
+"""
+import argparse, csv, glob, json, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from graph_coloring.algorithms.dsatur import DSATURAlgorithm
+from graph_coloring.algorithms.exact import ExactAlgorithm
+from graph_coloring.algorithms.greedy import GreedyAlgorithm
+from graph_coloring.algorithms.parallel_jp import ParallelJPAlgorithm
+from graph_coloring.algorithms.portfolio import PortfolioAlgorithm
+from graph_coloring.algorithms.tabucol import TabucolAlgorithm
+from graph_coloring.database_module import DETERMINISTIC_CONFIGS, Database
+from graph_coloring.io_module import export_coloring, load_edgelist
+
+ALGORITHMS = {
+    "dsatur": DSATURAlgorithm,
+    "greedy": GreedyAlgorithm,
+    "portfolio": PortfolioAlgorithm,
+    "tabucol": TabucolAlgorithm,
+    "exact": ExactAlgorithm,
+    "jp": ParallelJPAlgorithm,
+}
+
+# параметр конструктора, в который передаётся стратегия из конфигурации
+STRATEGY_PARAMS = {
+    "dsatur": "tie_break",
+    "greedy": "order_strategy",
+    "tabucol": "initial",
+    "jp": "priority",
+}
+# алгоритмы, принимающие seed
+SEEDED = ("portfolio", "tabucol", "jp")
+# алгоритмы со своим пулом процессов: внутри исполнителя пакета работают в один процесс
+POOLED = ("portfolio", "jp")
+# результат зависит от бюджета времени или порядка завершения в пуле: seed его не воспроизводит,
+# поэтому в базу такие раскраски пишутся без seed и не переиспользуются; так же пишется
+# Exact, остановленный по лимиту времени (timed_out в строке сводки)
+TIME_DEPENDENT = ("tabucol", "portfolio")
+# лимит времени Exact на задание по умолчанию, с
+EXACT_TIMEOUT = 60.0
+
+SUMMARY_FIELDS = ["graph", "path", "algorithm", "order_strategy", "n", "m", "colors_used",
+                  "time", "status", "error", "output", "timed_out"]
+
+# последний загруженный граф процесса-исполнителя: задания одного графа идут подряд
+_loaded = (None, None)
+
+
+def parse_config(text):
+    """'greedy:random' -> ('greedy', 'random'); стратегия необязательна."""
+    name, _, strategy = text.strip().partition(":")
+    if name not in ALGORITHMS:
+        raise ValueError(f"Неизвестный алгоритм: {name}")
+    if strategy and name not in STRATEGY_PARAMS:
+        raise ValueError(f"Алгоритм {name} не принимает стратегию")
+    return name, strategy or None
+
+
+def make_algorithm(name, strategy=None, seed=0, in_pool=False, timeout=None):
+    """Алгоритм конфигурации; timeout — бюджет времени для Tabucol и Exact, остальные его не принимают."""
+    kwargs = {}
+    if strategy:
+        kwargs[STRATEGY_PARAMS[name]] = strategy
+    if name in SEEDED:
+        kwargs["seed"] = seed
+    if in_pool and name in POOLED:
+        kwargs["max_workers"] = 1
+    if timeout is not None and name == "exact":
+        kwargs["timeout"] = timeout
+    algo = ALGORITHMS[name](**kwargs)
+    if timeout is not None and name == "tabucol":
+        algo.time_budget = timeout if algo.time_budget is None else min(algo.time_budget, timeout)
+    return algo
+
+
+def expand_inputs(patterns=(), manifest=None):
+    """Пути графов по шаблонам и манифесту; порядок сохраняется, повторы отбрасываются."""
+    patterns = list(patterns)
+    if manifest:
+        with open(manifest, encoding="utf-8") as f:
+            patterns += [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or ([pattern] if os.path.exists(pattern) else []):
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def plan_jobs(paths, configs, out_dir, seed=0, timeout=None):
+    """Задания (граф × конфигурация) с уникальными выходными путями; Exact без timeout получает EXACT_TIMEOUT."""
+    jobs = []
+    names = set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, k = stem, 1
+        while name in names:
+            k += 1
+            name = f"{stem}-{k}"
+        names.add(name)
+        for algorithm, strategy in configs:
+            label = algorithm + (f"_{strategy}" if strategy else "")
+            limit = EXACT_TIMEOUT if timeout is None and algorithm == "exact" else timeout
+            jobs.append({"graph": name, "path": path, "algorithm": algorithm, "order_strategy": strategy,
+                         "seed": seed, "timeout": limit,
+                         "output": os.path.join(out_dir, name, label + ".csv") if out_dir else None})
+    return jobs
+
+
+def run_job(job, in_pool=False, with_coloring=False):
+    """Одно задание; исключения не выбрасываются, а попадают в строку сводки."""
+    global _loaded
+    row = {k: job[k] for k in ("graph", "path", "algorithm", "order_strategy", "output")}
+    row.update(n=None, m=None, colors_used=None, time=None, status="ok", error=None, timed_out=None)
+    try:
+        if _loaded[0] != job["path"]:
+            _loaded = (job["path"], load_edgelist(job["path"], frozen=True))
+        g = _loaded[1]
+        row.update(n=g.n(), m=g.m())
+        random.seed(job["seed"])
+        algo = make_algorithm(job["algorithm"], job["order_strategy"], job["seed"], in_pool, job["timeout"])
+        res = algo.run(g)
+        coloring = g.to_labels(res["coloring"])
+        # в сводку и базу идёт фактическая стратегия, в том числе умолчание алгоритма
+        param = STRATEGY_PARAMS.get(job["algorithm"])
+        strategy = getattr(algo, param) if param else None
+        row.update(colors_used=res["colors_used"], time=res["time"], algorithm_name=algo.name,
+                   order_strategy=strategy if isinstance(strategy, str) else job["order_strategy"],
+                   timed_out=res.get("optimal") is False)
+        if job["output"]:
+            os.makedirs(os.path.dirname(job["output"]), exist_ok=True)
+            export_coloring(job["output"], coloring)
+        if with_coloring:
+            row["coloring"] = coloring
+    except Exception as e:
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+    return row
+
+
+class SummaryWriter:
+    """Построчная сводка в JSONL или CSV; каждая строка сразу сбрасывается на диск."""
+    def __init__(self, stream, fmt="jsonl"):
+        self.stream = stream
+        self.fmt = fmt
+        self.csv = None
+        if fmt == "csv":
+            self.csv = csv.DictWriter(stream, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv is not None:
+            self.csv.writerow(row)
+        else:
+            self.stream.write(json.dumps({k: row.get(k) for k in SUMMARY_FIELDS}, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class DatabaseRecorder:
+    """Запись результатов в Database: граф регистрируется один раз, раскраски — пачками."""
+    def __init__(self, db, batch_size=100):
+        self.db = db
+        self.batch_size = batch_size
+        self.graph_ids = {}
+        self.pending = []
+
+    def add(self, row):
+        if row["status"] != "ok":
+            return
+        path = row["path"]
+        if path not in self.graph_ids:
+            # граф уже закэширован исполнителем в .gcsr — открытие дешёвое
+            graph = load_edgelist(path, frozen=True).thaw()
+            self.graph_ids[path] = self.db.add_graph_model(row["graph"], graph, fingerprint=graph.fingerprint())
+        name = row["algorithm_name"]
+        strategy = row["order_strategy"] or ""
+        if (name, strategy) in DETERMINISTIC_CONFIGS or row["algorithm"] in TIME_DEPENDENT or row["timed_out"]:
+            seed = None
+        else:
+            seed = row.get("seed")
+        self.pending.append((self.graph_ids[path], name, strategy, row["colors_used"], row["time"],
+                             row["coloring"], seed))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.db.add_colorings(self.pending)
+            self.pending = []
+
+
+def run_batch(jobs, workers=None, summary=None, recorder=None):
+    """Выполняет задания; on-line пишет сводку. Возвращает список строк сводки."""
+    with_coloring = recorder is not None
+    rows = []
+
+    def finish(job, row):
+        row["seed"] = job["seed"]
+        if recorder is not None:
+            recorder.add(row)
+        row.pop("coloring", None)
+        if summary is not None:
+            summary.write(row)
+        rows.append(row)
+
+    if workers == 1:
+        for job in jobs:
+            finish(job, run_job(job, False, with_coloring))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_job, job, True, with_coloring): job for job in jobs}
+            for fut in as_completed(futures):
+                finish(futures[fut], fut.result())
+    if recorder is not None:
+        recorder.flush()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python main.py batch")
+    parser.add_argument("inputs", nargs="*", help="пути или glob-шаблоны графов")
+    parser.add_argument("--manifest", help="файл со списком графов (путь или шаблон на строку)")
+    parser.add_argument("--algos", default="dsatur",
+                        help="конфигурации через запятую: имя[:стратегия], например greedy:random")
+    parser.add_argument("--out-dir", default="batch_out", help="каталог для раскрасок ('' — не сохранять)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--summary", help="файл сводки (по умолчанию stdout)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=None,
+                        help=f"лимит времени Tabucol и Exact на задание, с (Exact по умолчанию {EXACT_TIMEOUT:g})")
+    parser.add_argument("--db", help="записать результаты в базу SQLite")
+    parser.add_argument("--db-batch", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    configs = [parse_config(c) for c in args.algos.split(",") if c.strip()]
+    paths = expand_inputs(args.inputs, args.manifest)
+    if not paths:
+        parser.error("не найдено ни одного графа")
+    jobs = plan_jobs(paths, configs, args.out_dir, args.seed, args.timeout)
+
+    stream = open(args.summary, "w", newline="", encoding="utf-8") if args.summary else sys.stdout
+    db = None
+    try:
+        recorder = None
+        if args.db:
+            db = Database(args.db)
+            recorder = DatabaseRecorder(db, args.db_batch)
+        start = time.perf_counter()
+        rows = run_batch(jobs, args.workers, SummaryWriter(stream, args.format), recorder)
+    finally:
+        if db is not None:
+            db.close()
+        if stream is not sys.stdout:
+            stream.close()
+    failed = sum(row["status"] != "ok" for row in rows)
+    print(f"{len(rows)} jobs, {failed} failed, {time.perf_counter() - start:.3f}s", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,171 @@
+"""
+Воспроизводимый бенчмарк алгоритмов раскраски.
+
+    python -m graph_coloring.benchmark run --out bench.json
+    python -m graph_coloring.benchmark compare baseline.json bench.json --time-threshold 0.2
+
+run: все алгоритмы и стратегии на tests/*.txt и сгенерированных семействах
+графов возрастающего размера; время — perf_counter (прогрев + повторы),
+пиковая память и счётчики (ColoringAlgorithm.profile) — отдельным прогоном
+под tracemalloc, число цветов.
+compare: завершается с кодом 1, если время (медиана) выросло больше чем на
+time_threshold или число цветов выросло больше чем на colors_threshold.
+"""
+import argparse, glob, json, os, platform, random, statistics, sys, time
+
+from graph_coloring import generators
+from graph_coloring.algorithms.dsatur import DSATURAlgorithm
+from graph_coloring.algorithms.greedy import GreedyAlgorithm
+from graph_coloring.io_module import load_edgelist
+
+CONFIGS = [
+    ("greedy", "degree_desc"),
+    ("greedy", "as_loaded"),
+    ("greedy", "random"),
+    ("greedy", "smallest_last"),
+    ("dsatur", "degree_desc"),
+    ("dsatur", "random"),
+]
+
+DEFAULT_SIZES = (1000, 10000)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests")
+
+
+def make_algorithm(algorithm, strategy):
+    if algorithm == "dsatur":
+        return DSATURAlgorithm(tie_break=strategy)
+    return GreedyAlgorithm(order_strategy=strategy)
+
+
+def graph_suite(sizes=DEFAULT_SIZES, data_dir=DATA_DIR, seed=0):
+    """Пары (имя, фабрика графа): файлы из data_dir и сгенерированные семейства."""
+    suite = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.txt"))):
+        suite.append((os.path.basename(path), lambda p=path: load_edgelist(p)))
+    for n in sizes:
+        suite.append((f"gnp-{n}", lambda n=n: generators.gnp(n, 10.0 / n, seed)))
+        suite.append((f"geometric-{n}", lambda n=n: generators.random_geometric(n, (12.0 / (3.1416 * n)) ** 0.5, seed)))
+        suite.append((f"powerlaw-{n}", lambda n=n: generators.power_law(n, 3, seed)))
+    # «трудные» инстансы в духе DIMACS растут с размером набора
+    for k in range(5, 6 + len(sizes)):
+        suite.append((f"myciel{k}", lambda k=k: generators.mycielski(k)))
+    for k in range(8, 9 + 2 * len(sizes), 2):
+        suite.append((f"queen{k}_{k}", lambda k=k: generators.queen(k)))
+    return suite
+
+
+def measure(algorithm, strategy, graph, warmups=1, repeats=5, seed=0):
+    """Замер одной конфигурации: времена повторов, пиковая память и число цветов."""
+    times = []
+    colors = None
+    for i in range(warmups + repeats):
+        random.seed(seed)
+        algo = make_algorithm(algorithm, strategy)
+        t0 = time.perf_counter()
+        res = algo.run(graph)
+        elapsed = time.perf_counter() - t0
+        if i >= warmups:
+            times.append(elapsed)
+        colors = res["colors_used"]
+
+    # отдельный прогон под tracemalloc: заодно собираются счётчики и фазы
+    random.seed(seed)
+    stats = make_algorithm(algorithm, strategy).profile(graph, memory=True)["stats"]
+
+    return {
+        "algorithm": algorithm,
+        "order_strategy": strategy,
+        "colors_used": colors,
+        "time_min": min(times),
+        "time_median": statistics.median(times),
+        "times": times,
+        "peak_memory_bytes": stats["peak_memory_bytes"],
+        "counters": stats["counters"],
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, warmups=1, repeats=5, seed=0, configs=CONFIGS, log=None):
+    results = []
+    for name, factory in graph_suite(sizes, seed=seed):
+        graph = factory()
+        for algorithm, strategy in configs:
+            row = {"graph": name, "n": graph.n(), "m": graph.m()}
+            row.update(measure(algorithm, strategy, graph, warmups, repeats, seed))
+            results.append(row)
+            if log:
+                log(f"{name:>16} {algorithm:>7}/{strategy:<12} colors={row['colors_used']:<4} "
+                    f"median={row['time_median']:.6f}s peak={row['peak_memory_bytes'] // 1024}KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "warmups": warmups,
+            "repeats": repeats,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, time_threshold=0.2, colors_threshold=0, min_time=1e-3):
+    """
+    Сравнивает два отчёта run_suite. Возвращает список описаний регрессий.
+    Время сравнивается только для замеров дольше min_time (короткие слишком шумные).
+    """
+    key = lambda r: (r["graph"], r["algorithm"], r["order_strategy"])
+    base = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = base.get(key(row))
+        if old is None:
+            continue
+        label = "{}/{}/{}".format(*key(row))
+        if row["colors_used"] > old["colors_used"] + colors_threshold:
+            regressions.append(f"{label}: colors {old['colors_used']} -> {row['colors_used']}")
+        if max(old["time_median"], row["time_median"]) >= min_time and \
+                row["time_median"] > old["time_median"] * (1 + time_threshold):
+            regressions.append(f"{label}: time {old['time_median']:.6f}s -> {row['time_median']:.6f}s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m graph_coloring.benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="выполнить бенчмарк и записать JSON")
+    p_run.add_argument("--out", default="bench.json")
+    p_run.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    p_run.add_argument("--warmups", type=int, default=1)
+    p_run.add_argument("--repeats", type=int, default=5)
+    p_run.add_argument("--seed", type=int, default=0)
+
+    p_cmp = sub.add_parser("compare", help="сравнить с базовым отчётом")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--time-threshold", type=float, default=0.2)
+    p_cmp.add_argument("--colors-threshold", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        report = run_suite(sizes, args.warmups, args.repeats, args.seed, log=print)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Saved to {args.out}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.time_threshold, args.colors_threshold)
+    for line in regressions:
+        print("REGRESSION", line)
+    if not regressions:
+        print("OK: no regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
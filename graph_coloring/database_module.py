@@ -1,13 +1,215 @@
-import sqlite3, json, os
+import sqlite3, json, logging, os, re, zlib
+from array import array
+from collections import OrderedDict
+from graph_coloring.graph_model import GraphModel
+
+log = logging.getLogger(__name__)
+
+# конфигурации, результат которых полностью определяется графом
+DETERMINISTIC_CONFIGS = {
+    ("Greedy", "degree_desc"),
+    ("Greedy", "as_loaded"),
+    ("Greedy", "smallest_last"),
+    ("DSATUR", "degree_desc"),
+}
+
+# версия схемы хранится в PRAGMA user_version
+SCHEMA_VERSION = 2
+# сколько списков меток графов держит Database (LRU)
+LABEL_CACHE_SIZE = 64
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def is_cacheable(algorithm, order_strategy, seed=None):
+    """Раскраску можно переиспользовать, если конфигурация детерминирована или задан seed."""
+    return seed is not None or (algorithm, order_strategy) in DETERMINISTIC_CONFIGS
+
+
+class ColoringLRU:
+    """
+    LRU-кэш раскрасок в памяти процесса. Размер ограничен суммарным числом
+    вершин в хранимых раскрасках (max_vertices), а не числом записей.
+    """
+    def __init__(self, max_vertices=1_000_000):
+        self.max_vertices = max_vertices
+        self.size = 0
+        self.data = OrderedDict()
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is not None:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        old = self.data.pop(key, None)
+        if old is not None:
+            self.size -= len(old["coloring"])
+        cost = len(value["coloring"])
+        if cost > self.max_vertices:
+            return
+        self.data[key] = value
+        self.size += cost
+        while self.size > self.max_vertices:
+            _, evicted = self.data.popitem(last=False)
+            self.size -= len(evicted["coloring"])
+
+
+# --- компактные бинарные форматы -------------------------------------------
+#
+# Массив целых: 1 байт typecode ('i' или 'q'), 1 байт флага сжатия (zlib), данные.
+# Метки вершин: 1 байт вида (I — int64-массив, J — JSON-список), затем данные.
+# Раскраска: 1 байт вида (A — цвета по порядку меток графа, P — свои метки + цвета).
+
+_COMPRESS_MIN_BYTES = 4096
+
+
+def pack_ints(values, compress=True):
+    values = values if isinstance(values, array) else array('q', values)
+    if values.typecode != 'i' and (not values or (min(values) >= -2 ** 31 and max(values) < 2 ** 31)):
+        values = array('i', values)
+    data = values.tobytes()
+    flag = b'\0'
+    if compress and len(data) >= _COMPRESS_MIN_BYTES:
+        packed = zlib.compress(data, 1)
+        if len(packed) < len(data):
+            data, flag = packed, b'\1'
+    return values.typecode.encode('ascii') + flag + data
+
+
+def unpack_ints(blob):
+    typecode = chr(blob[0])
+    data = blob[2:]
+    if blob[1]:
+        data = zlib.decompress(data)
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+def pack_labels(labels, compress=True):
+    if all(type(v) is int and -2 ** 63 <= v < 2 ** 63 for v in labels):
+        return b'I' + pack_ints(array('q', labels), compress)
+    data = json.dumps(list(labels), ensure_ascii=False).encode('utf-8')
+    return b'J' + (zlib.compress(data, 1) if compress else data)
+
+
+def unpack_labels(blob):
+    if blob[:1] == b'I':
+        return list(unpack_ints(blob[1:]))
+    data = blob[1:]
+    if data[:1] != b'[':
+        data = zlib.decompress(data)
+    return [tuple(v) if isinstance(v, list) else v for v in json.loads(data.decode('utf-8'))]
+
+
+def encode_graph(vertices, edges, compress=True):
+    """(labels_blob, edges_blob): метки по порядку и пары id рёбер одним плоским массивом."""
+    index = {}
+    for v in vertices:
+        index.setdefault(v, len(index))
+    flat = array('q')
+    for u, v in edges:
+        flat.append(index.setdefault(u, len(index)))
+        flat.append(index.setdefault(v, len(index)))
+    return pack_labels(list(index), compress), pack_ints(flat, compress)
+
+
+def decode_graph(labels_blob, edges_blob):
+    labels = unpack_labels(labels_blob)
+    g = GraphModel()
+    for v in labels:
+        g.add_vertex(v)
+    adj = g.adj
+    it = iter(unpack_ints(edges_blob))
+    for i, j in zip(it, it):
+        u, v = labels[i], labels[j]
+        if u != v:
+            adj[u].add(v)
+            adj[v].add(u)
+    return g
+
+
+def encode_coloring(coloring, labels=None, compress=True):
+    if labels is not None and len(labels) == len(coloring) and all(v in coloring for v in labels):
+        return b'A' + pack_ints([coloring[v] for v in labels], compress)
+    labels_blob = pack_labels(list(coloring), compress)
+    return b'P' + len(labels_blob).to_bytes(8, 'little') + labels_blob + pack_ints(list(coloring.values()), compress)
+
+
+def decode_coloring(blob, labels=None):
+    """Раскраска из BLOB; для вида 'A' нужны метки графа. Понимает и старый JSON-текст."""
+    if isinstance(blob, str):
+        data = json.loads(blob)
+        if isinstance(data, dict):
+            # старый формат: ключи JSON-объекта — строки, сопоставляем с метками графа
+            by_str = {str(v): v for v in labels} if labels else {}
+            return {by_str.get(k, k): c for k, c in data.items()}
+        return {(tuple(v) if isinstance(v, list) else v): c for v, c in data}
+    if blob[:1] == b'A':
+        return dict(zip(labels, unpack_ints(blob[1:])))
+    size = int.from_bytes(blob[1:9], 'little')
+    return dict(zip(unpack_labels(blob[9:9 + size]), unpack_ints(blob[9 + size:])))
+
+
+_LEGACY_EDGE_RE = re.compile(r'^(-?\d+)-(-?\d+)$')
+
+
+def parse_legacy_edges(text):
+    """
+    Разбор старого поля graphs.data ("u-v,u-v,..."). Пары целых распознаются
+    точно, элемент с единственным '-' делится по нему; остальное (метки с '-')
+    неоднозначно и отвергается ValueError, а не угадывается.
+    """
+    edges = []
+    for item in text.split(",") if text else ():
+        match = _LEGACY_EDGE_RE.match(item)
+        if match:
+            edges.append((int(match.group(1)), int(match.group(2))))
+        elif item.count("-") == 1:
+            u, v = item.split("-")
+            edges.append((u, v))
+        else:
+            raise ValueError(f"Неоднозначное ребро в старом формате: {item!r}")
+    return edges
+
 
 class Database:
-    def __init__(self, path="graph_data.db"):
+    """
+    Хранилище графов и раскрасок в SQLite. Соединение открывается один раз
+    на время жизни объекта (WAL, настроенные PRAGMA); графы и раскраски
+    хранятся компактными BLOB (упакованные массивы, при необходимости zlib).
+    """
+    def __init__(self, path="graph_data.db", cache_vertices=1_000_000, compress=True):
         self.path = path
+        self.compress = compress
+        self.cache = ColoringLRU(cache_vertices)
+        self._labels = OrderedDict()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
         self._ensure_db()
 
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def _ensure_db(self):
-        conn = sqlite3.connect(self.path)
-        c = conn.cursor()
+        c = self.conn.cursor()
         c.execute("""CREATE TABLE IF NOT EXISTS graphs (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         name TEXT,
@@ -25,39 +227,264 @@ class Database:
                         coloring TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                      )""")
-        conn.commit()
-        conn.close()
-
-    def add_graph(self, name, n, m, edges):
-        conn = sqlite3.connect(self.path)
-        c = conn.cursor()
-        edges_str = ",".join([f"{u}-{v}" for u, v in edges])
-        c.execute("INSERT INTO graphs (name, n, m, data) VALUES (?, ?, ?, ?)", (name, n, m, edges_str))
-        conn.commit()
-        conn.close()
-
-    def add_coloring(self, graph_id, algorithm, order_strategy, colors_used, time_sec, coloring):
-        conn = sqlite3.connect(self.path)
-        c = conn.cursor()
-        c.execute("""INSERT INTO colorings 
-                     (graph_id, algorithm, order_strategy, colors_used, time_sec, coloring)
-                     VALUES (?, ?, ?, ?, ?, ?)""",
-                  (graph_id, algorithm, order_strategy, colors_used, time_sec, json.dumps(coloring)))
-        conn.commit()
-        conn.close()
+        # миграции: новые столбцы добавляются к базам, созданным старыми версиями
+        graph_columns = self._columns(c, "graphs")
+        for column, kind in (("fingerprint", "TEXT"), ("labels", "BLOB"), ("edges", "BLOB")):
+            if column not in graph_columns:
+                c.execute(f"ALTER TABLE graphs ADD COLUMN {column} {kind}")
+        coloring_columns = self._columns(c, "colorings")
+        for column, kind in (("seed", "INTEGER"), ("coloring_blob", "BLOB")):
+            if column not in coloring_columns:
+                c.execute(f"ALTER TABLE colorings ADD COLUMN {column} {kind}")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_graphs_fingerprint ON graphs(fingerprint)")
+        # история запусков: выборка по графу (в порядке id) и по алгоритму/времени создания
+        c.execute("CREATE INDEX IF NOT EXISTS idx_colorings_graph ON colorings(graph_id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_colorings_graph_algo_created "
+                  "ON colorings(graph_id, algorithm, created_at)")
+        self.conn.commit()
+        if c.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self.upgrade()
+
+    @staticmethod
+    def _columns(cursor, table):
+        return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+
+    def upgrade(self):
+        """
+        Переводит строки старого формата (graphs.data TEXT, colorings.coloring JSON)
+        в BLOB-столбцы одной транзакцией. Старые поля не очищаются; строка
+        переводится, только если BLOB раскодируется обратно в те же данные.
+        Графы с неоднозначными метками остаются в старом формате (load_graph
+        читает их по старому полю) и попадают в журнал; версия схемы
+        повышается в любом случае, чтобы проход не повторялся при каждом
+        открытии, — повторить его можно явным вызовом upgrade(). Возвращает
+        id графов, которые перевести не удалось.
+        """
+        skipped = []
+        kept = []
+        with self.conn:
+            rows = self.conn.execute("SELECT id, data FROM graphs WHERE edges IS NULL").fetchall()
+            for graph_id, data in rows:
+                try:
+                    edges = parse_legacy_edges(data)
+                except ValueError:
+                    skipped.append(graph_id)
+                    continue
+                labels_blob, edges_blob = encode_graph((), edges, self.compress)
+                if decode_graph(labels_blob, edges_blob).adj != GraphModel.from_edgelist(edges).adj:
+                    skipped.append(graph_id)
+                    continue
+                self.conn.execute("UPDATE graphs SET labels=?, edges=? WHERE id=?",
+                                  (labels_blob, edges_blob, graph_id))
+            rows = self.conn.execute("""SELECT id, graph_id, coloring FROM colorings
+                                        WHERE coloring_blob IS NULL AND coloring IS NOT NULL""").fetchall()
+            for coloring_id, graph_id, text in rows:
+                labels = self._graph_labels(graph_id)
+                coloring = decode_coloring(text, labels)
+                blob = encode_coloring(coloring, labels, self.compress)
+                if decode_coloring(blob, labels) != coloring:
+                    kept.append(coloring_id)
+                    continue
+                self.conn.execute("UPDATE colorings SET coloring_blob=? WHERE id=?", (blob, coloring_id))
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        if skipped:
+            log.warning("upgrade: графы %s оставлены в старом формате (неоднозначные рёбра)", skipped)
+        if kept:
+            log.warning("upgrade: раскраски %s оставлены в старом формате", kept)
+        return skipped
+
+    def _graph_labels(self, graph_id):
+        labels = self._labels.get(graph_id)
+        if labels is None:
+            row = self.conn.execute("SELECT labels FROM graphs WHERE id=?", (graph_id,)).fetchone()
+            labels = unpack_labels(row[0]) if row and row[0] is not None else None
+            if labels is not None:
+                self._labels[graph_id] = labels
+                while len(self._labels) > LABEL_CACHE_SIZE:
+                    self._labels.popitem(last=False)
+        else:
+            self._labels.move_to_end(graph_id)
+        return labels
+
+    def _graph_row(self, name, n, m, edges, fingerprint=None, vertices=()):
+        labels_blob, edges_blob = encode_graph(vertices, edges, self.compress)
+        return (name, n, m, fingerprint, labels_blob, edges_blob)
+
+    def add_graph(self, name, n, m, edges, fingerprint=None, vertices=()):
+        """
+        Добавляет граф и возвращает его id. Если задан fingerprint и граф
+        с таким отпечатком уже есть, новая строка не создаётся. vertices задаёт
+        порядок меток (и изолированные вершины); иначе он берётся из рёбер.
+        """
+        if fingerprint is not None:
+            graph_id = self.find_graph(fingerprint)
+            if graph_id is not None:
+                return graph_id
+        with self.conn:
+            c = self.conn.execute("INSERT INTO graphs (name, n, m, fingerprint, labels, edges) VALUES (?, ?, ?, ?, ?, ?)",
+                                  self._graph_row(name, n, m, edges, fingerprint, vertices))
+        return c.lastrowid
+
+    def add_graph_model(self, name, graph, fingerprint=None):
+        """Сохраняет GraphModel целиком (рёбра берутся из списка смежности)."""
+        edges = [(v, u) for v in graph.adj for u in graph.adj[v] if _edge_owner(v, u)]
+        return self.add_graph(name, graph.n(), graph.m(), edges, fingerprint, vertices=graph.vertices())
+
+    def add_graphs(self, graphs):
+        """
+        Пакетная вставка: graphs — итерируемое кортежей (name, n, m, edges[, fingerprint[, vertices]]).
+        Одна транзакция и executemany; дедупликация по отпечатку здесь не выполняется.
+        """
+        rows = [self._graph_row(*g) for g in graphs]
+        with self.conn:
+            self.conn.executemany("INSERT INTO graphs (name, n, m, fingerprint, labels, edges) VALUES (?, ?, ?, ?, ?, ?)",
+                                  rows)
+
+    def load_graph(self, graph_id):
+        """Восстанавливает GraphModel по id (None, если графа нет)."""
+        row = self.conn.execute("SELECT labels, edges, data FROM graphs WHERE id=?", (graph_id,)).fetchone()
+        if row is None:
+            return None
+        if row[1] is None:
+            return GraphModel.from_edgelist(parse_legacy_edges(row[2]))
+        return decode_graph(row[0], row[1])
+
+    def find_graph(self, fingerprint):
+        row = self.conn.execute("SELECT id FROM graphs WHERE fingerprint=? ORDER BY id LIMIT 1",
+                                (fingerprint,)).fetchone()
+        return row[0] if row else None
+
+    def _coloring_row(self, graph_id, algorithm, order_strategy, colors_used, time_sec, coloring, seed=None):
+        blob = encode_coloring(coloring, self._graph_labels(graph_id), self.compress)
+        return (graph_id, algorithm, order_strategy, colors_used, time_sec, blob, seed)
+
+    def add_coloring(self, graph_id, algorithm, order_strategy, colors_used, time_sec, coloring, seed=None):
+        self.add_colorings([(graph_id, algorithm, order_strategy, colors_used, time_sec, coloring, seed)])
+
+    def add_colorings(self, colorings):
+        """
+        Пакетная вставка раскрасок одной транзакцией: colorings — кортежи
+        (graph_id, algorithm, order_strategy, colors_used, time_sec, coloring[, seed]).
+        """
+        colorings = list(colorings)
+        rows = [self._coloring_row(*row) for row in colorings]
+        with self.conn:
+            self.conn.executemany("""INSERT INTO colorings
+                                     (graph_id, algorithm, order_strategy, colors_used, time_sec, coloring_blob, seed)
+                                     VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
+        for row in colorings:
+            graph_id, algorithm, order_strategy, colors_used, time_sec, coloring = row[:6]
+            seed = row[6] if len(row) > 6 else None
+            if not is_cacheable(algorithm, order_strategy, seed):
+                continue
+            fp = self.conn.execute("SELECT fingerprint FROM graphs WHERE id=?", (graph_id,)).fetchone()
+            if fp and fp[0]:
+                self.cache.put((fp[0], algorithm, order_strategy, seed),
+                               {"coloring": dict(coloring), "colors_used": colors_used, "time": time_sec})
+
+    def _decode_row_coloring(self, graph_id, blob, text):
+        labels = self._graph_labels(graph_id)
+        return decode_coloring(blob if blob is not None else text, labels)
+
+    def get_cached_coloring(self, fingerprint, algorithm, order_strategy, seed=None):
+        """
+        Ранее сохранённый результат для (fingerprint, algorithm, order_strategy, seed)
+        в формате run() с ключом "cached": True, либо None. Недетерминированные
+        конфигурации без seed не кэшируются.
+        """
+        if not is_cacheable(algorithm, order_strategy, seed):
+            return None
+        key = (fingerprint, algorithm, order_strategy, seed)
+        hit = self.cache.get(key)
+        if hit is None:
+            row = self.conn.execute("""SELECT c.graph_id, c.colors_used, c.time_sec, c.coloring_blob, c.coloring
+                                       FROM colorings c JOIN graphs g ON g.id = c.graph_id
+                                       WHERE g.fingerprint=? AND c.algorithm=? AND c.order_strategy=? AND c.seed IS ?
+                                       ORDER BY c.id DESC LIMIT 1""",
+                                    (fingerprint, algorithm, order_strategy, seed)).fetchone()
+            if row is None:
+                return None
+            hit = {"coloring": self._decode_row_coloring(row[0], row[3], row[4]),
+                   "colors_used": row[1], "time": row[2]}
+            self.cache.put(key, hit)
+        return {"coloring": dict(hit["coloring"]), "colors_used": hit["colors_used"],
+                "time": hit["time"], "cached": True}
 
     def get_graphs(self):
-        conn = sqlite3.connect(self.path)
-        c = conn.cursor()
-        c.execute("SELECT id, name, n, m FROM graphs")
-        data = c.fetchall()
-        conn.close()
-        return data
+        return self.conn.execute("SELECT id, name, n, m FROM graphs").fetchall()
+
+    def list_colorings(self, graph_id, limit=100, after_id=None, algorithm=None):
+        """
+        Страница истории запусков без самих раскрасок (keyset-пагинация по id):
+        список кортежей (id, algorithm, order_strategy, colors_used, time_sec, seed, created_at).
+        Для следующей страницы передайте after_id = id последней строки.
+        """
+        query = """SELECT id, algorithm, order_strategy, colors_used, time_sec, seed, created_at
+                   FROM colorings WHERE graph_id=? AND id>?"""
+        params = [graph_id, after_id if after_id is not None else 0]
+        if algorithm is not None:
+            query += " AND algorithm=?"
+            params.append(algorithm)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        return self.conn.execute(query, params).fetchall()
+
+    def get_coloring(self, coloring_id):
+        """Полная раскраска одного запуска (декодируется только здесь); None, если запуска нет."""
+        row = self.conn.execute("SELECT graph_id, coloring_blob, coloring FROM colorings WHERE id=?",
+                                (coloring_id,)).fetchone()
+        if row is None:
+            return None
+        return self._decode_row_coloring(*row)
+
+    def get_coloring_summary(self, graph_id, percentiles=(50, 90, 95)):
+        """
+        Сводка по запускам графа в разрезе (algorithm, order_strategy), без чтения раскрасок:
+        runs, best_colors, worst_colors, mean_time, min_time, max_time и p<N>_time (метод ближайшего ранга).
+        """
+        summary = {}
+        rows = self.conn.execute("""SELECT algorithm, order_strategy, COUNT(*), MIN(colors_used), MAX(colors_used),
+                                           AVG(time_sec), MIN(time_sec), MAX(time_sec)
+                                    FROM colorings WHERE graph_id=?
+                                    GROUP BY algorithm, order_strategy""", (graph_id,)).fetchall()
+        for algorithm, strategy, runs, best, worst, mean, tmin, tmax in rows:
+            summary[(algorithm, strategy)] = {"runs": runs, "best_colors": best, "worst_colors": worst,
+                                              "mean_time": mean, "min_time": tmin, "max_time": tmax}
+        times = {}
+        for algorithm, strategy, t in self.conn.execute("""SELECT algorithm, order_strategy, time_sec
+                                                           FROM colorings WHERE graph_id=?
+                                                           ORDER BY algorithm, order_strategy, time_sec""",
+                                                        (graph_id,)):
+            times.setdefault((algorithm, strategy), []).append(t)
+        for key, values in times.items():
+            for p in percentiles:
+                rank = max(1, -(-p * len(values) // 100))
+                summary[key][f"p{p}_time"] = values[rank - 1]
+        return summary
+
+    def best_colorings(self, graph_id):
+        """Лучшее число цветов по каждому алгоритму: {algorithm: (colors_used, coloring_id)}."""
+        rows = self.conn.execute("""SELECT algorithm, MIN(colors_used), id FROM colorings
+                                    WHERE graph_id=? GROUP BY algorithm""", (graph_id,)).fetchall()
+        return {algorithm: (colors, coloring_id) for algorithm, colors, coloring_id in rows}
 
     def get_colorings(self, graph_id):
-        conn = sqlite3.connect(self.path)
-        c = conn.cursor()
-        c.execute("SELECT algorithm, order_strategy, colors_used, time_sec, coloring, created_at FROM colorings WHERE graph_id=?", (graph_id,))
-        data = c.fetchall()
-        conn.close()
-        return data
\ No newline at end of file
+        """
+        Все запуски графа: (algorithm, order_strategy, colors_used, time_sec,
+        coloring, created_at). coloring — уже декодированный dict вершина -> цвет,
+        а не JSON-текст, как до BLOB-хранения. Для длинной истории используйте
+        list_colorings.
+        """
+        rows = self.conn.execute("""SELECT algorithm, order_strategy, colors_used, time_sec,
+                                           coloring_blob, coloring, created_at
+                                    FROM colorings WHERE graph_id=?""", (graph_id,)).fetchall()
+        return [(a, s, k, t, self._decode_row_coloring(graph_id, blob, text), created)
+                for a, s, k, t, blob, text, created in rows]
+
+
+def _edge_owner(v, u):
+    # каждое ребро сохраняется один раз; метки разных типов сравниваются по строке
+    try:
+        return v < u
+    except TypeError:
+        return (type(v).__name__, str(v)) < (type(u).__name__, str(u))
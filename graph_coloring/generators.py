@@ -0,0 +1,100 @@
+"""Генераторы семейств графов для тестов и бенчмарков (все детерминированы по seed)."""
+import math, random
+from graph_coloring.graph_model import GraphModel
+
+
+def gnp(n, p, seed=0):
+    """Случайный граф Эрдёша–Реньи G(n, p); пропуск пар по геометрическому распределению, O(n + m)."""
+    rng = random.Random(seed)
+    g = GraphModel()
+    for v in range(n):
+        g.add_vertex(v)
+    if p <= 0:
+        return g
+    if p >= 1:
+        for v in range(n):
+            for u in range(v):
+                g.add_edge(u, v)
+        return g
+    log_q = math.log(1.0 - p)
+    v, w = 1, -1
+    while v < n:
+        w += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        while w >= v and v < n:
+            w -= v
+            v += 1
+        if v < n:
+            g.add_edge(v, w)
+    return g
+
+
+def random_geometric(n, radius, seed=0):
+    """Случайный геометрический граф в единичном квадрате; поиск соседей по сетке ячеек."""
+    rng = random.Random(seed)
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    g = GraphModel()
+    for v in range(n):
+        g.add_vertex(v)
+    cells = {}
+    size = max(radius, 1e-9)
+    for v, (x, y) in enumerate(points):
+        cells.setdefault((int(x / size), int(y / size)), []).append(v)
+    r2 = radius * radius
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for u in cells.get((cx + dx, cy + dy), ()):
+                    ux, uy = points[u]
+                    for v in members:
+                        if u < v:
+                            vx, vy = points[v]
+                            if (ux - vx) ** 2 + (uy - vy) ** 2 <= r2:
+                                g.add_edge(u, v)
+    return g
+
+
+def power_law(n, m_per_vertex=3, seed=0):
+    """Граф с предпочтительным присоединением (Барабаши–Альберт): степенное распределение степеней."""
+    rng = random.Random(seed)
+    g = GraphModel()
+    targets = list(range(min(m_per_vertex, n)))
+    for v in targets:
+        g.add_vertex(v)
+    repeated = []
+    for v in range(len(targets), n):
+        for u in set(targets):
+            g.add_edge(v, u)
+        repeated.extend(targets)
+        repeated.extend([v] * m_per_vertex)
+        chosen = set()
+        while len(chosen) < m_per_vertex:
+            chosen.add(rng.choice(repeated))
+        targets = list(chosen)
+    return g
+
+
+def mycielski(k):
+    """Граф Мыцельского M_k (инстансы myciel* из DIMACS): без треугольников, хроматическое число k."""
+    g = GraphModel.from_edgelist([(0, 1)])
+    for _ in range(k - 2):
+        n = g.n()
+        edges = [(u, v) for u in g.vertices() for v in g.neighbors(u) if u < v]
+        for u, v in edges:
+            g.add_edge(u + n, v)
+            g.add_edge(u, v + n)
+        for v in range(n):
+            g.add_edge(v + n, 2 * n)
+    return g
+
+
+def queen(n):
+    """Граф ферзей n×n (инстансы queen* из DIMACS)."""
+    g = GraphModel()
+    cells = [(r, c) for r in range(n) for c in range(n)]
+    for a, (r1, c1) in enumerate(cells):
+        g.add_vertex(a)
+        for b in range(a):
+            r2, c2 = cells[b]
+            if r1 == r2 or c1 == c2 or abs(r1 - r2) == abs(c1 - c2):
+                g.add_edge(a, b)
+    return g
@@ -0,0 +1,128 @@
+"""
+Бинарный кэш графа рядом с исходным файлом (<файл>.gcsr).
+
+Раскладка файла (все секции выровнены на 8 байт, порядок байт — родной):
+    заголовок HEADER
+    таблица меток id -> метка (int64-массив либо JSON-список)
+    offsets: int64[n + 1]
+    indices: int32/int64[2m]
+Кэш открывается через mmap: offsets и indices не копируются, а читаются
+прямо со страниц файла. Кэш считается устаревшим, если изменились
+размер или mtime исходного файла либо файл разбирался в другом формате.
+"""
+import json, mmap, os, struct
+from array import array
+from graph_coloring.graph_model import FrozenGraph
+
+
+CACHE_SUFFIX = ".gcsr"
+MAGIC = b"GCOLCSR\0"
+VERSION = 2
+HEADER = struct.Struct("=8sHHI8sqqqqqqqq")
+
+LABELS_INT = 1
+LABELS_JSON = 2
+
+
+def cache_path_for(source_path):
+    return source_path + CACHE_SUFFIX
+
+
+def _source_stamp(source_path):
+    st = os.stat(source_path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _align(pos):
+    return (pos + 7) & ~7
+
+
+def _encode_labels(labels):
+    if all(type(v) is int and -2 ** 63 <= v < 2 ** 63 for v in labels):
+        return LABELS_INT, array('q', labels).tobytes()
+    return LABELS_JSON, json.dumps(list(labels), ensure_ascii=False).encode('utf-8')
+
+
+def write_graph_cache(frozen: FrozenGraph, cache_path, source_path=None, fmt=None):
+    """
+    Записывает FrozenGraph в бинарный файл; запись атомарная (через временный файл).
+    fmt — формат, в котором разбирался исходный файл (хранится в заголовке).
+    """
+    mtime_ns, size = _source_stamp(source_path) if source_path else (0, 0)
+    kind, label_bytes = _encode_labels(frozen.labels)
+    offsets = array('q', frozen.offsets)
+    indices = frozen.indices if isinstance(frozen.indices, array) else array('q', frozen.indices)
+
+    labels_offset = _align(HEADER.size)
+    offsets_offset = _align(labels_offset + len(label_bytes))
+    indices_offset = offsets_offset + len(offsets) * offsets.itemsize
+    header = HEADER.pack(MAGIC, VERSION, kind, indices.itemsize, (fmt or '').encode('ascii'),
+                         frozen.n(), len(indices),
+                         mtime_ns, size, labels_offset, len(label_bytes), offsets_offset, indices_offset)
+
+    # своё временное имя у каждого процесса: параллельные загрузки не портят файл друг другу
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(b"\0" * (labels_offset - HEADER.size))
+        f.write(label_bytes)
+        f.write(b"\0" * (offsets_offset - labels_offset - len(label_bytes)))
+        offsets.tofile(f)
+        indices.tofile(f)
+    os.replace(tmp_path, cache_path)
+
+
+def open_graph_cache(cache_path, source_path=None, fmt=None):
+    """
+    Открывает кэш через mmap и возвращает FrozenGraph поверх его страниц.
+    Возвращает None, если файл повреждён, другой версии, устарел
+    относительно source_path или записан для другого формата fmt.
+    """
+    with open(cache_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            return None
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    (magic, version, kind, itemsize, cached_fmt, n, nnz, mtime_ns, size,
+     labels_offset, labels_nbytes, offsets_offset, indices_offset) = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    if source_path is not None and (mtime_ns, size) != _source_stamp(source_path):
+        return None
+    if fmt is not None and cached_fmt.rstrip(b"\0").decode('ascii') != fmt:
+        return None
+    if indices_offset + nnz * itemsize > len(buf):
+        return None
+
+    view = memoryview(buf)
+    if kind == LABELS_INT:
+        labels = view[labels_offset:labels_offset + labels_nbytes].cast('q')
+    else:
+        labels = json.loads(bytes(view[labels_offset:labels_offset + labels_nbytes]).decode('utf-8'))
+    offsets = view[offsets_offset:offsets_offset + (n + 1) * 8].cast('q')
+    indices = view[indices_offset:indices_offset + nnz * itemsize].cast('i' if itemsize == 4 else 'q')
+    g = FrozenGraph(labels, offsets, indices)
+    g._buffer = buf
+    return g
+
+
+def load_cached(source_path, build, fmt=None):
+    """
+    Возвращает FrozenGraph для source_path из кэша, при необходимости
+    перестраивая его: build() должна вернуть FrozenGraph по исходному файлу
+    в формате fmt; кэш другого формата перезаписывается.
+    Ошибки записи кэша (нет прав и т.п.) не мешают загрузке.
+    """
+    cache_path = cache_path_for(source_path)
+    if os.path.exists(cache_path):
+        try:
+            g = open_graph_cache(cache_path, source_path, fmt)
+        except (OSError, ValueError, struct.error):
+            g = None
+        if g is not None:
+            return g
+    frozen = build()
+    try:
+        write_graph_cache(frozen, cache_path, source_path, fmt)
+    except OSError:
+        pass
+    return frozen
@@ -1,4 +1,7 @@
-from typing import Dict, Set, List, Tuple
+import hashlib
+from array import array
+from collections import deque
+from typing import Dict, Set, List, Tuple, Optional
 
 class GraphModel:
     """Класс неориентированного графа на основе списка смежности."""
@@ -24,6 +27,16 @@ class GraphModel:
         self.adj[u].add(v)
         self.adj[v].add(u)
 
+    def remove_edge(self, u, v):
+        if u in self.adj:
+            self.adj[u].discard(v)
+        if v in self.adj:
+            self.adj[v].discard(u)
+
+    def remove_vertex(self, v):
+        for u in self.adj.pop(v, ()):
+            self.adj[u].discard(v)
+
     def vertices(self):
         return list(self.adj.keys())
 
@@ -40,11 +53,146 @@ class GraphModel:
         return sum(len(n) for n in self.adj.values()) // 2
 
     def subgraph(self, verts):
+        """Порождённый подграф; verts может быть любым итерируемым (проверка принадлежности — по множеству)."""
+        vs = verts if isinstance(verts, (set, frozenset)) else set(verts)
         sub = GraphModel()
+        adj = self.adj
         for v in verts:
-            sub.add_vertex(v)
-        for v in verts:
-            for u in self.neighbors(v):
-                if u in verts:
-                    sub.add_edge(v, u)
-        return sub
\ No newline at end of file
+            sub.adj[v] = adj[v] & vs if v in adj else set()
+        return sub
+
+    def connected_components(self) -> List[List[object]]:
+        """Компоненты связности (обход в ширину, O(n + m)) в порядке вершин графа."""
+        adj = self.adj
+        seen = set()
+        components = []
+        for s in adj:
+            if s in seen:
+                continue
+            seen.add(s)
+            comp = [s]
+            queue = deque([s])
+            while queue:
+                v = queue.popleft()
+                for u in adj[v]:
+                    if u not in seen:
+                        seen.add(u)
+                        comp.append(u)
+                        queue.append(u)
+            components.append(comp)
+        return components
+
+    def fingerprint(self) -> str:
+        """Отпечаток графа, не зависящий от порядка вершин и рёбер (см. graph_fingerprint)."""
+        return graph_fingerprint(self)
+
+    def freeze(self) -> "FrozenGraph":
+        """Возвращает компактную неизменяемую CSR-копию графа (см. FrozenGraph)."""
+        return FrozenGraph.from_adjacency(self.adj)
+
+
+class FrozenGraph:
+    """
+    Неизменяемый граф в формате CSR (compressed sparse row).
+
+    Метки вершин отображаются в сплошные целые id 0..n-1; соседи вершины i
+    лежат в indices[offsets[i]:offsets[i + 1]]. Интерфейс vertices/neighbors/
+    degree/n/m совпадает с GraphModel, поэтому алгоритмы раскраски принимают
+    FrozenGraph без изменений — вершинами в результате будут id.
+    Для возврата к исходным меткам служат label() и to_labels().
+    """
+    def __init__(self, labels: List[object], offsets: array, indices: array):
+        self.labels = labels
+        self.offsets = offsets
+        self.indices = indices
+        self._index_of: Optional[Dict[object, int]] = None
+        self._view = memoryview(indices)
+
+    @classmethod
+    def from_adjacency(cls, adj: Dict[object, Set[object]]) -> "FrozenGraph":
+        labels = list(adj.keys())
+        index_of = {v: i for i, v in enumerate(labels)}
+        offsets = array('q', [0]) * (len(labels) + 1)
+        total = 0
+        for i, v in enumerate(labels):
+            total += len(adj[v])
+            offsets[i + 1] = total
+        indices = array(_index_typecode(len(labels)))
+        get_index = index_of.__getitem__
+        for v in labels:
+            indices.extend(map(get_index, adj[v]))
+        g = cls(labels, offsets, indices)
+        g._index_of = index_of
+        return g
+
+    def index_of(self, label) -> int:
+        if self._index_of is None:
+            self._index_of = {v: i for i, v in enumerate(self.labels)}
+        return self._index_of[label]
+
+    def label(self, i: int):
+        return self.labels[i]
+
+    def to_labels(self, coloring: Dict[int, int]) -> Dict[object, int]:
+        """Переводит раскраску по id в раскраску по исходным меткам вершин."""
+        labels = self.labels
+        return {labels[i]: c for i, c in coloring.items()}
+
+    def fingerprint(self) -> str:
+        return graph_fingerprint(self.thaw())
+
+    def thaw(self) -> GraphModel:
+        """Восстанавливает изменяемый GraphModel с исходными метками."""
+        g = GraphModel()
+        labels, offsets, indices = self.labels, self.offsets, self.indices
+        for i, v in enumerate(labels):
+            g.adj[v] = {labels[j] for j in indices[offsets[i]:offsets[i + 1]]}
+        return g
+
+    def vertices(self):
+        return list(range(len(self.labels)))
+
+    def neighbors(self, v):
+        return self._view[self.offsets[v]:self.offsets[v + 1]]
+
+    def degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def n(self):
+        return len(self.labels)
+
+    def m(self):
+        return len(self.indices) // 2
+
+
+def _index_typecode(n: int) -> str:
+    return 'i' if n < 2 ** 31 else 'q'
+
+
+_FINGERPRINT_MOD = 1 << 128
+
+
+def _label_key(v) -> str:
+    return f"{type(v).__name__}:{v!r}"
+
+
+def _digest(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode('utf-8'), digest_size=16).digest(), 'little')
+
+
+def graph_fingerprint(graph: GraphModel) -> str:
+    """
+    Канонический отпечаток графа: сумма хэшей вершин и неупорядоченных рёбер по модулю 2^128.
+    Сложение коммутативно, поэтому результат не зависит ни от порядка загрузки,
+    ни от ориентации рёбер; изолированные вершины тоже учитываются.
+    """
+    keys = {v: _label_key(v) for v in graph.adj}
+    total = 0
+    for v, k in keys.items():
+        total += _digest("v|" + k)
+        for u in graph.adj[v]:
+            ku = keys[u]
+            if ku < k:
+                total += _digest("e|" + ku + "|" + k)
+    return f"{graph.n()}-{graph.m()}-{total % _FINGERPRINT_MOD:032x}"
+
@@ -0,0 +1,165 @@
+"""
+Отрисовка графа на tk.Canvas с уровнем детализации.
+
+Укладка (единичный квадрат) считается заранее, вид хранит только преобразование
+экран = мир * scale + offset. Рисуются лишь вершины, попавшие в окно
+(поиск по сетке), не больше max_vertices штук, и выборка рёбер; подписи —
+только при крупном масштабе. Перекраска меняет fill существующих элементов.
+Колесо мыши — масштаб вокруг курсора, перетаскивание — сдвиг.
+"""
+
+# пауза перед полной перерисовкой после масштабирования, мс
+REDRAW_DELAY_MS = 120
+
+
+class GraphView:
+    def __init__(self, canvas, color_to_hex, max_vertices=3000, max_edges=5000, label_limit=150):
+        self.canvas = canvas
+        self.color_to_hex = color_to_hex
+        self.max_vertices = max_vertices
+        self.max_edges = max_edges
+        self.label_limit = label_limit
+
+        self.positions = {}
+        self.edges = []
+        self.coloring = {}
+        self.grid = {}
+        self.grid_size = 1
+        self.scale = 1.0
+        self.offset = (0.0, 0.0)
+        self.vertex_items = {}
+        self._drag = None
+        self._pending = None
+
+        canvas.bind("<ButtonPress-1>", self._on_press)
+        canvas.bind("<B1-Motion>", self._on_drag)
+        canvas.bind("<ButtonRelease-1>", self._on_release)
+        canvas.bind("<MouseWheel>", self._on_wheel)
+        canvas.bind("<Button-4>", lambda e: self._zoom(e.x, e.y, 1.25))
+        canvas.bind("<Button-5>", lambda e: self._zoom(e.x, e.y, 0.8))
+        canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+
+    def set_graph(self, positions, edges):
+        """positions: вершина -> (x, y) в [0, 1]^2; edges — рёбра для отрисовки (уже выборка)."""
+        self.positions = positions
+        self.edges = edges
+        self.coloring = {}
+        # сетка для отсечения по окну: около 4 вершин на ячейку
+        self.grid_size = max(1, int((len(positions) / 4) ** 0.5))
+        size = self.grid_size
+        grid = {}
+        for v, (x, y) in positions.items():
+            grid.setdefault((min(int(x * size), size - 1), min(int(y * size), size - 1)), []).append(v)
+        self.grid = grid
+        self.fit()
+
+    def fit(self):
+        """Масштаб, при котором весь граф помещается в окно."""
+        w, h = self._canvas_size()
+        margin = 25
+        self.scale = max(1.0, min(w, h) - 2 * margin)
+        self.offset = ((w - self.scale) / 2, (h - self.scale) / 2)
+        self.redraw()
+
+    def recolor(self, coloring):
+        """Перекрашивает уже нарисованные вершины без перерисовки."""
+        self.coloring = coloring
+        itemconfig = self.canvas.itemconfig
+        for v, item in self.vertex_items.items():
+            itemconfig(item, fill=self.color_to_hex(coloring.get(v, 0)))
+
+    def visible_vertices(self):
+        """Вершины внутри окна (с запасом в одну ячейку), прореженные до max_vertices."""
+        w, h = self._canvas_size()
+        x0, y0 = self._to_world(0, 0)
+        x1, y1 = self._to_world(w, h)
+        size = self.grid_size
+        cx0, cx1 = max(0, int(x0 * size) - 1), min(size - 1, int(x1 * size) + 1)
+        cy0, cy1 = max(0, int(y0 * size) - 1), min(size - 1, int(y1 * size) + 1)
+        grid = self.grid
+        visible = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                visible.extend(grid.get((cx, cy), ()))
+        if len(visible) > self.max_vertices:
+            # детерминированное прореживание: каждая k-я вершина
+            visible = visible[::-(-len(visible) // self.max_vertices)]
+        return visible
+
+    def redraw(self):
+        self._pending = None
+        canvas = self.canvas
+        canvas.delete("all")
+        self.vertex_items = {}
+        if not self.positions:
+            return
+        visible = self.visible_vertices()
+        shown = set(visible)
+        scale, (ox, oy) = self.scale, self.offset
+        pos = self.positions
+
+        drawn = 0
+        edge_color = "#888" if len(self.edges) <= 2000 else "#ccc"
+        for u, v in self.edges:
+            if u in shown or v in shown:
+                (x1, y1), (x2, y2) = pos[u], pos[v]
+                canvas.create_line(x1 * scale + ox, y1 * scale + oy, x2 * scale + ox, y2 * scale + oy,
+                                   fill=edge_color, width=1)
+                drawn += 1
+                if drawn >= self.max_edges:
+                    break
+
+        # радиус растёт с масштабом: ~ треть идеального расстояния между вершинами
+        r = min(15.0, max(2.0, 0.3 * scale / max(1.0, len(pos)) ** 0.5))
+        labels = len(visible) <= self.label_limit and r >= 8
+        coloring = self.coloring
+        for v in visible:
+            x, y = pos[v]
+            x, y = x * scale + ox, y * scale + oy
+            self.vertex_items[v] = canvas.create_oval(x - r, y - r, x + r, y + r,
+                                                      fill=self.color_to_hex(coloring.get(v, 0)),
+                                                      outline="black", width=1)
+            if labels:
+                canvas.create_text(x, y, text=str(v), font=("Arial", 9, "bold"))
+
+    def schedule_redraw(self):
+        if self._pending is not None:
+            self.canvas.after_cancel(self._pending)
+        self._pending = self.canvas.after(REDRAW_DELAY_MS, self.redraw)
+
+    def _canvas_size(self):
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if w <= 1 or h <= 1:
+            w, h = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        return w, h
+
+    def _to_world(self, sx, sy):
+        ox, oy = self.offset
+        return (sx - ox) / self.scale, (sy - oy) / self.scale
+
+    def _zoom(self, x, y, factor):
+        # уже нарисованное масштабируется самим canvas, точная перерисовка — после паузы
+        self.canvas.scale("all", x, y, factor, factor)
+        ox, oy = self.offset
+        self.offset = (x - (x - ox) * factor, y - (y - oy) * factor)
+        self.scale *= factor
+        self.schedule_redraw()
+
+    def _on_wheel(self, event):
+        self._zoom(event.x, event.y, 1.25 if event.delta > 0 else 0.8)
+
+    def _on_press(self, event):
+        self._drag = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag is None:
+            return
+        dx, dy = event.x - self._drag[0], event.y - self._drag[1]
+        self._drag = (event.x, event.y)
+        self.canvas.move("all", dx, dy)
+        ox, oy = self.offset
+        self.offset = (ox + dx, oy + dy)
+
+    def _on_release(self, event):
+        self._drag = None
+        self.schedule_redraw()
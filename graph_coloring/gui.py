@@ -1,12 +1,24 @@
 # gui_app.py
 import tkinter as tk
-from tkinter import filedialog, messagebox
-import math, time
-import os
+from tkinter import filedialog, messagebox, ttk
+from collections import OrderedDict
+import os, queue, threading
 
 from graph_coloring.io_module import load_edgelist, export_coloring, save_report_txt
 from graph_coloring.algorithms.dsatur import DSATURAlgorithm
 from graph_coloring.algorithms.greedy import GreedyAlgorithm
+from graph_coloring.algorithms.base import ColoringCancelled
+from graph_coloring.graph_view import GraphView
+from graph_coloring.layout import force_layout, sample_edges
+
+# период опроса очереди фоновой задачи, мс (~60 кадров в секунду)
+POLL_MS = 16
+# укладки кэшируются по отпечатку графа
+LAYOUT_CACHE_SIZE = 8
+LAYOUT_TIME_BUDGET = 5.0
+# выше этого числа вершин силовая укладка не считается (остаётся случайная)
+LAYOUT_MAX_VERTICES = 200000
+EDGE_SAMPLE = 20000
 
 class GUIApp:
     """GUI для визуализации раскраски графа (DSATUR и Greedy)."""
@@ -18,13 +30,24 @@ class GUIApp:
         self.graph = None
         self.coloring = {}
         self.last_result = None
+        self.graph_id = None
+        self.fingerprint = None
+
+        # фоновая задача: события из рабочего потока приходят в очередь и
+        # разбираются в главном потоке через root.after
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.task = None
+        self.busy_buttons = []
+        self.layouts = OrderedDict()
 
         # Панель управления
         frame = tk.Frame(root)
         frame.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
 
         # Загрузка графа
-        tk.Button(frame, text="Загрузить граф (.txt)", command=self.load_graph).pack(fill=tk.X, pady=2)
+        load_button = tk.Button(frame, text="Загрузить граф (.txt)", command=self.load_graph)
+        load_button.pack(fill=tk.X, pady=2)
 
         # Выбор алгоритма
         self.algo = tk.StringVar(value="DSATUR")
@@ -35,12 +58,22 @@ class GUIApp:
         # Стратегия обхода вершин
         tk.Label(frame, text="Порядок обхода вершин:").pack(anchor="w", pady=(8, 0))
         self.order_strategy = tk.StringVar(value="degree_desc")
-        strategies = ["degree_desc", "random", "as_loaded"]
+        strategies = ["degree_desc", "random", "as_loaded", "smallest_last"]
         for s in strategies:
             tk.Radiobutton(frame, text=s, variable=self.order_strategy, value=s).pack(anchor="w")
 
         # Кнопка запуска
-        tk.Button(frame, text="Запустить алгоритм", command=self.run_algo).pack(fill=tk.X, pady=5)
+        run_button = tk.Button(frame, text="Запустить алгоритм", command=self.run_algo)
+        run_button.pack(fill=tk.X, pady=5)
+        self.busy_buttons = [load_button, run_button]
+
+        # Прогресс и отмена
+        self.progress = ttk.Progressbar(frame, mode="determinate", maximum=100)
+        self.progress.pack(fill=tk.X, pady=2)
+        self.status_label = tk.Label(frame, text="")
+        self.status_label.pack(anchor="w")
+        self.cancel_button = tk.Button(frame, text="Отмена", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_button.pack(fill=tk.X, pady=2)
 
         # Экспорт кнопки
         tk.Button(frame, text="Сохранить раскраску (CSV)", command=self.save_coloring_dialog).pack(fill=tk.X, pady=2)
@@ -53,26 +86,112 @@ class GUIApp:
         # Канвас для отрисовки
         self.canvas = tk.Canvas(root, width=700, height=600, bg="white")
         self.canvas.pack(side=tk.RIGHT, expand=True, fill=tk.BOTH)
+        self.view = GraphView(self.canvas, self._color_to_hex)
+
+    # Фоновые задачи
+    def _start_task(self, title, work, on_done):
+        """
+        Выполняет work() в рабочем потоке. Результат передаётся в on_done(result)
+        уже в главном потоке; до тех пор кнопки запуска заблокированы.
+        """
+        self.cancel_event = threading.Event()
+        self.task = (title, on_done)
+        for b in self.busy_buttons:
+            b.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress.config(mode="indeterminate")
+        self.progress.start(POLL_MS)
+        self.status_label.config(text=title)
+
+        def target():
+            try:
+                result = work()
+            except ColoringCancelled:
+                self.events.put(("cancelled", None))
+            except Exception as e:
+                self.events.put(("error", e))
+            else:
+                self.events.put(("done", result))
+
+        threading.Thread(target=target, daemon=True).start()
+        self.root.after(POLL_MS, self._poll_task)
+
+    def _report_progress(self, done, total):
+        """Обработчик on_progress алгоритма; вызывается в рабочем потоке."""
+        if self.cancel_event.is_set():
+            raise ColoringCancelled()
+        self.events.put(("progress", (done, total)))
+
+    def _poll_task(self):
+        latest = None
+        while True:
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest = payload
+                continue
+            self._finish_task(kind, payload)
+            return
+        if latest is not None:
+            done, total = latest
+            if str(self.progress.cget("mode")) != "determinate":
+                self.progress.stop()
+                self.progress.config(mode="determinate")
+            self.progress.config(value=100 * done / total if total else 100)
+            self.status_label.config(text=f"{self.task[0]} {done}/{total}")
+        self.root.after(POLL_MS, self._poll_task)
+
+    def _finish_task(self, kind, payload):
+        title, on_done = self.task
+        self.task = None
+        self.progress.stop()
+        self.progress.config(mode="determinate", value=0)
+        self.status_label.config(text="")
+        self.cancel_button.config(state=tk.DISABLED)
+        for b in self.busy_buttons:
+            b.config(state=tk.NORMAL)
+        if kind == "done" and not self.cancel_event.is_set():
+            on_done(payload)
+        elif kind == "error":
+            messagebox.showerror("Ошибка", f"{title}:\n{payload}")
+        else:
+            self.status_label.config(text="Отменено")
+
+    def cancel_task(self):
+        """Кооперативная отмена: алгоритм остановится на ближайшем вызове on_progress."""
+        if self.task is not None:
+            self.cancel_event.set()
+            self.status_label.config(text="Отмена...")
 
     # Загрузка графа
     def load_graph(self):
         path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
         if not path:
             return
-        try:
-            self.graph = load_edgelist(path)
-            if not self.graph or len(self.graph.adj) == 0:
-                raise Exception("Файл пуст.");
-            edges = []
-            for v in self.graph.adj:
-                for u in self.graph.adj[v]:
-                    if str(u) < str(v):
-                        edges.append((v, u))
-            self.db.add_graph(os.path.basename(path), self.graph.n(), self.graph.m(), edges)
-            self._draw_graph(colorful=False)
+
+        def work():
+            # отмена проверяется между шагами и внутри укладки
+            cancel = self.cancel_event
+            graph = load_edgelist(path)
+            if not graph or len(graph.adj) == 0:
+                raise Exception("Файл пуст.")
+            if cancel.is_set():
+                raise ColoringCancelled()
+            fingerprint = graph.fingerprint()
+            graph_id = self.db.add_graph_model(os.path.basename(path), graph, fingerprint=fingerprint)
+            if cancel.is_set():
+                raise ColoringCancelled()
+            return graph, fingerprint, graph_id, self._layout(graph, fingerprint, cancel)
+
+        def done(result):
+            self.graph, self.fingerprint, self.graph_id, layout = result
+            self.coloring = {}
+            self.view.set_graph(*layout)
             messagebox.showinfo("Загружено", f"Граф успешно загружен из файла:\n{os.path.basename(path)}")
-        except Exception as e:
-            messagebox.showerror("Ошибка загрузки", f"Не удалось загрузить граф:\n{e}")
+
+        self._start_task("Загрузка графа", work, done)
 
     # Запуск алгоритма
     def run_algo(self):
@@ -82,41 +201,50 @@ class GUIApp:
 
         algo_name = self.algo.get()
         order_strategy = self.order_strategy.get()
+        graph, fingerprint, graph_id = self.graph, self.fingerprint, self.graph_id
 
-        start = time.time()
-        if algo_name == "DSATUR":
-            res = DSATURAlgorithm().run(self.graph)
-        else:
-            res = GreedyAlgorithm(order_strategy=order_strategy).run(self.graph)
-
-        elapsed = time.time() - start
-
-        graph_id = self.db.get_graphs()[-1][0]  # последний добавленный граф
-        self.db.add_coloring(
-            graph_id=graph_id,
-            algorithm=algo_name,
-            order_strategy=order_strategy,
-            colors_used=res["colors_used"],
-            time_sec=res["time"],
-            coloring=self.coloring
-        )
-
-        self.coloring = res["coloring"]
-        self.last_result = {
-            "algorithm": algo_name,
-            "order_strategy": order_strategy,
-            "n": self.graph.n(),
-            "m": self.graph.m(),
-            "colors_used": res["colors_used"],
-            "time": res["time"],
-            "coloring": self.coloring
-        }
-
-        self._draw_graph(colorful=True)
-        self.stats_label.config(
-            text=f"n={self.graph.n()}, m={self.graph.m()}\n"
-                 f"colors={res['colors_used']}\ntime={res['time']:.4f}s"
-        )
+        # DSATUR в GUI всегда запускается с tie_break='degree_desc'
+        strategy = order_strategy if algo_name == "Greedy" else "degree_desc"
+
+        def work():
+            res = self.db.get_cached_coloring(fingerprint, algo_name, strategy)
+            if res is None:
+                if algo_name == "DSATUR":
+                    algo = DSATURAlgorithm()
+                else:
+                    algo = GreedyAlgorithm(order_strategy=order_strategy)
+                algo.on_progress = self._report_progress
+                res = algo.run(graph)
+
+                self.db.add_coloring(
+                    graph_id=graph_id,
+                    algorithm=algo_name,
+                    order_strategy=strategy,
+                    colors_used=res["colors_used"],
+                    time_sec=res["time"],
+                    coloring=res["coloring"]
+                )
+            return res
+
+        def done(res):
+            self.coloring = res["coloring"]
+            self.last_result = {
+                "algorithm": algo_name,
+                "order_strategy": order_strategy,
+                "n": graph.n(),
+                "m": graph.m(),
+                "colors_used": res["colors_used"],
+                "time": res["time"],
+                "coloring": self.coloring
+            }
+
+            self.view.recolor(self.coloring)
+            self.stats_label.config(
+                text=f"n={graph.n()}, m={graph.m()}\n"
+                     f"colors={res['colors_used']}\ntime={res['time']:.4f}s"
+            )
+
+        self._start_task(f"{algo_name}:", work, done)
 
     # Сохранение раскраски
     def save_coloring_dialog(self):
@@ -157,36 +285,26 @@ class GUIApp:
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить отчёт:\n{e}")
 
-    # Визуализация графа
-    def _draw_graph(self, colorful: bool):
-        self.canvas.delete("all")
-        if not self.graph:
-            return
-        vertices = self.graph.vertices()
-        n = len(vertices)
-        if n == 0:
-            return
-
-        positions = {}
-        cx, cy, r = 350, 300, min(250, 250 + 200 / max(n, 5))
-        for i, v in enumerate(vertices):
-            angle = 2 * math.pi * i / n
-            x = cx + r * math.cos(angle)
-            y = cy + r * math.sin(angle)
-            positions[v] = (x, y)
-
-        for v in vertices:
-            for u in self.graph.neighbors(v):
-                if str(u) < str(v):
-                    x1, y1 = positions[v]
-                    x2, y2 = positions[u]
-                    self.canvas.create_line(x1, y1, x2, y2, fill="#888", width=2)
-
-        for v in vertices:
-            x, y = positions[v]
-            color = self._color_to_hex(self.coloring.get(v, 0)) if colorful else "#FFFFFF"
-            self.canvas.create_oval(x - 15, y - 15, x + 15, y + 15, fill=color, outline="black", width=1.5)
-            self.canvas.create_text(x, y, text=str(v), font=("Arial", 10, "bold"))
+    # Укладка графа (вызывается в рабочем потоке)
+    def _layout(self, graph, fingerprint, cancel):
+        """
+        (позиции, выборка рёбер) из кэша или заново; при повторной загрузке не
+        пересчитывается. Прерванная через cancel укладка не кэшируется.
+        """
+        layout = self.layouts.get(fingerprint)
+        if layout is None:
+            iterations = 50 if graph.n() <= LAYOUT_MAX_VERTICES else 0
+            positions = force_layout(graph, iterations=iterations, time_budget=LAYOUT_TIME_BUDGET,
+                                     should_stop=cancel.is_set)
+            if cancel.is_set():
+                raise ColoringCancelled()
+            layout = (positions, sample_edges(graph, EDGE_SAMPLE))
+            self.layouts[fingerprint] = layout
+            while len(self.layouts) > LAYOUT_CACHE_SIZE:
+                self.layouts.popitem(last=False)
+        else:
+            self.layouts.move_to_end(fingerprint)
+        return layout
 
     def _color_to_hex(self, c: int) -> str:
         if c <= 0:
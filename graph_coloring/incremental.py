@@ -0,0 +1,241 @@
+"""
+Инкрементальная раскраска динамического графа.
+
+IncrementalColorer хранит граф и корректную раскраску и поддерживает её при
+add_edge / remove_edge / add_vertex / remove_vertex, исправляя только
+затронутые вершины: сначала ищется свободный цвет среди уже используемых,
+затем — обмен цепью Кемпе, и лишь в крайнем случае добавляется новый цвет.
+Стоимость обновления зависит от степени вершины (и длины цепи Кемпе,
+ограниченной max_chain), а не от размера графа.
+"""
+import time
+from collections import Counter, deque
+from graph_coloring.graph_model import GraphModel
+from graph_coloring.algorithms.dsatur import DSATURAlgorithm
+
+
+class IncrementalColorer:
+    def __init__(self, graph=None, coloring=None, algorithm=None, compact_every=None, max_chain=1000):
+        """
+        graph — исходный GraphModel (изменяется на месте); coloring — готовая
+        корректная раскраска, иначе она строится algorithm (по умолчанию DSATUR).
+        compact_every — через сколько обновлений автоматически вызывать compact().
+        """
+        self.graph = graph if graph is not None else GraphModel()
+        if coloring is None:
+            coloring = (algorithm or DSATURAlgorithm()).run(self.graph)["coloring"] if self.graph.n() else {}
+        self.color = dict(coloring)
+        self.class_size = Counter(self.color.values())
+        self.compact_every = compact_every
+        self.max_chain = max_chain
+        self.updates = 0
+        self.stats = {"recolored": 0, "kempe_swaps": 0, "new_colors": 0, "compactions": 0}
+
+    # --- состояние ---------------------------------------------------------
+
+    @property
+    def colors_used(self):
+        return max(self.class_size) if self.class_size else 0
+
+    def coloring(self):
+        return dict(self.color)
+
+    def result(self):
+        """Текущая раскраска в формате run()."""
+        return {"coloring": dict(self.color), "colors_used": self.colors_used, "time": 0.0,
+                "stats": dict(self.stats)}
+
+    def _set(self, v, c):
+        old = self.color.get(v)
+        if old is not None:
+            self._drop_class(old)
+        self.color[v] = c
+        self.class_size[c] += 1
+
+    def _unset(self, v):
+        old = self.color.pop(v, None)
+        if old is not None:
+            self._drop_class(old)
+        return old
+
+    def _drop_class(self, c):
+        self.class_size[c] -= 1
+        if not self.class_size[c]:
+            del self.class_size[c]
+
+    # --- обновления --------------------------------------------------------
+
+    def add_vertex(self, v, neighbors=()):
+        if v in self.graph.adj:
+            for u in neighbors:
+                self.add_edge(v, u)
+            return
+        self.graph.add_vertex(v)
+        for u in neighbors:
+            self.graph.add_edge(v, u)
+            if u not in self.color:
+                self._repair(u)
+        self._repair(v)
+        self._after_update()
+
+    def add_edge(self, u, v):
+        if u == v:
+            return
+        self.graph.add_edge(u, v)
+        for w in (u, v):
+            if w not in self.color:
+                self._repair(w)
+        if self.color[u] == self.color[v]:
+            # перекрашиваем конец с меньшей степенью — меньше соседей для проверки
+            self._repair(u if self.graph.degree(u) <= self.graph.degree(v) else v)
+        self._after_update()
+
+    def remove_edge(self, u, v):
+        self.graph.remove_edge(u, v)
+        for w in (u, v):
+            if w in self.color:
+                self._lower(w)
+        self._after_update()
+
+    def remove_vertex(self, v):
+        neighbors = list(self.graph.neighbors(v))
+        self.graph.remove_vertex(v)
+        self._unset(v)
+        for u in neighbors:
+            self._lower(u)
+        self._after_update()
+
+    def apply_batch(self, updates):
+        """
+        Применяет пачку изменений одним проходом восстановления.
+        updates — кортежи ('add_edge', u, v), ('remove_edge', u, v),
+        ('add_vertex', v) или ('remove_vertex', v).
+        """
+        start = time.perf_counter()
+        dirty = []
+        for op, *args in updates:
+            if op == 'add_edge':
+                u, v = args
+                if u != v:
+                    self.graph.add_edge(u, v)
+                    dirty.extend((u, v))
+            elif op == 'remove_edge':
+                self.graph.remove_edge(*args)
+            elif op == 'add_vertex':
+                self.graph.add_vertex(args[0])
+                dirty.append(args[0])
+            elif op == 'remove_vertex':
+                self.graph.remove_vertex(args[0])
+                self._unset(args[0])
+            else:
+                raise ValueError(f"Неизвестная операция: {op}")
+        for v in dict.fromkeys(dirty):
+            if v in self.graph.adj and (v not in self.color or self._conflicts(v)):
+                self._repair(v)
+        self.updates += len(updates) - 1
+        self._after_update()
+        return time.perf_counter() - start
+
+    def _after_update(self):
+        self.updates += 1
+        if self.compact_every and self.updates % self.compact_every == 0:
+            self.compact()
+
+    # --- восстановление ----------------------------------------------------
+
+    def _conflicts(self, v):
+        c = self.color.get(v)
+        return any(self.color.get(u) == c for u in self.graph.neighbors(v))
+
+    def _neighbor_colors(self, v):
+        color = self.color
+        return {color[u] for u in self.graph.neighbors(v) if u in color}
+
+    def _repair(self, v, limit=None):
+        """
+        Даёт вершине v цвет, не совпадающий с соседями, не больше limit
+        (по умолчанию — текущее число цветов). Возвращает False, если пришлось
+        превысить limit (при limit=None в этом случае заводится новый цвет).
+        """
+        old = self._unset(v)
+        k = limit if limit is not None else self.colors_used
+        used = self._neighbor_colors(v)
+        c = next((c for c in range(1, k + 1) if c not in used), None)
+        if c is None:
+            c = self._kempe_free(v, k)
+        if c is None:
+            if limit is not None:
+                if old is not None:
+                    self._set(v, old)
+                return False
+            c = k + 1
+            self.stats["new_colors"] += 1
+        self._set(v, c)
+        if c != old:
+            self.stats["recolored"] += 1
+        return True
+
+    def _lower(self, v):
+        """После удаления рёбер вершина может перейти на меньший свободный цвет."""
+        c = self.color[v]
+        used = self._neighbor_colors(v)
+        for lower in range(1, c):
+            if lower not in used:
+                self._set(v, lower)
+                self.stats["recolored"] += 1
+                return
+
+    def _kempe_free(self, v, k):
+        """
+        Освобождает для неокрашенной v один из цветов 1..k обменом цепи Кемпе (c, d).
+        Цепи начинаются у соседей v цвета c; обмен допустим, если в них не попал
+        сосед v цвета d. Возвращает освобождённый цвет или None.
+        """
+        color = self.color
+        by_color = {}
+        for u in self.graph.neighbors(v):
+            if u in color:
+                by_color.setdefault(color[u], []).append(u)
+        candidates = sorted((c for c in by_color if c <= k), key=lambda c: len(by_color[c]))
+        for c in candidates:
+            for d in candidates:
+                if d == c:
+                    continue
+                chain = self._kempe_chain(by_color[c], c, d)
+                if chain is None or any(u in chain for u in by_color[d]):
+                    continue
+                for w in chain:
+                    self._set(w, d if color[w] == c else c)
+                self.stats["kempe_swaps"] += 1
+                return c
+        return None
+
+    def _kempe_chain(self, starts, c, d):
+        color = self.color
+        chain = set(starts)
+        queue = deque(starts)
+        while queue:
+            w = queue.popleft()
+            for u in self.graph.neighbors(w):
+                if u not in chain and color.get(u) in (c, d):
+                    chain.add(u)
+                    if len(chain) > self.max_chain:
+                        return None
+                    queue.append(u)
+        return chain
+
+    def compact(self):
+        """
+        Пытается избавиться от старшего цвета: каждую его вершину перекрашивает
+        в меньшие цвета (свободный цвет или цепь Кемпе). Повторяется, пока
+        старший класс удаётся опустошить. Возвращает число освобождённых цветов.
+        """
+        self.stats["compactions"] += 1
+        freed = 0
+        while self.colors_used > 1:
+            top = self.colors_used
+            members = [v for v, c in self.color.items() if c == top]
+            if not all(self._repair(v, limit=top - 1) for v in members):
+                break
+            freed += 1
+        return freed
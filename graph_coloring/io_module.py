@@ -1,19 +1,205 @@
-import csv
+import csv, os, re
 from graph_coloring.graph_model import GraphModel
+from graph_coloring.graph_cache import load_cached
 
-def load_edgelist(path):
-    edges = []
-    with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
-            parts = line.strip().split()
+CHUNK_SIZE = 1 << 22
+
+# каждая строка — ровно два целых числа (иначе блок разбирается построчно)
+_INT_PAIRS_RE = re.compile(rb'(?:[+-]?\d+[ \t]+[+-]?\d+\r?\n)*')
+_DIMACS_EDGE_RE = re.compile(rb'^e[ \t]+(\S+)[ \t]+(\S+)', re.M)
+_DIMACS_PROBLEM_RE = re.compile(rb'^p[ \t]+\S+[ \t]+(\d+)[ \t]+\d+', re.M)
+_DIMACS_COMMENT_RE = re.compile(rb'^c(?:\s|$)')
+
+DIMACS_EXTENSIONS = ('.col', '.dimacs')
+METIS_EXTENSIONS = ('.graph', '.metis')
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE, on_read=None):
+    """
+    Читает файл крупными блоками, каждый блок заканчивается на границе строки.
+    on_read(nbytes) — необязательный счётчик: вызывается после каждого чтения с диска.
+    """
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            if on_read is not None:
+                on_read(len(block))
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                tail = block
+                continue
+            tail = block[cut:]
+            yield block[:cut]
+        if tail:
+            yield tail + b'\n'
+
+
+def _parse_label(token):
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+
+def iter_edgelist_chunks(path, chunk_size=CHUNK_SIZE, on_read=None):
+    """
+    Генератор рёбер списка смежности по блокам: каждый элемент — плоский список
+    [u0, v0, u1, v1, ...]. Для блоков, где все строки — пары целых чисел,
+    разбор выполняется целиком на уровне C (быстрый путь). on_read — как в iter_chunks.
+    """
+    for chunk in iter_chunks(path, chunk_size, on_read):
+        if _INT_PAIRS_RE.fullmatch(chunk):
+            yield list(map(int, chunk.split()))
+            continue
+        flat = []
+        # границы строк — как у текстового open() (\n, \r\n, \r); splitlines() делил бы ещё
+        # и по \x0b, \x0c, \x1c-\x1e, \x85, \u2028, которые здесь — пробельные символы
+        text = chunk.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        for line in text.split('\n'):
+            parts = line.split()
             if len(parts) >= 2:
                 u, v = parts[:2]
                 try:
                     u, v = int(u), int(v)
-                except:
+                except ValueError:
                     pass
-                edges.append((u, v))
-    return GraphModel.from_edgelist(edges)
+                flat.append(u)
+                flat.append(v)
+        yield flat
+
+
+def iter_dimacs_chunks(path, chunk_size=CHUNK_SIZE, on_read=None):
+    """Рёбра из DIMACS .col (строки 'e u v') в том же плоском виде, что и iter_edgelist_chunks."""
+    for chunk in iter_chunks(path, chunk_size, on_read):
+        pairs = _DIMACS_EDGE_RE.findall(chunk)
+        yield [_parse_label(t.decode('utf-8')) for pair in pairs for t in pair]
+
+
+def add_edges_flat(g: GraphModel, flat):
+    """Добавляет в граф рёбра из плоского списка [u0, v0, u1, v1, ...] (как add_edge, но без вызовов методов)."""
+    adj = g.adj
+    it = iter(flat)
+    for u, v in zip(it, it):
+        if u == v:
+            continue
+        nu = adj.get(u)
+        if nu is None:
+            nu = adj[u] = set()
+        nv = adj.get(v)
+        if nv is None:
+            nv = adj[v] = set()
+        nu.add(v)
+        nv.add(u)
+
+
+def detect_format(path):
+    """Определяет формат файла графа: 'dimacs', 'metis' или 'edgelist'."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in DIMACS_EXTENSIONS:
+        return 'dimacs'
+    if ext in METIS_EXTENSIONS:
+        return 'metis'
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line or _DIMACS_COMMENT_RE.match(line):
+                continue
+            if _DIMACS_PROBLEM_RE.match(line):
+                return 'dimacs'
+            break
+    return 'edgelist'
+
+
+def load_edgelist(path, fmt=None, frozen=False, use_cache=True):
+    """
+    Загружает граф из файла. Формат (fmt) — 'edgelist', 'dimacs' или 'metis';
+    по умолчанию определяется по расширению и заголовку файла.
+    Граф строится по блокам, без промежуточного списка всех рёбер.
+
+    При frozen=True возвращается FrozenGraph. В этом режиме (если use_cache=True)
+    рядом с файлом создаётся бинарный кэш (graph_cache), и повторные загрузки
+    открывают его через mmap вместо разбора текста. Для GraphModel кэш не
+    используется: восстановление множеств смежности стоит столько же, сколько разбор.
+    """
+    if frozen and use_cache:
+        # формат входит в ключ кэша: тот же файл, разобранный иначе, — другой граф
+        fmt = fmt or detect_format(path)
+        return load_cached(path, lambda: _parse_graph(path, fmt).freeze(), fmt)
+    g = _parse_graph(path, fmt)
+    return g.freeze() if frozen else g
+
+
+def _parse_graph(path, fmt=None):
+    fmt = fmt or detect_format(path)
+    if fmt == 'dimacs':
+        return load_dimacs(path)
+    if fmt == 'metis':
+        return load_metis(path)
+    g = GraphModel()
+    for flat in iter_edgelist_chunks(path):
+        add_edges_flat(g, flat)
+    return g
+
+
+def load_dimacs(path):
+    """Загружает граф в формате DIMACS .col ('p edge n m' / 'e u v'); вершины 1..n добавляются все."""
+    g = GraphModel()
+    with open(path, 'rb') as f:
+        for line in f:
+            match = _DIMACS_PROBLEM_RE.match(line)
+            if match:
+                for v in range(1, int(match.group(1)) + 1):
+                    g.add_vertex(v)
+                break
+            if line.startswith(b'e'):
+                break
+    for flat in iter_dimacs_chunks(path):
+        add_edges_flat(g, flat)
+    return g
+
+
+def load_metis(path):
+    """
+    Загружает граф в формате METIS: заголовок 'n m [fmt [ncon]]', затем n строк —
+    соседи вершины i (нумерация с 1). Строки '%' — комментарии.
+    Веса вершин/рёбер, если указаны в fmt, пропускаются.
+    """
+    g = GraphModel()
+    adj = g.adj
+    header = None
+    v = 0
+    has_size = has_vwgt = has_ewgt = False
+    ncon = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('%'):
+                continue
+            if header is None:
+                if not line.strip():
+                    continue
+                header = line.split()
+                n = int(header[0])
+                code = header[2].zfill(3) if len(header) > 2 else '000'
+                has_size, has_vwgt, has_ewgt = code[0] == '1', code[1] == '1', code[2] == '1'
+                ncon = int(header[3]) if len(header) > 3 else (1 if has_vwgt else 0)
+                for i in range(1, n + 1):
+                    adj[i] = set()
+                continue
+            v += 1
+            if v > n:
+                break
+            values = line.split()[int(has_size) + ncon:]
+            neigh = values[::2] if has_ewgt else values
+            nv = adj[v]
+            for u in map(int, neigh):
+                if u != v:
+                    nv.add(u)
+                    adj[u].add(v)
+    return g
 
 def export_coloring(path, coloring):
     with open(path, 'w', newline='', encoding='utf-8') as f:
@@ -0,0 +1,146 @@
+"""
+Укладка графа для отрисовки: силовой алгоритм Фрюхтермана–Рейнгольда
+с отталкиванием только в пределах соседних ячеек сетки, O(n + m) на итерацию.
+Координаты нормированы в единичный квадрат.
+"""
+import math, random, time
+
+# срок проверяется раз в столько вершин или рёбер внутри итерации
+CHECK_EVERY = 4096
+
+
+class _Expired(Exception):
+    """Бюджет времени исчерпан посреди итерации."""
+
+
+def force_layout(graph, iterations=50, seed=0, time_budget=None, should_stop=None):
+    """
+    Возвращает dict вершина -> (x, y) в [0, 1]^2. Старт — случайный (seed),
+    затем iterations шагов с линейным охлаждением; time_budget (сек)
+    ограничивает общее время — для больших графов итераций будет меньше.
+    Срок проверяется и внутри итерации; прерванная итерация не применяется.
+    should_stop() проверяется там же и останавливает укладку так же, как срок.
+    """
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    vertices = graph.vertices()
+    n = len(vertices)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {vertices[0]: (0.5, 0.5)}
+    index = {v: i for i, v in enumerate(vertices)}
+    edges = [(i, index[u]) for i, v in enumerate(vertices) for u in graph.neighbors(v) if index[u] > i]
+
+    rng = random.Random(seed)
+    xs = [rng.random() for _ in range(n)]
+    ys = [rng.random() for _ in range(n)]
+    k = math.sqrt(1.0 / n)   # идеальное расстояние между вершинами
+    cell = 2 * k             # дальше 2k отталкивание не учитываем
+    cells_per_side = max(1, int(1 / cell))
+
+    def check():
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise _Expired()
+        if should_stop is not None and should_stop():
+            raise _Expired()
+
+    for it in range(iterations):
+        try:
+            check()
+            dx, dy = _forces(xs, ys, edges, k, cell, cells_per_side, rng, check)
+        except _Expired:
+            break
+        temperature = 0.1 * (1 - it / iterations)
+        for i in range(n):
+            d = math.sqrt(dx[i] * dx[i] + dy[i] * dy[i])
+            if d > 0:
+                step = min(d, temperature) / d
+                xs[i] = min(1.0, max(0.0, xs[i] + dx[i] * step))
+                ys[i] = min(1.0, max(0.0, ys[i] + dy[i] * step))
+
+    return _normalize(vertices, xs, ys)
+
+
+def _forces(xs, ys, edges, k, cell, cells_per_side, rng, check):
+    """
+    Смещения одной итерации: отталкивание в соседних ячейках сетки и
+    притяжение по рёбрам. check() вызывается раз в CHECK_EVERY вершин или рёбер.
+    """
+    n = len(xs)
+    k2 = k * k
+    cutoff = cell * cell
+    dx = [0.0] * n
+    dy = [0.0] * n
+
+    grid = {}
+    for i in range(n):
+        key = (min(int(xs[i] / cell), cells_per_side), min(int(ys[i] / cell), cells_per_side))
+        grid.setdefault(key, []).append(i)
+    steps = 0
+    for (cx, cy), members in grid.items():
+        # каждая пара ячеек — один раз: своя ячейка и четыре соседние «вперёд»
+        for ox, oy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+            others = grid.get((cx + ox, cy + oy))
+            if others is None:
+                continue
+            same = ox == 0 and oy == 0
+            for a, i in enumerate(members):
+                steps += 1
+                if steps % CHECK_EVERY == 0:
+                    check()
+                xi, yi = xs[i], ys[i]
+                for j in (members[a + 1:] if same else others):
+                    ddx = xi - xs[j]
+                    ddy = yi - ys[j]
+                    d2 = ddx * ddx + ddy * ddy
+                    if d2 >= cutoff:
+                        continue
+                    if d2 < 1e-12:
+                        ddx, ddy, d2 = rng.uniform(-k, k) * 0.01, rng.uniform(-k, k) * 0.01, 1e-6 * k2
+                    f = k2 / d2   # k^2 / d, делённое на d для проекций
+                    dx[i] += ddx * f
+                    dy[i] += ddy * f
+                    dx[j] -= ddx * f
+                    dy[j] -= ddy * f
+
+    for lo in range(0, len(edges), CHECK_EVERY):
+        check()
+        for i, j in edges[lo:lo + CHECK_EVERY]:
+            ddx = xs[i] - xs[j]
+            ddy = ys[i] - ys[j]
+            f = math.sqrt(ddx * ddx + ddy * ddy) / k   # d^2 / k, делённое на d
+            dx[i] -= ddx * f
+            dy[i] -= ddy * f
+            dx[j] += ddx * f
+            dy[j] += ddy * f
+    return dx, dy
+
+
+def _normalize(vertices, xs, ys):
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    span = max(x1 - x0, y1 - y0) or 1.0
+    return {v: ((xs[i] - x0) / span, (ys[i] - y0) / span) for i, v in enumerate(vertices)}
+
+
+def sample_edges(graph, limit, seed=0):
+    """
+    Рёбра для отрисовки: все, если их не больше limit, иначе равномерная
+    выборка limit рёбер (reservoir sampling, один проход).
+    """
+    rng = random.Random(seed)
+    vertices = graph.vertices()
+    index = {v: i for i, v in enumerate(vertices)}
+    sample = []
+    seen = 0
+    for i, v in enumerate(vertices):
+        for u in graph.neighbors(v):
+            if index[u] <= i:
+                continue
+            seen += 1
+            if len(sample) < limit:
+                sample.append((v, u))
+            else:
+                r = rng.randrange(seen)
+                if r < limit:
+                    sample[r] = (v, u)
+    return sample
@@ -0,0 +1,540 @@
+"""
+Локальный сервис раскраски: asyncio, HTTP/1.1 поверх TCP или Unix-сокета.
+
+    python main.py serve --port 8765 --workers 4 --queue-size 64 --db graph_data.db
+    python main.py serve --unix /tmp/coloring.sock
+
+    POST /jobs                   {"path": ..., "algorithm": "dsatur", "strategy": ..., "seed": 0, "timeout": 30}
+                                 -> 202 {"id": ...}; 503 при переполненной очереди
+    GET  /jobs/<id>[?wait=5][&coloring=1]
+                                 состояние и результат; wait — ждать завершения до 5 с
+    GET  /jobs/<id>/coloring[?wait=5]
+                                 раскраска потоком CSV (vertex,color)
+    GET  /metrics                глубина очереди, счётчики, задержки (p50/p95/max), кэш графов
+    GET  /health
+
+Задания выполняются в workers процессах-исполнителях, у каждого не больше
+одного задания; очередь ограничена queue_size (backpressure: лишние запросы
+получают 503 и Retry-After). Каждый процесс держит LRU из graph_cache_size
+разобранных графов (ключ — путь, mtime и размер файла), поэтому повторяющиеся
+графы не разбираются заново. По истечении timeout задание получает статус
+timeout: Greedy и DSATUR прерываются кооперативно (через on_progress),
+Tabucol и Exact получают бюджет времени заранее, а исполнитель, не
+остановившийся за KILL_GRACE секунд, убивается и перезапускается (его кэш
+графов теряется) — занятых процессов никогда не больше workers. Так же
+перезапускается исполнитель, умерший сам (например, убитый OOM): задание
+повторяется один раз, и только при второй потере получает статус failed.
+Ошибка записи в базу не меняет статус задания: она попадает в record_error
+и счётчик db_errors.
+"""
+import argparse, asyncio, json, multiprocessing, os, random, time, uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from graph_coloring.algorithms.base import ColoringCancelled
+from graph_coloring.batch import STRATEGY_PARAMS, TIME_DEPENDENT, make_algorithm, parse_config
+from graph_coloring.database_module import DETERMINISTIC_CONFIGS, Database
+from graph_coloring.io_module import load_edgelist
+
+# кэш разобранных графов процесса-исполнителя
+_graphs = OrderedDict()
+
+LATENCY_SAMPLES = 1000
+MAX_BODY = 1 << 20
+# сколько ждать кооперативной остановки после timeout, прежде чем убить исполнителя, с
+KILL_GRACE = 0.5
+
+
+def _load_graph(path, cache_size):
+    """FrozenGraph из LRU процесса; второй элемент — было ли попадание в кэш."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    g = _graphs.get(key)
+    if g is not None:
+        _graphs.move_to_end(key)
+        return g, True
+    g = load_edgelist(path, frozen=True)
+    _graphs[key] = g
+    while len(_graphs) > cache_size:
+        _graphs.popitem(last=False)
+    return g, False
+
+
+def _deadline_guard(deadline):
+    def check(done, total):
+        if time.monotonic() >= deadline:
+            raise ColoringCancelled()
+    return check
+
+
+def run_service_job(spec, cache_size=8):
+    """Выполняется в процессе пула; возвращает результат run() с метками и служебными полями."""
+    t0 = time.perf_counter()
+    g, hit = _load_graph(spec["path"], cache_size)
+    load_time = time.perf_counter() - t0
+
+    # бюджет времени тем, кто умеет его соблюдать; остальным — проверка в on_progress
+    timeout = spec["timeout"]
+    algo = make_algorithm(spec["algorithm"], spec["strategy"], spec["seed"], in_pool=True, timeout=timeout)
+    if timeout is not None:
+        algo.on_progress = _deadline_guard(time.monotonic() + timeout)
+    random.seed(spec["seed"])
+    res = algo.run(g)
+
+    param = STRATEGY_PARAMS.get(spec["algorithm"])
+    strategy = getattr(algo, param) if param else None
+    return {
+        "coloring": g.to_labels(res["coloring"]),
+        "colors_used": res["colors_used"],
+        "time": res["time"],
+        "n": g.n(),
+        "m": g.m(),
+        "algorithm_name": algo.name,
+        "order_strategy": strategy if isinstance(strategy, str) else spec["strategy"],
+        "graph_cache_hit": hit,
+        "load_time": load_time,
+    }
+
+
+def _worker_main(conn, cache_size):
+    """Цикл процесса-исполнителя: спецификация из канала -> ("ok" | "timeout" | "error", данные)."""
+    while True:
+        try:
+            spec = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = ("ok", run_service_job(spec, cache_size))
+        except ColoringCancelled:
+            reply = ("timeout", None)
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+class WorkerError(Exception):
+    """Задание упало в исполнителе; текст — тип и сообщение исходного исключения."""
+
+
+class WorkerLost(WorkerError):
+    """Процесс-исполнитель умер, не вернув ответа; он уже убран, следующий run() поднимет новый."""
+
+
+class _Worker:
+    """
+    Процесс-исполнитель с одним заданием за раз. Если задание не уложилось
+    в срок (или ожидание отменено) либо процесс умер сам, он убирается, а
+    следующий запуск поднимает новый.
+    """
+    def __init__(self, context, cache_size):
+        self.context = context
+        self.cache_size = cache_size
+        self.process = None
+        self.conn = None
+
+    def start(self):
+        parent, child = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_main, args=(child, self.cache_size), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    async def run(self, spec, timeout):
+        """
+        Результат run_service_job; asyncio.TimeoutError, если процесс пришлось
+        убить, WorkerLost — если он умер сам.
+        """
+        if self.process is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        try:
+            self.conn.send(spec)
+        except OSError:
+            # процесс умер, пока простаивал
+            self.kill()
+            raise WorkerLost("исполнитель завершился до получения задания")
+        ready = loop.create_future()
+        fd = self.conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except BaseException:
+            loop.remove_reader(fd)
+            self.kill()
+            raise
+        loop.remove_reader(fd)
+        try:
+            # большая раскраска распаковывается долго: не в цикле событий
+            kind, value = await loop.run_in_executor(None, self.conn.recv)
+        except (EOFError, OSError):
+            self.kill()
+            raise WorkerLost("исполнитель неожиданно завершился")
+        except BaseException:
+            self.kill()
+            raise
+        if kind == "timeout":
+            raise ColoringCancelled()
+        if kind == "error":
+            raise WorkerError(value)
+        return value
+
+    def kill(self):
+        if self.process is None:
+            return
+        self.conn.close()
+        self.process.kill()
+        self.process.join()
+        self.process = None
+        self.conn = None
+
+    def stop(self):
+        """Штатная остановка: закрытый канал завершает цикл исполнителя."""
+        if self.process is None:
+            return
+        self.conn.close()
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.process = None
+        self.conn = None
+
+
+class Job:
+    def __init__(self, spec):
+        self.id = uuid.uuid4().hex
+        self.spec = spec
+        self.status = "queued"
+        self.error = None
+        self.record_error = None
+        self.result = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.done = asyncio.Event()
+
+    def summary(self, with_coloring=False):
+        out = {"id": self.id, "status": self.status, "error": self.error,
+               "path": self.spec["path"], "algorithm": self.spec["algorithm"]}
+        if self.record_error is not None:
+            out["record_error"] = self.record_error
+        if self.started is not None:
+            out["queue_wait"] = self.started - self.submitted
+        if self.result is not None:
+            out.update({k: v for k, v in self.result.items() if k != "coloring"})
+            if with_coloring:
+                out["coloring"] = [[v, c] for v, c in self.result["coloring"].items()]
+        return out
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"p50": None, "p95": None, "max": None}
+    s = sorted(samples)
+    return {"p50": s[len(s) // 2], "p95": s[min(len(s) - 1, int(len(s) * 0.95))], "max": s[-1]}
+
+
+class ColoringService:
+    """
+    Очередь заданий и пул исполнителей. HTTP-обработчик (handle) только
+    ставит задания и читает их состояние, поэтому цикл событий не блокируется.
+    """
+    def __init__(self, workers=None, queue_size=64, timeout=60.0, graph_cache_size=8,
+                 db_path=None, max_jobs=10000):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.graph_cache_size = graph_cache_size
+        self.db_path = db_path
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.counters = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "timeouts": 0,
+                         "worker_restarts": 0, "db_errors": 0, "graph_cache_hits": 0, "graph_cache_misses": 0}
+        self.latency = {name: deque(maxlen=LATENCY_SAMPLES) for name in ("queue_wait", "run", "total")}
+        self.running = 0
+        self.queue = None
+        self.executors = []
+        self.db = None
+        self.db_executor = None
+        self.graph_ids = {}
+        self.server = None
+        self._dispatchers = []
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        self.queue = asyncio.Queue(self.queue_size)
+        # forkserver: исполнители не наследуют сокеты соединений и соединение с базой
+        context = multiprocessing.get_context("forkserver")
+        self.executors = [_Worker(context, self.graph_cache_size) for _ in range(self.workers)]
+        for worker in self.executors:
+            worker.start()
+        if self.db_path:
+            # Database — одно соединение, поэтому записи идут через один поток
+            self.db_executor = ThreadPoolExecutor(max_workers=1)
+            self.db = Database(self.db_path)
+        self._dispatchers = [asyncio.create_task(self._dispatch(worker)) for worker in self.executors]
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        for worker in self.executors:
+            worker.stop()
+        if self.db is not None:
+            await asyncio.get_running_loop().run_in_executor(self.db_executor, self.db.close)
+            self.db_executor.shutdown()
+
+    # очередь и исполнение
+
+    def submit(self, request):
+        """Проверяет и ставит задание в очередь; None — очередь полна."""
+        path = request.get("path")
+        if not isinstance(path, str) or not os.path.isfile(path):
+            raise ValueError(f"Файл графа не найден: {path}")
+        config = request.get("algorithm", "dsatur")
+        if request.get("strategy"):
+            config += ":" + request["strategy"]
+        algorithm, strategy = parse_config(config)
+        timeout = request.get("timeout", self.timeout)
+        spec = {"path": path, "algorithm": algorithm, "strategy": strategy,
+                "seed": int(request.get("seed", 0)),
+                "timeout": float(timeout) if timeout is not None else None,
+                "record": bool(request.get("record", self.db is not None))}
+        job = Job(spec)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            return None
+        self.counters["submitted"] += 1
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.max_jobs:
+            old_id, old = next(iter(self.jobs.items()))
+            if not old.done.is_set():
+                break
+            del self.jobs[old_id]
+        return job
+
+    async def _dispatch(self, worker):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            job.started = time.monotonic()
+            self.running += 1
+            timeout = job.spec["timeout"]
+            try:
+                # запас на кооперативную отмену; после него исполнитель убивается
+                job.result = await self._run(worker, job.spec, timeout + KILL_GRACE if timeout is not None else None)
+                job.status = "done"
+                self.counters["completed"] += 1
+                self.counters["graph_cache_hits" if job.result["graph_cache_hit"] else "graph_cache_misses"] += 1
+                if self.db is not None and job.spec["record"]:
+                    try:
+                        await loop.run_in_executor(self.db_executor, self._record, job)
+                    except Exception as e:
+                        # результат уже получен: сбой базы не делает задание failed
+                        job.record_error = f"{type(e).__name__}: {e}"
+                        self.counters["db_errors"] += 1
+            except (asyncio.TimeoutError, ColoringCancelled) as e:
+                job.status = "timeout"
+                job.error = f"превышен лимит времени {timeout} с"
+                self.counters["timeouts"] += 1
+                if isinstance(e, asyncio.TimeoutError):
+                    self.counters["worker_restarts"] += 1
+            except asyncio.CancelledError:
+                raise
+            except WorkerError as e:
+                job.status = "failed"
+                job.error = str(e)
+                self.counters["failed"] += 1
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                self.counters["failed"] += 1
+            finally:
+                self.running -= 1
+                job.finished = time.monotonic()
+                self.latency["queue_wait"].append(job.started - job.submitted)
+                self.latency["run"].append(job.finished - job.started)
+                self.latency["total"].append(job.finished - job.submitted)
+                job.done.set()
+                self.queue.task_done()
+
+    async def _run(self, worker, spec, timeout):
+        """worker.run с одним повтором, если исполнитель умер (он уже убран и будет поднят заново)."""
+        try:
+            return await worker.run(spec, timeout)
+        except WorkerLost:
+            self.counters["worker_restarts"] += 1
+        try:
+            return await worker.run(spec, timeout)
+        except WorkerLost:
+            self.counters["worker_restarts"] += 1
+            raise
+
+    def _record(self, job):
+        """Запись результата в Database (в потоке db_executor)."""
+        path = job.spec["path"]
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        if key not in self.graph_ids:
+            graph = load_edgelist(path, frozen=True).thaw()
+            self.graph_ids[key] = self.db.add_graph_model(os.path.basename(path), graph,
+                                                          fingerprint=graph.fingerprint())
+        res = job.result
+        strategy = res["order_strategy"] or ""
+        spec = job.spec
+        # как в пакетном режиме: результат, зависящий от времени, seed не воспроизводит
+        time_dependent = spec["algorithm"] in TIME_DEPENDENT or (spec["algorithm"] == "exact" and spec["timeout"])
+        if (res["algorithm_name"], strategy) in DETERMINISTIC_CONFIGS or time_dependent:
+            seed = None
+        else:
+            seed = spec["seed"]
+        self.db.add_coloring(self.graph_ids[key], res["algorithm_name"], strategy, res["colors_used"],
+                             res["time"], res["coloring"], seed)
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "workers": self.workers,
+            "jobs_tracked": len(self.jobs),
+            **self.counters,
+            "latency": {name: _percentiles(samples) for name, samples in self.latency.items()},
+        }
+
+    # HTTP
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            method, target, body = await self._read_request(reader)
+            await self.handle(method, target, body, writer)
+        except ValueError as e:
+            await self._send_json(writer, 400, {"error": str(e)})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader):
+        line = (await reader.readline()).decode("latin-1").strip()
+        parts = line.split()
+        if len(parts) != 3:
+            raise ValueError("Некорректная строка запроса")
+        headers = {}
+        while True:
+            h = (await reader.readline()).decode("latin-1").strip()
+            if not h:
+                break
+            name, _, value = h.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY:
+            raise ValueError("Слишком большое тело запроса")
+        body = await reader.readexactly(length) if length else b""
+        return parts[0].upper(), parts[1], body
+
+    async def handle(self, method, target, body, writer):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+
+        if method == "POST" and parts == ["jobs"]:
+            try:
+                request = json.loads(body or b"{}")
+                job = self.submit(request)
+            except (ValueError, TypeError, AttributeError) as e:
+                return await self._send_json(writer, 400, {"error": str(e)})
+            if job is None:
+                return await self._send_json(writer, 503, {"error": "очередь заполнена"},
+                                             extra_headers={"Retry-After": "1"})
+            return await self._send_json(writer, 202, {"id": job.id, "status": job.status})
+        if method == "GET" and parts == ["metrics"]:
+            return await self._send_json(writer, 200, self.metrics())
+        if method == "GET" and parts == ["health"]:
+            return await self._send_json(writer, 200, {"status": "ok"})
+        if method == "GET" and len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return await self._send_json(writer, 404, {"error": "задание не найдено"})
+            wait = float(query.get("wait", 0))
+            if wait > 0 and not job.done.is_set():
+                try:
+                    await asyncio.wait_for(job.done.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            if len(parts) == 2:
+                return await self._send_json(writer, 200, job.summary(query.get("coloring") == "1"))
+            if parts[2] == "coloring":
+                return await self._stream_coloring(writer, job)
+        return await self._send_json(writer, 404, {"error": "неизвестный путь"})
+
+    async def _stream_coloring(self, writer, job):
+        if job.result is None:
+            return await self._send_json(writer, 409, job.summary())
+        # тело без Content-Length: конец ответа — закрытие соединения
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/csv; charset=utf-8\r\nConnection: close\r\n\r\n")
+        writer.write(b"vertex,color\n")
+        lines = []
+        for v, c in job.result["coloring"].items():
+            lines.append(f"{v},{c}\n")
+            if len(lines) >= 4096:
+                writer.write("".join(lines).encode("utf-8"))
+                lines = []
+                await writer.drain()
+        writer.write("".join(lines).encode("utf-8"))
+
+    @staticmethod
+    async def _send_json(writer, status, payload, extra_headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                  409: "Conflict", 503: "Service Unavailable"}[status]
+        headers = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json; charset=utf-8",
+                   f"Content-Length: {len(body)}", "Connection: close"]
+        headers += [f"{k}: {v}" for k, v in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def serve(args):
+    service = ColoringService(args.workers, args.queue_size, args.timeout, args.graph_cache, args.db)
+    await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving on {where}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python main.py serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="слушать Unix-сокет вместо TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=60.0, help="лимит времени задания по умолчанию, с")
+    parser.add_argument("--graph-cache", type=int, default=8, help="число графов в LRU каждого исполнителя")
+    parser.add_argument("--db", help="записывать результаты в базу SQLite")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
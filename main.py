@@ -1,23 +1,65 @@
 import sys
 import os
 from graph_coloring.io_module import load_edgelist, export_coloring
-from graph_coloring.algorithms.dsatur import DSATURAlgorithm
 from graph_coloring.algorithms.greedy import GreedyAlgorithm
+from graph_coloring.batch import ALGORITHMS
 
 def running_in_docker():
     return os.path.exists('/.dockerenv')
 
 def cli_mode():
-    if len(sys.argv) < 3:
-        print("Usage: python main.py <graph.txt> <dsatur|greedy>")
+    if sys.argv[1:2] == ["batch"]:
+        from graph_coloring import batch
+        sys.exit(batch.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["stream"]:
+        sys.exit(stream_mode(sys.argv[2:]))
+    if sys.argv[1:2] == ["serve"]:
+        from graph_coloring import service
+        sys.exit(service.main(sys.argv[2:]))
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    use_cache = "--no-cache" not in sys.argv[1:]
+    with_stats = "--stats" in sys.argv[1:]
+    if len(args) < 2:
+        print(f"Usage: python main.py <graph.txt> <{'|'.join(ALGORITHMS)}> [--no-cache] [--stats]\n"
+              f"       python main.py batch <graphs...> --algos dsatur,greedy:random [--help]\n"
+              f"       python main.py stream <edges.txt> [--max-passes 32] [--state-dir DIR] [--help]\n"
+              f"       python main.py serve [--port 8765 | --unix PATH] [--help]")
         return
-    path, algo = sys.argv[1], sys.argv[2]
-    g = load_edgelist(path)
-    res = DSATURAlgorithm().run(g) if algo == "dsatur" else GreedyAlgorithm().run(g)
+    path, algo = args[0], args[1]
+    g = load_edgelist(path, frozen=True, use_cache=use_cache)
+    algorithm = ALGORITHMS.get(algo, GreedyAlgorithm)()
+    res = algorithm.profile(g, memory=True) if with_stats else algorithm.run(g)
     print(f"n={g.n()}, m={g.m()}, colors={res['colors_used']}, time={res['time']:.6f}s")
-    export_coloring("coloring.csv", res["coloring"])
+    if with_stats:
+        for name, ns in res["stats"]["phases_ns"].items():
+            print(f"  {name}: {ns / 1e6:.3f} ms")
+        for name, value in res["stats"]["counters"].items():
+            print(f"  {name}: {value}")
+        print(f"  peak_memory: {res['stats']['peak_memory_bytes'] // 1024} KiB")
+    export_coloring("coloring.csv", g.to_labels(res["coloring"]))
     print("Saved to coloring.csv")
 
+def stream_mode(argv):
+    """Раскраска графа больше памяти: файл рёбер читается несколькими проходами."""
+    import argparse
+    from graph_coloring.algorithms.streaming import SemiStreamingAlgorithm
+    parser = argparse.ArgumentParser(prog="python main.py stream")
+    parser.add_argument("path")
+    parser.add_argument("--max-passes", type=int, default=32)
+    parser.add_argument("--state-dir", help="каталог для mmap-файла состояния вершин")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fallback-edges", type=int, default=None,
+                        help="концов рёбер в памяти за проход докраски (по умолчанию max(4n, 65536))")
+    parser.add_argument("--out", default="coloring.csv")
+    args = parser.parse_args(argv)
+    res = SemiStreamingAlgorithm(args.max_passes, args.seed, state_dir=args.state_dir,
+                                 fallback_edges=args.fallback_edges).run(args.path)
+    print(f"n={res['vertices']}, colors={res['colors_used']}, passes={res['passes']}, "
+          f"bytes_read={res['bytes_read']}, time={res['time']:.6f}s")
+    export_coloring(args.out, res["coloring"])
+    print(f"Saved to {args.out}")
+    return 0
+
 def gui_mode():
     import tkinter as tk
     from graph_coloring.gui import GUIApp
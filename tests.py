@@ -3,7 +3,12 @@ from graph_coloring.graph_model import GraphModel
 from graph_coloring.algorithms.greedy import GreedyAlgorithm
 from graph_coloring.algorithms.dsatur import DSATURAlgorithm
 from graph_coloring.io_module import export_coloring, load_edgelist, save_report_txt
-import tempfile, os
+import tempfile, os, random
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")
+
+def is_proper(graph, coloring):
+    return all(coloring[u] != coloring[v] for u in graph.vertices() for v in graph.neighbors(u))
 
 class TestGraphColoring(unittest.TestCase):
     def setUp(self):
@@ -84,5 +89,935 @@ class TestGraphColoring(unittest.TestCase):
         self.assertEqual(res["colors_used"], 0)
         self.assertEqual(res["coloring"], {})
 
+class TestDSATURQueue(unittest.TestCase):
+    def setUp(self):
+        self.graph = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+
+    def test_degree_desc_is_proper_and_deterministic(self):
+        res1 = DSATURAlgorithm().run(self.graph)
+        res2 = DSATURAlgorithm().run(self.graph)
+        self.assertTrue(is_proper(self.graph, res1["coloring"]))
+        self.assertEqual(res1["coloring"], res2["coloring"])
+
+    def test_random_tie_break_reproducible_with_seed(self):
+        random.seed(42)
+        res1 = DSATURAlgorithm(tie_break='random').run(self.graph)
+        random.seed(42)
+        res2 = DSATURAlgorithm(tie_break='random').run(self.graph)
+        self.assertTrue(is_proper(self.graph, res1["coloring"]))
+        self.assertEqual(res1["coloring"], res2["coloring"])
+
+    def test_random_tie_break_matches_baseline_scan(self):
+        from graph_coloring.generators import gnp
+
+        def baseline(graph):
+            # исходный DSATUR: полное сканирование и random.choice среди кандидатов
+            uncolored = set(graph.vertices())
+            color, sat = {}, dict.fromkeys(uncolored, 0)
+            neigh = {v: set() for v in uncolored}
+            v = max(uncolored, key=graph.degree)
+            while True:
+                c = 1
+                while c in neigh[v]:
+                    c += 1
+                color[v] = c
+                uncolored.remove(v)
+                for u in graph.neighbors(v):
+                    if u in uncolored:
+                        neigh[u].add(c)
+                        sat[u] = len(neigh[u])
+                if not uncolored:
+                    return color
+                best = max(sat[u] for u in uncolored)
+                candidates = [u for u in uncolored if sat[u] == best]
+                v = candidates[0] if len(candidates) == 1 else random.choice(candidates)
+
+        for g in (self.graph, gnp(300, 0.05, seed=2)):
+            for seed in (1, 2):
+                random.seed(seed)
+                expected = baseline(g)
+                random.seed(seed)
+                self.assertEqual(DSATURAlgorithm(tie_break='random').run(g)["coloring"], expected)
+
+    def test_bitset_kernel_matches_set_kernel(self):
+        for tie_break in ('degree_desc', 'random'):
+            random.seed(7)
+            expected = DSATURAlgorithm(tie_break=tie_break).run(self.graph)["coloring"]
+            random.seed(7)
+            self.assertEqual(DSATURAlgorithm(tie_break=tie_break, kernel='bitset').run(self.graph)["coloring"], expected)
+        for strategy in ('degree_desc', 'as_loaded'):
+            self.assertEqual(GreedyAlgorithm(strategy, kernel='bitset').run(self.graph)["coloring"],
+                             GreedyAlgorithm(strategy).run(self.graph)["coloring"])
+        with self.assertRaises(ValueError):
+            GreedyAlgorithm(kernel='simd')
+
+class TestFrozenGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+        self.frozen = self.graph.freeze()
+
+    def test_same_surface(self):
+        self.assertEqual(self.frozen.n(), self.graph.n())
+        self.assertEqual(self.frozen.m(), self.graph.m())
+        for i in self.frozen.vertices():
+            v = self.frozen.label(i)
+            self.assertEqual(self.frozen.degree(i), self.graph.degree(v))
+            self.assertEqual({self.frozen.label(j) for j in self.frozen.neighbors(i)}, self.graph.neighbors(v))
+
+    def test_algorithms_accept_frozen_graph(self):
+        for algo in (GreedyAlgorithm(), DSATURAlgorithm()):
+            res = algo.run(self.frozen)
+            coloring = self.frozen.to_labels(res["coloring"])
+            self.assertTrue(is_proper(self.graph, coloring))
+
+    def test_thaw_roundtrip(self):
+        self.assertEqual(self.frozen.thaw().adj, self.graph.adj)
+
+class TestLoaders(unittest.TestCase):
+    def _write(self, text, suffix='.txt'):
+        tmp = tempfile.NamedTemporaryFile(delete=False, mode='w', encoding='utf-8', suffix=suffix)
+        tmp.write(text)
+        tmp.close()
+        self.addCleanup(os.remove, tmp.name)
+        return tmp.name
+
+    def test_mixed_labels_and_weights(self):
+        g = load_edgelist(self._write("a b\n1 2 5\n\nb 1\n3\n"))
+        # строка с нечисловой меткой оставляет обе метки строками
+        self.assertEqual(g.neighbors('b'), {'a', '1'})
+        self.assertEqual(g.neighbors(1), {2})
+        self.assertEqual(g.m(), 3)
+
+    def test_line_breaks_match_text_mode(self):
+        text = "1\x0c2 3\r\n4 5\u2028 6\r7 8\n"
+        path = self._write(text)
+        with open(path, encoding='utf-8') as f:
+            expected = [tuple(int(x) for x in line.split()[:2]) for line in f if len(line.split()) >= 2]
+        self.assertEqual(expected, [(1, 2), (4, 5), (7, 8)])
+        self.assertEqual({frozenset(e) for e in expected},
+                         {frozenset((u, v)) for u in load_edgelist(path).vertices()
+                          for v in load_edgelist(path).neighbors(u)})
+
+    def test_small_chunks_match_default(self):
+        from graph_coloring.io_module import iter_edgelist_chunks
+        path = os.path.join(DATA_DIR, "6.txt")
+        flat = [x for chunk in iter_edgelist_chunks(path, chunk_size=7) for x in chunk]
+        g = GraphModel.from_edgelist(list(zip(flat[::2], flat[1::2])))
+        self.assertEqual(g.adj, load_edgelist(path).adj)
+
+    def test_dimacs(self):
+        g = load_edgelist(self._write("c triangle\np edge 4 3\ne 1 2\ne 2 3\ne 1 3\n", suffix='.col'))
+        self.assertEqual(g.n(), 4)
+        self.assertEqual(g.m(), 3)
+        self.assertEqual(g.degree(4), 0)
+
+    def test_dimacs_detected_by_header(self):
+        g = load_edgelist(self._write("p edge 3 2\ne 1 2\ne 2 3\n"))
+        self.assertEqual(g.m(), 2)
+
+    def test_metis(self):
+        # треугольник 1-2-3 и изолированная вершина 4, с весами рёбер
+        g = load_edgelist(self._write("% comment\n4 3 001\n2 1 3 1\n1 1 3 1\n1 1 2 1\n\n", suffix='.graph'))
+        self.assertEqual(g.n(), 4)
+        self.assertEqual(g.m(), 3)
+        self.assertEqual(g.neighbors(1), {2, 3})
+
+class TestGraphCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "g.txt")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("1 2\n2 3\n1 3\n3 4\n")
+
+    def test_cache_written_and_reused(self):
+        from graph_coloring.graph_cache import cache_path_for
+        g1 = load_edgelist(self.path, frozen=True)
+        self.assertTrue(os.path.exists(cache_path_for(self.path)))
+        g2 = load_edgelist(self.path, frozen=True)
+        self.assertTrue(hasattr(g2, "_buffer"))
+        self.assertEqual(g2.thaw().adj, g1.thaw().adj)
+        self.assertEqual(g2.to_labels(DSATURAlgorithm().run(g2)["coloring"]),
+                         g1.to_labels(DSATURAlgorithm().run(g1)["coloring"]))
+
+    def test_cache_invalidated_by_source_change(self):
+        load_edgelist(self.path, frozen=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("4 5\n")
+        g = load_edgelist(self.path, frozen=True)
+        self.assertEqual(g.m(), 5)
+
+    def test_cache_keyed_by_format(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("3 2\n2\n1 3\n2\n")
+        as_edges = load_edgelist(self.path, fmt='edgelist', frozen=True)
+        as_metis = load_edgelist(self.path, fmt='metis', frozen=True)
+        self.assertEqual(as_edges.thaw().neighbors(3), {1, 2})
+        self.assertEqual(as_metis.thaw().neighbors(3), {2})
+        self.assertEqual(load_edgelist(self.path, fmt='edgelist', frozen=True).thaw().adj, as_edges.thaw().adj)
+
+    def test_string_labels_and_bypass(self):
+        from graph_coloring.graph_cache import cache_path_for
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("a b\nb c\n")
+        load_edgelist(self.path, frozen=True)
+        g = load_edgelist(self.path, frozen=True)
+        self.assertEqual(g.thaw().neighbors('b'), {'a', 'c'})
+        os.remove(cache_path_for(self.path))
+        load_edgelist(self.path, frozen=True, use_cache=False)
+        self.assertFalse(os.path.exists(cache_path_for(self.path)))
+
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        self.graph = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+
+    def test_pool_returns_best_proper_coloring(self):
+        from graph_coloring.algorithms.portfolio import PortfolioAlgorithm
+        res = PortfolioAlgorithm(restarts=6, max_workers=2, lower_bound=1).run(self.graph)
+        self.assertTrue(is_proper(self.graph, res["coloring"]))
+        self.assertEqual(len(res["runs"]), 6)
+        self.assertEqual(res["colors_used"], min(r["colors_used"] for r in res["runs"]))
+
+    def test_stops_at_lower_bound(self):
+        from graph_coloring.algorithms.portfolio import PortfolioAlgorithm
+        res = PortfolioAlgorithm(restarts=10, max_workers=1, lower_bound=100).run(self.graph)
+        self.assertEqual(len(res["runs"]), 1)
+
+    def test_clique_bound_and_restarts_check(self):
+        from graph_coloring.algorithms.portfolio import PortfolioAlgorithm
+        triangle = load_edgelist(os.path.join(DATA_DIR, "1.txt"))
+        res = PortfolioAlgorithm(restarts=10, max_workers=1).run(triangle)
+        self.assertEqual((res["colors_used"], len(res["runs"])), (3, 1))
+        with self.assertRaises(ValueError):
+            PortfolioAlgorithm(restarts=0)
+
+class TestComponents(unittest.TestCase):
+    def setUp(self):
+        base = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+        edges = [(u, v) for u in base.vertices() for v in base.neighbors(u)]
+        self.graph = GraphModel.from_edgelist([((k, u), (k, v)) for k in range(4) for u, v in edges])
+        self.graph.add_vertex("isolated")
+        self.base_colors = DSATURAlgorithm().run(base)["colors_used"]
+
+    def test_connected_components(self):
+        comps = self.graph.connected_components()
+        self.assertEqual(sorted(len(c) for c in comps), [1, 100, 100, 100, 100])
+
+    def test_subgraph_accepts_list(self):
+        comp = self.graph.connected_components()[0]
+        sub = self.graph.subgraph(comp)
+        self.assertEqual(sub.m(), 294)
+
+    def test_componentwise_serial_and_pool(self):
+        from graph_coloring.algorithms.components import ComponentwiseAlgorithm
+        for workers in (1, 2):
+            res = ComponentwiseAlgorithm(DSATURAlgorithm(), max_workers=workers, inline_threshold=50).run(self.graph)
+            self.assertEqual(len(res["coloring"]), self.graph.n())
+            self.assertTrue(is_proper(self.graph, res["coloring"]))
+            self.assertEqual(res["components"], 5)
+            self.assertEqual(res["colors_used"], self.base_colors)
+
+class TestBenchmark(unittest.TestCase):
+    def test_generators(self):
+        from graph_coloring import generators
+        self.assertEqual(generators.mycielski(4).n(), 11)
+        self.assertEqual(generators.mycielski(4).m(), 20)
+        self.assertEqual(generators.queen(4).m(), 76)
+        self.assertEqual(generators.gnp(50, 0.1, seed=3).adj, generators.gnp(50, 0.1, seed=3).adj)
+
+    def test_compare_flags_regressions(self):
+        from graph_coloring.benchmark import measure, compare
+        row = dict(graph="6.txt", n=100, m=294)
+        row.update(measure("dsatur", "degree_desc", load_edgelist(os.path.join(DATA_DIR, "6.txt")), warmups=0, repeats=1))
+        baseline = {"results": [row]}
+        worse = dict(row, colors_used=row["colors_used"] + 1, time_median=max(row["time_median"], 1e-3) * 2)
+        self.assertEqual(compare(baseline, baseline), [])
+        self.assertEqual(len(compare(baseline, {"results": [worse]})), 2)
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        from graph_coloring.database_module import Database
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db = Database(os.path.join(self.tmpdir.name, "test.db"))
+        self.graph = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+
+    def test_fingerprint_is_order_independent(self):
+        edges = [(u, v) for u in self.graph.vertices() for v in self.graph.neighbors(u) if u < v]
+        shuffled = [(v, u) for u, v in reversed(edges)]
+        self.assertEqual(GraphModel.from_edgelist(shuffled).fingerprint(), self.graph.fingerprint())
+        self.assertEqual(self.graph.freeze().fingerprint(), self.graph.fingerprint())
+        self.assertNotEqual(GraphModel.from_edgelist(edges[1:]).fingerprint(), self.graph.fingerprint())
+
+    def test_graphs_deduplicated_by_fingerprint(self):
+        fp = self.graph.fingerprint()
+        id1 = self.db.add_graph("a", self.graph.n(), self.graph.m(), [], fingerprint=fp)
+        id2 = self.db.add_graph("b", self.graph.n(), self.graph.m(), [], fingerprint=fp)
+        self.assertEqual(id1, id2)
+        self.assertEqual(len(self.db.get_graphs()), 1)
+
+    def test_cached_coloring_roundtrip(self):
+        from graph_coloring.database_module import Database
+        fp = self.graph.fingerprint()
+        graph_id = self.db.add_graph("6.txt", self.graph.n(), self.graph.m(), [], fingerprint=fp)
+        self.assertIsNone(self.db.get_cached_coloring(fp, "DSATUR", "degree_desc"))
+        res = DSATURAlgorithm().run(self.graph)
+        self.db.add_coloring(graph_id, "DSATUR", "degree_desc", res["colors_used"], res["time"], res["coloring"])
+        # новый объект — пустой LRU, результат читается из SQLite с исходными типами меток
+        fresh = Database(self.db.path)
+        hit = fresh.get_cached_coloring(fp, "DSATUR", "degree_desc")
+        self.assertTrue(hit["cached"])
+        self.assertEqual(hit["coloring"], res["coloring"])
+        self.assertIsNone(fresh.get_cached_coloring(fp, "Greedy", "random"))
+
+    def test_lru_evicts_by_size(self):
+        from graph_coloring.database_module import ColoringLRU
+        lru = ColoringLRU(max_vertices=5)
+        lru.put("a", {"coloring": {1: 1, 2: 2, 3: 1}})
+        lru.put("b", {"coloring": {1: 1, 2: 2}})
+        lru.get("a")
+        lru.put("c", {"coloring": {1: 1}})
+        self.assertIsNone(lru.get("b"))
+        self.assertIsNotNone(lru.get("a"))
+        self.assertLessEqual(lru.size, 5)
+
+class TestDatabaseStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "test.db")
+
+    def _open(self):
+        from graph_coloring.database_module import Database
+        db = Database(self.path)
+        self.addCleanup(db.close)
+        return db
+
+    def test_graph_roundtrip_with_dash_labels(self):
+        g = GraphModel.from_edgelist([("a-b", "c"), ("c", -1), (-1, "a-b")])
+        g.add_vertex("lonely")
+        db = self._open()
+        graph_id = db.add_graph_model("g", g)
+        self.assertEqual(db.load_graph(graph_id).adj, g.adj)
+        self.assertEqual(db.get_graphs(), [(graph_id, "g", 4, 3)])
+
+    def test_batch_colorings(self):
+        db = self._open()
+        g = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+        graph_id = db.add_graph_model("6.txt", g)
+        runs = [GreedyAlgorithm(order_strategy=s).run(g) for s in ("degree_desc", "as_loaded")]
+        db.add_colorings([(graph_id, "Greedy", s, r["colors_used"], r["time"], r["coloring"])
+                          for s, r in zip(("degree_desc", "as_loaded"), runs)])
+        stored = db.get_colorings(graph_id)
+        self.assertEqual([row[4] for row in stored], [r["coloring"] for r in runs])
+
+    def test_label_cache_is_bounded(self):
+        from unittest import mock
+        from graph_coloring import database_module
+        db = self._open()
+        ids = [db.add_graph_model(f"g{i}", GraphModel.from_edgelist([(i, i + 1)])) for i in range(3)]
+        with mock.patch.object(database_module, "LABEL_CACHE_SIZE", 2):
+            for graph_id in ids + ids[1:2]:
+                db._graph_labels(graph_id)
+        self.assertEqual(list(db._labels), [ids[2], ids[1]])
+
+    def test_upgrade_legacy_database(self):
+        import sqlite3, json
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE graphs (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, n INTEGER, m INTEGER, data TEXT)")
+        conn.execute("""CREATE TABLE colorings (id INTEGER PRIMARY KEY AUTOINCREMENT, graph_id INTEGER,
+                        algorithm TEXT, order_strategy TEXT, colors_used INTEGER, time_sec REAL,
+                        coloring TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+        conn.execute("INSERT INTO graphs (name, n, m, data) VALUES ('t', 3, 3, '1-2,2-3,1-3')")
+        conn.execute("INSERT INTO colorings (graph_id, algorithm, order_strategy, colors_used, time_sec, coloring) "
+                     "VALUES (1, 'DSATUR', 'degree_desc', 3, 0.1, ?)", (json.dumps({1: 1, 2: 2, 3: 3}),))
+        conn.commit()
+        conn.close()
+        db = self._open()
+        self.assertEqual(db.load_graph(1).adj, self.graph_adj())
+        self.assertEqual(db.get_colorings(1)[0][4], {1: 1, 2: 2, 3: 3})
+        legacy = db.conn.execute("SELECT data FROM graphs UNION ALL SELECT coloring FROM colorings").fetchall()
+        self.assertEqual(legacy, [("1-2,2-3,1-3",), (json.dumps({1: 1, 2: 2, 3: 3}),)])
+        self.assertEqual(db.conn.execute("PRAGMA user_version").fetchone()[0], 2)
+
+    def test_upgrade_keeps_ambiguous_legacy_graph(self):
+        import sqlite3
+        from graph_coloring.database_module import parse_legacy_edges
+        self.assertEqual(parse_legacy_edges("-1-2,a-b"), [(-1, 2), ("a", "b")])
+        with self.assertRaises(ValueError):
+            parse_legacy_edges("a-b-c")
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE graphs (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, n INTEGER, m INTEGER, data TEXT)")
+        conn.execute("INSERT INTO graphs (name, n, m, data) VALUES ('t', 3, 2, 'a-b-c,c-d')")
+        conn.commit()
+        conn.close()
+        with self.assertLogs("graph_coloring.database_module", "WARNING") as logs:
+            db = self._open()
+        self.assertIn("[1]", logs.output[0])
+        row = db.conn.execute("SELECT data, edges FROM graphs").fetchone()
+        self.assertEqual(row, ("a-b-c,c-d", None))
+        # версия отмечена: при следующем открытии проход не повторяется
+        self.assertEqual(db.conn.execute("PRAGMA user_version").fetchone()[0], 2)
+        self.assertEqual(db.upgrade(), [1])
+
+    def test_history_queries(self):
+        db = self._open()
+        g = GraphModel.from_edgelist([(1, 2), (2, 3), (1, 3)])
+        graph_id = db.add_graph_model("t", g)
+        coloring = {1: 1, 2: 2, 3: 3}
+        db.add_colorings([(graph_id, "Greedy", "random", 3 + i % 2, float(i), coloring, i) for i in range(10)])
+        db.add_coloring(graph_id, "DSATUR", "degree_desc", 3, 0.5, coloring)
+
+        page1 = db.list_colorings(graph_id, limit=4)
+        page2 = db.list_colorings(graph_id, limit=4, after_id=page1[-1][0])
+        self.assertEqual(len(page1), 4)
+        self.assertEqual(page2[0][0], page1[-1][0] + 1)
+        self.assertEqual(len(db.list_colorings(graph_id, algorithm="DSATUR")), 1)
+        self.assertEqual(db.get_coloring(page1[0][0]), coloring)
+
+        summary = db.get_coloring_summary(graph_id)
+        greedy = summary[("Greedy", "random")]
+        self.assertEqual((greedy["runs"], greedy["best_colors"], greedy["worst_colors"]), (10, 3, 4))
+        self.assertEqual(greedy["p50_time"], 4.0)
+        self.assertEqual(greedy["p90_time"], 8.0)
+        self.assertEqual(db.best_colorings(graph_id)["Greedy"][0], 3)
+
+        plan = db.conn.execute("EXPLAIN QUERY PLAN SELECT id FROM colorings WHERE graph_id=? AND id>? ORDER BY id",
+                               (graph_id, 0)).fetchall()
+        self.assertIn("idx_colorings_graph", str(plan))
+
+    @staticmethod
+    def graph_adj():
+        return GraphModel.from_edgelist([(1, 2), (2, 3), (1, 3)]).adj
+
+class TestIncremental(unittest.TestCase):
+    def assertValid(self, inc):
+        self.assertEqual(set(inc.color), set(inc.graph.adj))
+        self.assertTrue(is_proper(inc.graph, inc.color))
+        self.assertEqual(inc.colors_used, max(inc.color.values(), default=0))
+
+    def test_random_updates_keep_coloring_valid(self):
+        from graph_coloring.incremental import IncrementalColorer
+        from graph_coloring.generators import gnp
+        rng = random.Random(1)
+        inc = IncrementalColorer(gnp(60, 0.1, seed=2), compact_every=25)
+        for step in range(300):
+            u, v = rng.randrange(70), rng.randrange(70)
+            op = rng.random()
+            if op < 0.6:
+                inc.add_edge(u, v)
+            elif op < 0.9:
+                inc.remove_edge(u, v)
+            elif op < 0.95:
+                inc.add_vertex(100 + step, neighbors=[u, v])
+            elif u in inc.graph.adj:
+                inc.remove_vertex(u)
+            self.assertValid(inc)
+        self.assertGreater(inc.stats["compactions"], 0)
+
+    def test_kempe_swap_avoids_new_color(self):
+        from graph_coloring.incremental import IncrementalColorer
+        # путь 1-2-3-4 раскрашен 1,2,1,2; ребро (1,4) решается без третьего цвета
+        g = GraphModel.from_edgelist([(1, 2), (2, 3), (3, 4), (5, 6)])
+        inc = IncrementalColorer(g, coloring={1: 1, 2: 2, 3: 1, 4: 2, 5: 1, 6: 2})
+        inc.add_edge(1, 3)
+        self.assertValid(inc)
+        g2 = GraphModel.from_edgelist([(1, 2), (3, 4)])
+        inc2 = IncrementalColorer(g2, coloring={1: 1, 2: 2, 3: 2, 4: 1})
+        inc2.add_vertex(5, neighbors=[1, 3])
+        self.assertValid(inc2)
+        self.assertEqual(inc2.colors_used, 2)
+        self.assertEqual(inc2.stats["kempe_swaps"], 1)
+
+    def test_batch_and_compaction(self):
+        from graph_coloring.incremental import IncrementalColorer
+        inc = IncrementalColorer(GraphModel.from_edgelist([(i, i + 1) for i in range(10)]))
+        clique = [(a, b) for a in range(20, 25) for b in range(a + 1, 25)]
+        inc.apply_batch([('add_edge', a, b) for a, b in clique] + [('remove_vertex', 0)])
+        self.assertValid(inc)
+        self.assertEqual(inc.colors_used, 5)
+        inc.apply_batch([('remove_edge', a, b) for a, b in clique])
+        inc.compact()
+        self.assertValid(inc)
+        self.assertEqual(inc.colors_used, 2)
+
+class TestTabucol(unittest.TestCase):
+    def test_improves_on_dsatur(self):
+        from graph_coloring.algorithms.tabucol import TabucolAlgorithm
+        from graph_coloring.generators import queen
+        g = queen(6)
+        progress = []
+        res = TabucolAlgorithm(time_budget=5, seed=1, lower_bound=7,
+                               progress=lambda *args: progress.append(args)).run(g)
+        self.assertTrue(is_proper(g, res["coloring"]))
+        self.assertLess(res["colors_used"], DSATURAlgorithm().run(g)["colors_used"])
+        self.assertEqual(progress[-1][0], res["colors_used"])
+
+    def test_iteration_cap_returns_valid_coloring(self):
+        from graph_coloring.algorithms.tabucol import TabucolAlgorithm
+        g = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+        res = TabucolAlgorithm(initial='greedy', time_budget=None, max_iterations=50, seed=0).run(g)
+        self.assertTrue(is_proper(g, res["coloring"]))
+        self.assertLessEqual(res["iterations"], 50)
+
+    def test_stops_at_clique_bound(self):
+        from graph_coloring.algorithms.tabucol import TabucolAlgorithm
+        g = load_edgelist(os.path.join(DATA_DIR, "1.txt"))
+        res = TabucolAlgorithm(time_budget=5, seed=0).run(g)
+        self.assertEqual(res["lower_bound"], res["colors_used"])
+        self.assertEqual(res["iterations"], 0)
+        self.assertLess(res["time"], 1.0)
+
+class TestExact(unittest.TestCase):
+    def test_proves_chromatic_number(self):
+        from graph_coloring.algorithms.exact import ExactAlgorithm
+        from graph_coloring.generators import mycielski, queen
+        # у графов Мыцельского клика 2, поэтому оптимальность доказывается перебором
+        for g, chi in ((mycielski(4), 4), (mycielski(5), 5), (queen(6), 7)):
+            res = ExactAlgorithm().run(g)
+            self.assertTrue(is_proper(g, res["coloring"]))
+            self.assertEqual(res["colors_used"], chi)
+            self.assertTrue(res["optimal"])
+            self.assertEqual(res["gap"], 0)
+
+    def test_timeout_reports_gap(self):
+        from graph_coloring.algorithms.exact import ExactAlgorithm
+        from graph_coloring.generators import gnp
+        g = gnp(90, 0.5, seed=1)
+        res = ExactAlgorithm(timeout=0.05).run(g)
+        self.assertTrue(is_proper(g, res["coloring"]))
+        self.assertFalse(res["optimal"])
+        self.assertEqual(res["gap"], res["upper_bound"] - res["lower_bound"])
+        self.assertGreater(res["nodes"], 0)
+
+class TestReduction(unittest.TestCase):
+    def setUp(self):
+        # клика K5 (вершины 0..4) с «хвостами»-деревьями
+        edges = [(a, b) for a in range(5) for b in range(a + 1, 5)]
+        edges += [(0, 10), (10, 11), (11, 12), (1, 20), (20, 21), (20, 22)]
+        self.graph = GraphModel.from_edgelist(edges)
+
+    def test_core_decomposition(self):
+        from graph_coloring.algorithms.reduction import core_decomposition, smallest_last_order
+        removal, core = core_decomposition(self.graph)
+        self.assertEqual(sorted(removal, key=str), sorted(self.graph.vertices(), key=str))
+        self.assertEqual({v for v, c in core.items() if c == 4}, {0, 1, 2, 3, 4})
+        self.assertEqual(core[12], 1)
+        order, degeneracy = smallest_last_order(self.graph)
+        self.assertEqual(degeneracy, 4)
+        self.assertEqual(set(order[:5]), {0, 1, 2, 3, 4})
+
+    def test_greedy_smallest_last(self):
+        from graph_coloring.generators import random_geometric
+        g = random_geometric(500, 0.08, seed=1)
+        res = GreedyAlgorithm(order_strategy='smallest_last').run(g)
+        self.assertTrue(is_proper(g, res["coloring"]))
+        self.assertLessEqual(res["colors_used"], res["upper_bound"])
+
+    def test_reduction_colors_core_only(self):
+        from graph_coloring.algorithms.reduction import ReductionAlgorithm
+        res = ReductionAlgorithm(DSATURAlgorithm(), k=3).run(self.graph)
+        self.assertTrue(is_proper(self.graph, res["coloring"]))
+        self.assertEqual((res["core_size"], res["peeled"]), (5, 6))
+        self.assertEqual(res["colors_used"], 5)
+        self.assertEqual(ReductionAlgorithm(GreedyAlgorithm()).run(self.graph)["colors_used"], 5)
+
+class TestParallelJP(unittest.TestCase):
+    def setUp(self):
+        from graph_coloring.generators import gnp
+        self.graph = gnp(3000, 0.003, seed=2)
+
+    def test_matches_greedy_in_priority_order(self):
+        from graph_coloring.algorithms.parallel_jp import ParallelJPAlgorithm
+        algo = ParallelJPAlgorithm(seed=5, max_workers=1)
+        res = algo.run(self.graph)
+        self.assertTrue(is_proper(self.graph, res["coloring"]))
+        frozen = self.graph.freeze()
+        prio = algo.priorities(frozen)
+        color = {}
+        for v in sorted(frozen.vertices(), key=lambda v: -prio[v]):
+            used = {color[u] for u in frozen.neighbors(v) if u in color}
+            color[v] = min(c for c in range(1, len(used) + 2) if c not in used)
+        self.assertEqual(res["coloring"], frozen.to_labels(color))
+        self.assertEqual(sum(res["round_sizes"]), self.graph.n())
+
+    def test_pool_is_deterministic(self):
+        from graph_coloring.algorithms.parallel_jp import ParallelJPAlgorithm
+        inline = ParallelJPAlgorithm(seed=1, max_workers=1, priority='degree').run(self.graph)
+        pooled = ParallelJPAlgorithm(seed=1, max_workers=3, priority='degree',
+                                     parallel_threshold=0).run(self.graph)
+        self.assertEqual(pooled["coloring"], inline["coloring"])
+        self.assertGreater(pooled["rounds"], 1)
+        self.assertEqual(set(pooled["timings"]), {"setup", "init", "rounds", "collect"})
+
+class TestProgress(unittest.TestCase):
+    def setUp(self):
+        from graph_coloring.generators import gnp
+        self.graph = gnp(3000, 0.003, seed=4)
+
+    def test_progress_reaches_total(self):
+        for algo in (GreedyAlgorithm(), DSATURAlgorithm(kernel='bitset')):
+            calls = []
+            algo.on_progress = lambda done, total: calls.append((done, total))
+            res = algo.run(self.graph)
+            self.assertTrue(is_proper(self.graph, res["coloring"]))
+            self.assertEqual(calls[-1], (3000, 3000))
+            self.assertEqual(len(calls), 3)
+
+    def test_cancel_stops_run(self):
+        from graph_coloring.algorithms.base import ColoringCancelled
+        algo = DSATURAlgorithm()
+        calls = []
+
+        def cancel(done, total):
+            calls.append(done)
+            raise ColoringCancelled()
+        algo.on_progress = cancel
+        with self.assertRaises(ColoringCancelled):
+            algo.run(self.graph)
+        self.assertEqual(calls, [1025])
+
+class TestLayout(unittest.TestCase):
+    def test_force_layout(self):
+        import math
+        from graph_coloring.generators import random_geometric
+        from graph_coloring.layout import force_layout
+        g = random_geometric(300, 0.12, seed=1)
+        pos = force_layout(g, iterations=30, seed=2)
+        self.assertEqual(pos, force_layout(g, iterations=30, seed=2))
+        self.assertTrue(all(0 <= x <= 1 and 0 <= y <= 1 for x, y in pos.values()))
+        edge = [math.dist(pos[u], pos[v]) for u in g.vertices() for v in g.neighbors(u)]
+        vs = g.vertices()
+        rnd = [math.dist(pos[vs[i]], pos[vs[-i - 1]]) for i in range(len(vs))]
+        self.assertLess(sum(edge) / len(edge), 0.5 * sum(rnd) / len(rnd))
+
+    def test_time_budget_checked_inside_iteration(self):
+        from unittest import mock
+        from graph_coloring import layout
+        from graph_coloring.generators import random_geometric
+        g = random_geometric(300, 0.12, seed=1)
+        # срок, начало первой итерации, затем первая проверка внутри неё — уже после срока
+        clock = iter([0.0, 0.0] + [10.0] * 10)
+        with mock.patch.object(layout.time, "perf_counter", lambda: next(clock)):
+            pos = layout.force_layout(g, iterations=30, seed=2, time_budget=1.0)
+        self.assertEqual(pos, layout.force_layout(g, iterations=0, seed=2))
+        stop = layout.force_layout(g, iterations=30, seed=2, should_stop=lambda: True)
+        self.assertEqual(stop, layout.force_layout(g, iterations=0, seed=2))
+
+    def test_sample_edges(self):
+        from graph_coloring.layout import sample_edges
+        g = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+        all_edges = sample_edges(g, 10 ** 6)
+        self.assertEqual(len(all_edges), g.m())
+        self.assertEqual({frozenset(e) for e in all_edges},
+                         {frozenset((u, v)) for u in g.vertices() for v in g.neighbors(u)})
+        sample = sample_edges(g, 50, seed=1)
+        self.assertEqual(len(sample), 50)
+        self.assertTrue(all(v in g.neighbors(u) for u, v in sample))
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.graph = load_edgelist(os.path.join(DATA_DIR, "6.txt"))
+
+    def test_profile_adds_stats(self):
+        for kernel in ('set', 'bitset'):
+            plain = DSATURAlgorithm(kernel=kernel).run(self.graph)
+            self.assertNotIn("stats", plain)
+            res = DSATURAlgorithm(kernel=kernel).profile(self.graph, memory=True)
+            self.assertEqual(res["coloring"], plain["coloring"])
+            stats = res["stats"]
+            self.assertTrue({"ordering", "selection", "assignment", "neighbour_updates", "total"}
+                            <= set(stats["phases_ns"]))
+            self.assertEqual(stats["counters"]["neighbour_visits"], 2 * self.graph.m())
+            self.assertGreater(stats["peak_memory_bytes"], 0)
+
+    def test_hooks_and_generic_algorithms(self):
+        from graph_coloring.algorithms.exact import ExactAlgorithm
+        events = []
+        res = GreedyAlgorithm().profile(self.graph, hooks=[lambda *e: events.append(e)])
+        self.assertIn(("counter", "neighbour_visits", 2 * self.graph.m()), events)
+        self.assertEqual([e[1] for e in events if e[0] == "phase"], ["ordering", "assignment", "total"])
+        self.assertNotIn("peak_memory_bytes", res["stats"])
+        stats = ExactAlgorithm(timeout=1).profile(self.graph)["stats"]
+        self.assertEqual(list(stats["phases_ns"]), ["total"])
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        import shutil
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        for name in ("1.txt", "6.txt"):
+            shutil.copy(os.path.join(DATA_DIR, name), self.tmpdir.name)
+        sub = os.path.join(self.tmpdir.name, "sub")
+        os.mkdir(sub)
+        shutil.copy(os.path.join(DATA_DIR, "6.txt"), sub)
+
+    def test_inputs_and_job_names(self):
+        from graph_coloring.batch import expand_inputs, parse_config, plan_jobs
+        manifest = os.path.join(self.tmpdir.name, "graphs.lst")
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write("# графы\n" + os.path.join(self.tmpdir.name, "sub", "*.txt") + "\n")
+        paths = expand_inputs([os.path.join(self.tmpdir.name, "*.txt")], manifest)
+        self.assertEqual([os.path.basename(p) for p in paths], ["1.txt", "6.txt", "6.txt"])
+        configs = [parse_config(c) for c in ("dsatur", "greedy:random")]
+        jobs = plan_jobs(paths, configs, "out")
+        self.assertEqual(len(jobs), 6)
+        self.assertEqual(len({j["output"] for j in jobs}), 6)
+        self.assertEqual(jobs[-1]["output"], os.path.join("out", "6-2", "greedy_random.csv"))
+        with self.assertRaises(ValueError):
+            parse_config("exact:random")
+
+    def test_run_streams_and_records(self):
+        import io, json
+        from graph_coloring.batch import (EXACT_TIMEOUT, DatabaseRecorder, SummaryWriter, expand_inputs,
+                                          plan_jobs, run_batch)
+        from graph_coloring.database_module import Database
+        out_dir = os.path.join(self.tmpdir.name, "out")
+        paths = expand_inputs([os.path.join(self.tmpdir.name, "*.txt")])
+        jobs = plan_jobs(paths, [("dsatur", None), ("greedy", "random")], out_dir, seed=3)
+        stream = io.StringIO()
+        with Database(os.path.join(self.tmpdir.name, "batch.db")) as db:
+            rows = run_batch(jobs, workers=1, summary=SummaryWriter(stream), recorder=DatabaseRecorder(db, 3))
+            graph_id = db.find_graph(load_edgelist(paths[1]).fingerprint())
+            self.assertEqual(len(db.list_colorings(graph_id)), 2)
+            self.assertIsNotNone(db.get_cached_coloring(load_edgelist(paths[1]).fingerprint(), "Greedy", "random", 3))
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([r["status"] for r in lines], ["ok"] * 4)
+        self.assertEqual(lines[0]["order_strategy"], "degree_desc")
+        self.assertTrue(all(os.path.exists(r["output"]) for r in rows))
+
+        tabu_jobs = plan_jobs(paths[:1], [("tabucol", None)], "", seed=3)
+        with Database(os.path.join(self.tmpdir.name, "batch.db")) as db:
+            run_batch(tabu_jobs, workers=1, recorder=DatabaseRecorder(db))
+            fingerprint = load_edgelist(paths[0]).fingerprint()
+            self.assertEqual(db.conn.execute("SELECT seed FROM colorings WHERE algorithm='Tabucol'").fetchall(),
+                             [(None,)])
+            self.assertIsNone(db.get_cached_coloring(fingerprint, "Tabucol", "dsatur", 3))
+
+        gap = os.path.join(self.tmpdir.name, "gap", "gnp.txt")
+        os.mkdir(os.path.dirname(gap))
+        from graph_coloring.generators import gnp
+        g = gnp(60, 0.5, seed=1)
+        with open(gap, "w", encoding="utf-8") as f:
+            f.writelines(f"{u} {v}\n" for u in g.vertices() for v in g.neighbors(u) if u < v)
+        exact_jobs = plan_jobs([gap], [("exact", None)], "", seed=3, timeout=0)
+        self.assertEqual(plan_jobs([gap], [("exact", None), ("dsatur", None)], "")[0]["timeout"], EXACT_TIMEOUT)
+        self.assertIsNone(plan_jobs([gap], [("dsatur", None)], "")[0]["timeout"])
+        with Database(os.path.join(self.tmpdir.name, "batch.db")) as db:
+            [row] = run_batch(exact_jobs, workers=1, recorder=DatabaseRecorder(db))
+            self.assertTrue(row["timed_out"])
+            self.assertEqual(db.conn.execute("SELECT seed FROM colorings WHERE algorithm='Exact'").fetchall(),
+                             [(None,)])
+
+        pooled = run_batch(jobs, workers=2)
+        self.assertEqual(sorted((r["graph"], r["algorithm"], r["colors_used"]) for r in pooled),
+                         sorted((r["graph"], r["algorithm"], r["colors_used"]) for r in rows))
+
+class TestService(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "g.txt")
+        with open(os.path.join(DATA_DIR, "6.txt"), encoding="utf-8") as src, \
+                open(self.path, "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+
+    @staticmethod
+    async def request(port, method, path, payload=None):
+        import asyncio, json
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        head, _, body = data.partition(b"\r\n\r\n")
+        status = int(head.split()[1])
+        if b"application/json" in head:
+            return status, json.loads(body)
+        return status, body.decode()
+
+    def test_submit_poll_stream_and_metrics(self):
+        import asyncio
+        from graph_coloring.service import ColoringService
+
+        async def scenario():
+            service = ColoringService(workers=1, queue_size=8, db_path=os.path.join(self.tmpdir.name, "s.db"))
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                ids = []
+                for algo in ("dsatur", "greedy", "dsatur"):
+                    status, body = await self.request(port, "POST", "/jobs", {"path": self.path, "algorithm": algo})
+                    self.assertEqual(status, 202)
+                    ids.append(body["id"])
+                status, job = await self.request(port, "GET", f"/jobs/{ids[2]}?wait=30&coloring=1")
+                self.assertEqual(job["status"], "done")
+                self.assertTrue(job["graph_cache_hit"])
+                g = load_edgelist(self.path)
+                self.assertTrue(is_proper(g, {v: c for v, c in job["coloring"]}))
+                status, csv_text = await self.request(port, "GET", f"/jobs/{ids[0]}/coloring")
+                self.assertEqual(len(csv_text.splitlines()), g.n() + 1)
+                status, metrics = await self.request(port, "GET", "/metrics")
+                self.assertEqual(metrics["completed"], 3)
+                self.assertEqual(metrics["graph_cache_misses"], 1)
+                self.assertEqual((await self.request(port, "POST", "/jobs", {"path": "nope.txt"}))[0], 400)
+                self.assertEqual((await self.request(port, "GET", "/jobs/unknown"))[0], 404)
+            finally:
+                await service.close()
+            with __import__("graph_coloring.database_module").database_module.Database(
+                    os.path.join(self.tmpdir.name, "s.db")) as db:
+                self.assertEqual(len(db.list_colorings(db.find_graph(load_edgelist(self.path).fingerprint()))), 3)
+
+        asyncio.run(scenario())
+
+    def test_backpressure(self):
+        import asyncio
+        from graph_coloring.service import ColoringService
+
+        async def scenario():
+            service = ColoringService(workers=1, queue_size=1)
+            await service.start(port=0)
+            try:
+                # исполнитель ещё не забрал задания: вторая постановка упирается в лимит очереди
+                self.assertIsNotNone(service.submit({"path": self.path}))
+                self.assertIsNone(service.submit({"path": self.path}))
+                self.assertEqual(service.metrics()["rejected"], 1)
+            finally:
+                await service.close()
+
+        asyncio.run(scenario())
+
+    def test_timeout_kills_uncooperative_worker(self):
+        import asyncio
+        from graph_coloring.generators import gnp
+        from graph_coloring.service import ColoringService
+        big = os.path.join(self.tmpdir.name, "big.txt")
+        g = gnp(20000, 10 / 20000, seed=1)
+        with open(big, "w", encoding="utf-8") as f:
+            f.writelines(f"{u} {v}\n" for u in g.vertices() for v in g.neighbors(u) if u < v)
+
+        async def scenario():
+            service = ColoringService(workers=1, queue_size=4)
+            await service.start(port=0)
+            try:
+                old = service.executors[0].process
+                # портфель не вызывает on_progress: остановить его можно только убив процесс
+                slow = service.submit({"path": big, "algorithm": "portfolio", "timeout": 0.2})
+                quick = service.submit({"path": self.path, "algorithm": "dsatur", "timeout": 30})
+                await asyncio.wait_for(slow.done.wait(), 10)
+                self.assertEqual(slow.status, "timeout")
+                self.assertFalse(old.is_alive())
+                await asyncio.wait_for(quick.done.wait(), 30)
+                self.assertEqual(quick.status, "done")
+                metrics = service.metrics()
+                self.assertEqual((metrics["worker_restarts"], metrics["running"]), (1, 0))
+            finally:
+                await service.close()
+
+        asyncio.run(scenario())
+
+    def test_dead_idle_worker_is_restarted(self):
+        import asyncio, signal
+        from graph_coloring.service import ColoringService
+
+        async def scenario():
+            service = ColoringService(workers=1, queue_size=4)
+            await service.start(port=0)
+            try:
+                old = service.executors[0].process
+                os.kill(old.pid, signal.SIGKILL)
+                old.join(5)
+                job = service.submit({"path": self.path, "algorithm": "dsatur"})
+                await asyncio.wait_for(job.done.wait(), 30)
+                self.assertEqual(job.status, "done")
+                self.assertEqual(service.metrics()["worker_restarts"], 1)
+                self.assertTrue(service.executors[0].process.is_alive())
+            finally:
+                await service.close()
+
+        asyncio.run(scenario())
+
+    def test_record_error_keeps_result(self):
+        import asyncio
+        from unittest import mock
+        from graph_coloring.service import ColoringService
+
+        async def scenario():
+            service = ColoringService(workers=1, queue_size=4, db_path=os.path.join(self.tmpdir.name, "s.db"))
+            await service.start(port=0)
+            try:
+                with mock.patch.object(service, "_record", side_effect=RuntimeError("disk full")):
+                    job = service.submit({"path": self.path})
+                    await asyncio.wait_for(job.done.wait(), 30)
+                self.assertEqual((job.status, job.summary()["record_error"]), ("done", "RuntimeError: disk full"))
+                metrics = service.metrics()
+                self.assertEqual((metrics["completed"], metrics["failed"], metrics["db_errors"]), (1, 0, 1))
+            finally:
+                await service.close()
+
+        asyncio.run(scenario())
+
+class TestSemiStreaming(unittest.TestCase):
+    def setUp(self):
+        from graph_coloring.generators import gnp
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.graph = gnp(400, 0.03, seed=5)
+        edges = [(u, v) for u in self.graph.vertices() for v in self.graph.neighbors(u) if u < v]
+        random.Random(1).shuffle(edges)
+        self.path = os.path.join(self.tmpdir.name, "edges.txt")
+        with open(self.path, "w") as f:
+            f.writelines(f"{u} {v}\n" for u, v in edges)
+        self.covered = [v for v in self.graph.vertices() if self.graph.neighbors(v)]
+
+    def test_proper_coloring_and_accounting(self):
+        from graph_coloring.algorithms.streaming import SemiStreamingAlgorithm
+        res = SemiStreamingAlgorithm(chunk_size=1000).run(self.path)
+        self.assertEqual(sorted(res["coloring"]), sorted(self.covered))
+        self.assertTrue(is_proper(self.graph.subgraph(self.covered), res["coloring"]))
+        self.assertEqual(res["colors_used"], max(res["coloring"].values()))
+        self.assertEqual(res["bytes_read"], res["passes"] * os.path.getsize(self.path))
+        # счётчик считает прочитанное читателем, а не размер файла на число проходов
+        from unittest import mock
+        from graph_coloring.algorithms import streaming
+        from graph_coloring.io_module import iter_edgelist_chunks
+
+        def first_chunk_only(path, chunk_size, on_read=None):
+            yield next(iter_edgelist_chunks(path, chunk_size, on_read))
+
+        with mock.patch.dict(streaming.READERS, {"edgelist": first_chunk_only}):
+            short = SemiStreamingAlgorithm(chunk_size=1000).run(self.path)
+        self.assertEqual(short["bytes_read"], short["passes"] * 1000)
+        self.assertEqual(res["conflicts"][-1], 0)
+        self.assertEqual(res["fallback_vertices"], 0)
+        in_dir = SemiStreamingAlgorithm(state_dir=self.tmpdir.name).run(self.path)
+        self.assertEqual(in_dir["coloring"], res["coloring"])
+        self.assertEqual(os.listdir(self.tmpdir.name), ["edges.txt"])
+
+    def test_pass_limit_and_string_labels(self):
+        from graph_coloring.algorithms.streaming import SemiStreamingAlgorithm
+        from graph_coloring.generators import gnp
+        res = SemiStreamingAlgorithm(max_passes=3).run(self.path)
+        self.assertEqual((res["passes"], res["fallback_passes"]), (3, 1))
+        self.assertGreater(res["fallback_vertices"], 0)
+        self.assertTrue(is_proper(self.graph.subgraph(self.covered), res["coloring"]))
+        dense = os.path.join(self.tmpdir.name, "dense.txt")
+        g = gnp(300, 0.5, seed=1)
+        with open(dense, "w") as f:
+            f.writelines(f"{u} {v}\n" for u in g.vertices() for v in g.neighbors(u) if u < v)
+        res = SemiStreamingAlgorithm(max_passes=4, fallback_edges=2000).run(dense)
+        self.assertTrue(is_proper(g, res["coloring"]))
+        self.assertGreater(res["fallback_vertices"], 250)
+        self.assertLessEqual(res["fallback_peak_edges"], 2000)
+        self.assertEqual(res["passes"], 3 + res["fallback_passes"])
+        self.assertGreaterEqual(res["fallback_passes"], 2 * g.m() // 2000)
+        path = os.path.join(self.tmpdir.name, "named.txt")
+        with open(path, "w") as f:
+            f.write("1 2\n2 3\n3 3\na b\nb c\nc a\n")
+        res = SemiStreamingAlgorithm(chunk_size=8).run(path)
+        self.assertEqual(set(res["coloring"]), {1, 2, 3, "a", "b", "c"})
+        self.assertTrue(is_proper(load_edgelist(path), res["coloring"]))
+
 if __name__ == "__main__":
     unittest.main()